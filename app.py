@@ -4,39 +4,70 @@ KaspaMine Real-Time Income Calculator Web App
 A Flask-based web application for calculating Kaspa mining income projections
 
 Data Sources:
-- CoinGecko API: KAS price in GBP
+- CoinGecko API: KAS and ZEC prices in GBP and USD (one batched request)
 - 2Miners API: Network hashrate and difficulty
 - Kaspa API: Real block reward (updates with emission schedule)
 """
 
+import copy
 import json
-import requests
 import sys
 from datetime import datetime
+from functools import partial
 from typing import Dict, Optional
-from flask import Flask, render_template, jsonify, request
+from flask import Flask, Response, render_template, jsonify, request
 from flask_cors import CORS
 import threading
 import time
 
+import numpy as np
+
+import fetch_engine
+import http_client
+from cache import api_cache
+from coins import CACHE_TTL_FACTOR, COINS
+from emission import MAX_HORIZON_DAYS
+from fetch_engine import run_concurrently
+from forecast import BAND_Z, LogLinearForecaster
+from history import DEFAULT_MAX_POINTS, MAX_POINTS, HistoryStore
+from price_service import prices
+from projections import (AXES, MAX_AXIS_LENGTH, MAX_GRID_CELLS, grid_to_json, project_fleet,
+                         roi_days_on_curve)
+from scheduler import RefreshJob, RefreshScheduler
+from simulator import (DEFAULT_DAYS, DEFAULT_HASHRATE_GROWTH, DEFAULT_HASHRATE_VOL,
+                       DEFAULT_PRICE_DRIFT, DEFAULT_PRICE_VOL, DEFAULT_TRIALS, simulation_pool)
+from snapshots import SnapshotStore
+from switching import switcher
+
 # ============================================================================
 # Configuration
 # ============================================================================
 
-# Kaspa Mining - IceRiver KS5M
-KS5M_HASHRATE_THS = 15.0  # TH/s per KS5M miner
-KS5M_POWER_W = 3400        # Watts per miner
-KS5M_COST_GBP = 600        # Hardware cost
+# Coin selections served by /api/calculator - each kept warm by the background thread.
+# Every registered coin has its own selection; "both" is the dashboard's Kaspa + Zcash view.
+SELECTION_COINS = {key: [key] for key in COINS}
+SELECTION_COINS["both"] = ["kaspa", "zcash"]
+SELECTION_COINS["all"] = list(COINS)
+COIN_SELECTIONS = tuple(SELECTION_COINS)
+FIRST_SNAPSHOT_WAIT_S = 10  # Cold start only: wait for the first background run
+
+# Server-Sent Events push stream (/api/stream)
+SSE_KEEPALIVE_S = 15        # Comment line sent when nothing changed, keeps proxies from timing out
+SSE_RETRY_MS = 3000         # Browser reconnect delay after a dropped stream
+
+# Concurrent fetch cycle - all upstream calls run in parallel within this deadline
+FETCH_CYCLE_DEADLINE_S = 6.0
 
-# Zcash Mining - Antminer Z15 Pro
-Z15PRO_HASHRATE_KSOL = 840  # KSol/s per Z15 Pro
-Z15PRO_POWER_W = 2780       # Watts per miner
-Z15PRO_COST_GBP = 3500      # Hardware cost (approximate)
+# Multi-process serving (wsgi.py) - /api/refresh in a worker waits this long for the refresher
+WORKER_REFRESH_WAIT_S = 15
+# Until a worker has its first snapshot, data endpoints answer 503 with this Retry-After
+WORKER_WARMUP_RETRY_AFTER_S = 2
+# Endpoints a worker serves before its first snapshot (no snapshot data needed)
+WORKER_WARMUP_ENDPOINTS = {"index", "static", "get_history", "get_history_series", "get_metrics"}
 
-# API Endpoints
-COINGECKO_API = "https://api.coingecko.com/api/v3"
-KASPA_EXPLORER_API = "https://api.kaspa.org"  # Primary
-KASPA_EXPLORER_BACKUP = "https://explorer.kaspa.org/api"  # Backup
+# Network hashrate growth forecast - history series fitted per coin
+FORECAST_SERIES = {key: f"{key}.{adapter.network_hashrate_key}" for key, adapter in COINS.items()}
+FORECAST_SEED_DAYS = 365    # History loaded into the fit at startup
 
 # Colors for terminal output (keeping for any CLI usage)
 GREEN = '\033[92m'
@@ -58,600 +89,681 @@ CORS(app)
 latest_results = None
 last_update = None
 
-# Cache for API responses with timestamps
-api_cache = {
-    "kaspa_price": {"value": None, "timestamp": None, "ttl": 60},  # Cache for 60 seconds
-    "zec_price": {"value": None, "timestamp": None, "ttl": 60},  # Cache for 60 seconds
-    "kaspa_network": {"value": None, "timestamp": None, "ttl": 5},  # Cache for 5 seconds
-    "zec_network": {"value": None, "timestamp": None, "ttl": 5},  # Cache for 5 seconds
-    "kaspa_block_reward": {"value": None, "timestamp": None, "ttl": 30},  # Cache for 30 seconds
-}
-
-data_source_status = {
-    "kaspa": {
-        "price": {"status": "unknown", "timestamp": None, "source": "CoinGecko API"},
-        "network": {"status": "unknown", "timestamp": None, "source": "2Miners API"},
-        "block_reward": {"status": "unknown", "timestamp": None, "source": "Kaspa API"}
-    },
-    "zcash": {
-        "price": {"status": "unknown", "timestamp": None, "source": "CoinGecko API"},
-        "network": {"status": "unknown", "timestamp": None, "source": "2Miners API"},
-        "block_reward": {"status": "unknown", "timestamp": None, "source": "Hardcoded (2.5 ZEC)"}
-    }
-}
-
-def is_cache_valid(cache_key: str) -> bool:
-    """Check if cached data is still valid"""
-    cache = api_cache.get(cache_key)
-    if not cache or cache["value"] is None or cache["timestamp"] is None:
-        return False
+# Warm per-selection snapshots served by /api/calculator
+snapshots = SnapshotStore(COIN_SELECTIONS)
+history = HistoryStore()
+forecasters = {coin: LogLinearForecaster() for coin in FORECAST_SERIES}
+forecasters_seeded = False
+update_thread = None
+update_thread_lock = threading.Lock()
 
-    age = (datetime.now() - cache["timestamp"]).total_seconds()
-    return age < cache["ttl"]
+# "standalone" refreshes in this process (python3 app.py), "refresher" also
+# publishes to the snapshot hub, "worker" only follows the hub (see wsgi.py)
+serving_role = "standalone"
+snapshot_hub = None  # SnapshotHub in the refresher, SnapshotSubscriber in workers
+refresher_metrics = None  # Upstream metrics received with the last published run (workers)
 
-def get_cached_value(cache_key: str):
-    """Get value from cache"""
-    cache = api_cache.get(cache_key)
-    return cache["value"] if cache else None
+# Prices refresh as one batched CoinGecko call; coin sources declare their own cadence
+PRICE_REFRESH_S = 60        # CoinGecko updates roughly once a minute
+PRICE_CACHE_TTL_S = PRICE_REFRESH_S * CACHE_TTL_FACTOR
 
-def set_cache(cache_key: str, value):
-    """Store value in cache with current timestamp"""
-    if cache_key in api_cache:
-        api_cache[cache_key]["value"] = value
-        api_cache[cache_key]["timestamp"] = datetime.now()
+# Data source status per coin, owned and updated by each coin adapter
+data_source_status = {key: adapter.status for key, adapter in COINS.items()}
 
 # ============================================================================
-# Data Fetching Functions
+# Main Calculator
 # ============================================================================
 
-def fetch_kas_price() -> Optional[float]:
+def forecast_summary(coin: str, daily_gbp: float, cost_gbp: float,
+                     reward_ratios: Optional[np.ndarray] = None) -> Optional[Dict]:
     """
-    Fetch current KAS price in GBP from CoinGecko (with caching)
-    Returns: Price in GBP or None if failed
-    """
-    global data_source_status
-
-    # Check cache first
-    if is_cache_valid("kaspa_price"):
-        cached_price = get_cached_value("kaspa_price")
-        data_source_status["kaspa"]["price"]["status"] = "cached"
-        data_source_status["kaspa"]["price"]["timestamp"] = datetime.now().isoformat()
-        return cached_price
-
-    try:
-        url = f"{COINGECKO_API}/simple/price"
-        params = {
-            "ids": "kaspa",
-            "vs_currencies": "gbp"
-        }
-        response = requests.get(url, params=params, timeout=5)
-        response.raise_for_status()
-        data = response.json()
-
-        price = data.get("kaspa", {}).get("gbp")
-        if price:
-            price_float = float(price)
-            set_cache("kaspa_price", price_float)
-            data_source_status["kaspa"]["price"]["status"] = "live"
-            data_source_status["kaspa"]["price"]["timestamp"] = datetime.now().isoformat()
-            return price_float
+    Yearly income and ROI under the forecast network hashrate growth
 
-    except Exception as e:
-        print(f"Error fetching KAS price from CoinGecko: {e}")
-        # Try to use cached value even if expired
-        cached_price = get_cached_value("kaspa_price")
-        if cached_price:
-            data_source_status["kaspa"]["price"]["status"] = "cached"
-            data_source_status["kaspa"]["price"]["timestamp"] = datetime.now().isoformat()
-            return cached_price
-
-        data_source_status["kaspa"]["price"]["status"] = "failed"
-        data_source_status["kaspa"]["price"]["timestamp"] = datetime.now().isoformat()
+    Returns: Dict with the fitted growth rate and per-band yearly_gbp and
+    roi_days (p5 = pessimistic), or None until enough history is recorded
+    """
+    fit = forecasters[coin].fit()
+    if fit is None:
+        return None
 
-    return None
+    curves = forecasters[coin].earnings_curves(MAX_HORIZON_DAYS, reward_ratios, fit=fit)
+    summary = {
+        "growth_annual": round(fit["growth_annual"], 4),
+        "span_days": fit["span_days"],
+        "yearly_gbp": {},
+        "roi_days": {}
+    }
+    for band, curve in curves.items():
+        roi = float(roi_days_on_curve(curve, np.array(cost_gbp), np.array(daily_gbp), np.array(0.0)))
+        summary["yearly_gbp"][band] = round(daily_gbp * float(curve[365]), 2)
+        summary["roi_days"][band] = round(roi, 1) if np.isfinite(roi) else None
+    return summary
 
-def fetch_network_stats() -> Optional[Dict]:
-    """
-    Fetch Kaspa network statistics from 2Miners API and Kaspa API (REAL DATA ONLY)
-    Returns: Dict with network_hashrate_ths, block_reward, block_time_seconds
+def run_calculator(coins: str = "both") -> Dict:
     """
-    global data_source_status
+    Run the complete income calculator for selected coins
 
-    try:
-        # Fetch network hashrate from 2Miners
-        url = "https://kas.2miners.com/api/stats"
-        response = requests.get(url, timeout=5)
-        response.raise_for_status()
-
-        data = response.json()
-
-        # Extract real network hashrate from nodes[0].networkhashps
-        nodes = data.get("nodes", [])
-        if not nodes:
-            data_source_status["kaspa"]["network"]["status"] = "failed"
-            data_source_status["kaspa"]["network"]["timestamp"] = datetime.now().isoformat()
-            return None
+    Args:
+        coins: a registered coin ("kaspa", "zcash", "aeternity"), "both"
+            (Kaspa and Zcash, default) or "all"
 
-        network_hashrate_hs = int(nodes[0].get("networkhashps", 0))
+    Returns:
+        Dict with all calculated data and projections
+    """
+    results = {
+        "timestamp": datetime.now().isoformat(),
+        "coins_enabled": coins
+    }
+    adapters = [COINS[key] for key in SELECTION_COINS.get(coins, SELECTION_COINS["both"])]
 
-        if network_hashrate_hs <= 0:
-            data_source_status["kaspa"]["network"]["status"] = "failed"
-            data_source_status["kaspa"]["network"]["timestamp"] = datetime.now().isoformat()
-            return None
+    # Fetch every adapter's independent upstream sources in one concurrent cycle
+    tasks = {}
+    for adapter in adapters:
+        for name, task in adapter.fetch_tasks().items():
+            tasks[f"{adapter.key}.{name}"] = task
 
-        # Get difficulty if available
-        difficulty = data.get("nodes", [{}])[0].get("difficulty", 0)
+    fetched = run_concurrently(tasks, deadline=FETCH_CYCLE_DEADLINE_S)
 
-        # Mark network data as live
-        data_source_status["kaspa"]["network"]["status"] = "live"
-        data_source_status["kaspa"]["network"]["timestamp"] = datetime.now().isoformat()
+    for adapter in adapters:
+        prefix = f"{adapter.key}."
+        coin_fetched = {name[len(prefix):]: value for name, value in fetched.items()
+                        if name.startswith(prefix)}
 
-        # Fetch real block reward from Kaspa API
-        block_reward = 3.67  # Default fallback
-        try:
-            reward_response = requests.get("https://api.kaspa.org/info/blockreward", timeout=5)
-            reward_response.raise_for_status()
-            reward_data = reward_response.json()
-            block_reward = float(reward_data.get("blockreward", 3.67))
-            data_source_status["kaspa"]["block_reward"]["status"] = "live"
-            data_source_status["kaspa"]["block_reward"]["timestamp"] = datetime.now().isoformat()
-        except Exception as e:
-            print(f"Warning: Could not fetch block reward from Kaspa API: {e}, using fallback")
-            data_source_status["kaspa"]["block_reward"]["status"] = "cached"
-            data_source_status["kaspa"]["block_reward"]["timestamp"] = datetime.now().isoformat()
-
-        stats = {
-            "network_hashrate_ths": network_hashrate_hs / 1e12,  # Convert H/s to TH/s
-            "block_reward": block_reward,  # Real block reward from Kaspa API
-            "block_time_seconds": 0.1,  # Kaspa block time (10 blocks per second after Crescendo upgrade)
-            "difficulty": difficulty,
-            "source": "2Miners API + Kaspa API (Real-time)"
-        }
+        result = adapter.calculate(coin_fetched)
+        if result is None:
+            continue
 
-        return stats
+        headline = next(iter(result["income"].values()))
+        result["forecast"] = forecast_summary(
+            adapter.key, headline["daily_gbp"], adapter.miner.cost_gbp,
+            adapter.reward_ratios(result["network"], MAX_HORIZON_DAYS))
+        results[adapter.key] = result
 
-    except Exception as e:
-        print(f"2Miners API failed: {e}")
-        data_source_status["kaspa"]["network"]["status"] = "failed"
-        data_source_status["kaspa"]["network"]["timestamp"] = datetime.now().isoformat()
+    # Return None if no data was fetched
+    if not any(adapter.key in results for adapter in adapters):
         return None
 
-def fetch_2miners_stats() -> Optional[Dict]:
-    """
-    Fetch stats from 2Miners pool API
-    Returns: Dict with pool hashrate, miners, fee
-    """
-    try:
-        url = "https://kas.2miners.com/api/stats"
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        data = response.json()
-
-        stats = {
-            "pool_hashrate": data.get("hashrate", 0),
-            "pool_miners": data.get("workers", 0),
-            "pool_fee": data.get("fee", 1.0),
-        }
-
-        return stats
-
-    except Exception as e:
-        print(f"Could not fetch 2Miners stats: {e}")
-        return None
+    return results
 
 # ============================================================================
-# Zcash Data Fetching Functions
+# Background Update Thread
 # ============================================================================
 
-def fetch_zec_price() -> Optional[float]:
-    """
-    Fetch current ZEC price in GBP from CoinGecko (with caching)
-    Returns: Price in GBP or None if failed
+def build_snapshots(results: Dict) -> Dict:
     """
-    global data_source_status
+    Derive the per-selection snapshots (each coin, both, all) from one "all" run
 
-    # Check cache first
-    if is_cache_valid("zec_price"):
-        cached_price = get_cached_value("zec_price")
-        data_source_status["zcash"]["price"]["status"] = "cached"
-        data_source_status["zcash"]["price"]["timestamp"] = datetime.now().isoformat()
-        return cached_price
-
-    try:
-        url = f"{COINGECKO_API}/simple/price"
-        params = {
-            "ids": "zcash",
-            "vs_currencies": "gbp"
-        }
-        response = requests.get(url, params=params, timeout=5)
-        response.raise_for_status()
-        data = response.json()
-
-        price = data.get("zcash", {}).get("gbp")
-        if price:
-            price_float = float(price)
-            set_cache("zec_price", price_float)
-            data_source_status["zcash"]["price"]["status"] = "live"
-            data_source_status["zcash"]["price"]["timestamp"] = datetime.now().isoformat()
-            return price_float
+    Returns:
+        Dict of selection -> snapshot (selections with no data are omitted)
+    """
+    published_at = datetime.now()
+    common = {
+        "timestamp": results["timestamp"],
+        "last_update": published_at.isoformat(),
+        "data_sources": copy.deepcopy(data_source_status)
+    }
 
-    except Exception as e:
-        print(f"Error fetching ZEC price from CoinGecko: {e}")
-        # Try to use cached value even if expired
-        cached_price = get_cached_value("zec_price")
-        if cached_price:
-            data_source_status["zcash"]["price"]["status"] = "cached"
-            data_source_status["zcash"]["price"]["timestamp"] = datetime.now().isoformat()
-            return cached_price
+    views = {}
+    for selection in COIN_SELECTIONS:
+        view = {coin: results[coin] for coin in SELECTION_COINS[selection] if coin in results}
+        if view:
+            views[selection] = dict(common, coins_enabled=selection, **view)
+    return views
 
-        data_source_status["zcash"]["price"]["status"] = "failed"
-        data_source_status["zcash"]["price"]["timestamp"] = datetime.now().isoformat()
+def history_samples(results: Dict) -> Dict[str, Optional[float]]:
+    """
+    Flatten a calculator run into history series
 
-    return None
+    Returns: Dict of "<coin>.<metric>" -> value (e.g. "kaspa.price_gbp")
+    """
+    def number(value):
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return None
 
-def fetch_zec_network_stats() -> Optional[Dict]:
+    samples = {}
+    for coin, adapter in COINS.items():
+        data = results.get(coin)
+        if not data:
+            continue
+        network = data["network"]
+        symbol = adapter.symbol.lower()
+        hashrate_key = adapter.network_hashrate_key
+        samples.update({
+            f"{coin}.price_gbp": data["market"][f"{symbol}_price_gbp"],
+            f"{coin}.price_usd": data["market"][f"{symbol}_price_usd"],
+            f"{coin}.{hashrate_key}": network[hashrate_key],
+            f"{coin}.difficulty": number(network.get("difficulty")),
+            f"{coin}.block_reward": network["block_reward"],
+            f"{coin}.daily_gbp_per_miner": data["income"][adapter.history_tier]["daily_gbp"],
+        })
+    return samples
+
+def apply_results(results: Dict) -> Dict[str, Optional[float]]:
     """
-    Fetch Zcash network statistics from 2Miners API (REAL DATA ONLY)
-    Returns: Dict with network_hashrate_sol, block_reward, block_time_seconds
+    Serve an "all" calculator run from this process: warm snapshots for every
+    selection and the hashrate growth fits
+
+    Returns: The run's history samples
     """
-    global data_source_status
+    global latest_results, last_update
 
-    try:
-        url = "https://zec.2miners.com/api/stats"
-        response = requests.get(url, timeout=5)
-        response.raise_for_status()
+    for selection, snapshot in build_snapshots(results).items():
+        snapshots.publish(selection, snapshot)
 
-        data = response.json()
+    latest_results = results
+    last_update = datetime.now()
 
-        # Extract real network hashrate from nodes[0].networkhashps
-        nodes = data.get("nodes", [])
-        if not nodes:
-            data_source_status["zcash"]["network"]["status"] = "failed"
-            data_source_status["zcash"]["network"]["timestamp"] = datetime.now().isoformat()
-            return None
+    # Fold the new network hashrate into the growth fits (O(1), at most hourly);
+    # workers load the refresher's fits instead (apply_published)
+    samples = history_samples(results)
+    if serving_role != "worker":
+        now = time.time()
+        for coin, series in FORECAST_SERIES.items():
+            forecasters[coin].add(now, samples.get(series))
+    return samples
 
-        network_hashrate_sol = int(nodes[0].get("networkhashps", 0))
+def publish_results(results: Dict):
+    """Publish an "all" calculator run (refreshing process only)"""
+    samples = apply_results(results)
 
-        if network_hashrate_sol <= 0:
-            data_source_status["zcash"]["network"]["status"] = "failed"
-            data_source_status["zcash"]["network"]["timestamp"] = datetime.now().isoformat()
-            return None
+    # Re-rank pools per miner from the values just published (no fetching)
+    try:
+        switcher.evaluate(results)
+    except Exception as e:
+        print(f"Error evaluating pool switching: {e}")
 
-        # Get difficulty and block time
-        difficulty = nodes[0].get("difficulty", 0)
-        avg_block_time = float(nodes[0].get("avgBlockTime", 75))
-
-        # Mark network data as live
-        data_source_status["zcash"]["network"]["status"] = "live"
-        data_source_status["zcash"]["network"]["timestamp"] = datetime.now().isoformat()
-
-        # Block reward is hardcoded for now
-        data_source_status["zcash"]["block_reward"]["status"] = "live"
-        data_source_status["zcash"]["block_reward"]["timestamp"] = datetime.now().isoformat()
-
-        stats = {
-            "network_hashrate_sol": network_hashrate_sol,  # Sol/s
-            "network_hashrate_ksol": network_hashrate_sol / 1000,  # KSol/s
-            "network_hashrate_msol": network_hashrate_sol / 1_000_000,  # MSol/s
-            "block_reward": 1.25,  # ZEC per block (current after Nov 2025 halving)
-            "block_time_seconds": avg_block_time,
-            "difficulty": difficulty,
-            "source": "2Miners API (Real-time)"
-        }
+    # History is best-effort - a full disk must not stop snapshots updating
+    try:
+        history.record(samples)
+    except Exception as e:
+        print(f"Error recording history: {e}")
+
+    # Hand the run to every worker process
+    if serving_role == "refresher":
+        snapshot_hub.publish({
+            "results": results,
+            "data_sources": data_source_status,
+            "switching": switcher.last_evaluation,
+            "forecasters": {coin: forecaster.state() for coin, forecaster in forecasters.items()},
+            "metrics": upstream_metrics()
+        })
+
+def apply_published(payload: Dict):
+    """Apply a run received from the refresher's snapshot hub (worker processes)"""
+    global refresher_metrics
+
+    refresher_metrics = payload.get("metrics")
+    for key, statuses in payload["data_sources"].items():
+        if key in COINS:
+            COINS[key].status.update(statuses)
+    switcher.last_evaluation = payload.get("switching")
+    for coin, state in payload.get("forecasters", {}).items():
+        if coin in forecasters:
+            forecasters[coin].load_state(state)
+    apply_results(payload["results"])
+
+def seed_forecasters():
+    """Load recorded hashrate history into the growth fits (once per refreshing process)"""
+    global forecasters_seeded
+
+    end = time.time()
+    start = end - FORECAST_SEED_DAYS * 86400
+    try:
+        recorded = history.query(FORECAST_SERIES.values(), start, end, tier=3600)["series"]
+    except Exception as e:
+        print(f"Error loading hashrate history: {e}")
+        recorded = {}
 
-        return stats
+    for coin, series in FORECAST_SERIES.items():
+        for ts, mean, _, _ in recorded.get(series, []):
+            forecasters[coin].add(ts, mean)
+    forecasters_seeded = True
 
-    except Exception as e:
-        print(f"2Miners ZEC API failed: {e}")
-        data_source_status["zcash"]["network"]["status"] = "failed"
-        data_source_status["zcash"]["network"]["timestamp"] = datetime.now().isoformat()
-        return None
+def recompute_snapshots():
+    """Recompute projections from cached inputs and publish them"""
+    results = run_calculator(coins="all")
+    if results:
+        publish_results(results)
+
+# Each source refreshes on its own cadence; projections are recomputed only
+# when a refreshed value differs from the last one
+refresh_scheduler = RefreshScheduler([
+    RefreshJob("prices", lambda: prices.refresh(ttl=PRICE_CACHE_TTL_S), PRICE_REFRESH_S),
+] + [
+    RefreshJob(adapter.cache_key(name), partial(adapter.refresh_source, name), source.interval)
+    for adapter in COINS.values()
+    for name, source in adapter.sources.items()
+], on_change=recompute_snapshots)
+
+def background_update():
+    """Background thread to keep every coin selection's snapshot warm"""
+    refresh_scheduler.run_forever()
+
+def start_background_updates():
+    """Start the background update thread once per process"""
+    global update_thread
+
+    with update_thread_lock:
+        if serving_role == "worker":
+            snapshot_hub.start()  # Follow the refresher (snapshots and fits) instead of fetching
+            return
+        if not forecasters_seeded:
+            seed_forecasters()
+        if update_thread is None:
+            update_thread = threading.Thread(target=background_update, daemon=True)
+            update_thread.start()
 
 # ============================================================================
-# Income Calculation Functions
+# Flask Routes
 # ============================================================================
 
-def calculate_daily_kas_production(
-    miner_hashrate_ths: float,
-    network_hashrate_ths: float,
-    block_reward: float,
-    block_time_seconds: float
-) -> float:
-    """
-    Calculate expected daily KAS production
-
-    Formula:
-    Daily KAS = (Your Hashrate / Network Hashrate) × Blocks per Day × Block Reward
-    """
-    # Calculate blocks per day
-    seconds_per_day = 86400
-    blocks_per_day = seconds_per_day / block_time_seconds
-
-    # Calculate your share of network hashrate
-    hashrate_share = miner_hashrate_ths / network_hashrate_ths
+@app.route('/')
+def index():
+    """Main dashboard page"""
+    return render_template('index.html')
 
-    # Calculate daily KAS
-    daily_kas = hashrate_share * blocks_per_day * block_reward
+@app.before_request
+def ensure_background_updates():
+    """Make sure snapshots are being kept warm under any WSGI server"""
+    start_background_updates()
+    record_client_poll()
+
+    # A worker that has not heard from the refresher yet has nothing to serve
+    if serving_role == "worker" and latest_results is None \
+            and request.endpoint not in WORKER_WARMUP_ENDPOINTS:
+        response = jsonify({"error": "Waiting for the first snapshot from the refresher"})
+        response.status_code = 503
+        response.headers['Retry-After'] = str(WORKER_WARMUP_RETRY_AFTER_S)
+        return response
+
+def record_client_poll():
+    """Note client activity so the scheduler (here or in the refresher) stays awake"""
+    if serving_role == "worker":
+        snapshot_hub.record_client_poll()
+    else:
+        refresh_scheduler.record_client_poll()
 
-    return daily_kas
+def get_coin_selection() -> str:
+    """Get coin selection from query params (kaspa, zcash, or both)"""
+    coins = request.args.get('coins', 'both')
+    return coins if coins in COIN_SELECTIONS else 'both'
 
-def calculate_income_projections(
-    daily_kas: float,
-    kas_price_gbp: float,
-    pool_fee_percent: float = 0.0
-) -> Dict:
+def encoded_response(encoded: Dict) -> Response:
     """
-    Calculate income projections in GBP
+    Serve a pre-serialised snapshot with ETag / If-None-Match support
 
-    Args:
-        daily_kas: KAS earned per day
-        kas_price_gbp: Current KAS price in GBP
-        pool_fee_percent: Pool fee (0-100)
-
-    Returns:
-        Dict with daily/monthly/yearly projections
+    Picks the best precompressed variant the client accepts (br, gzip, identity)
     """
-    # Apply pool fee
-    fee_multiplier = 1 - (pool_fee_percent / 100)
-    daily_kas_after_fee = daily_kas * fee_multiplier
+    etag = encoded["etag"]
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+        response.set_etag(etag)
+        return response
+
+    content_encoding = None
+    body = encoded["body"]
+    for coding in ("br", "gzip"):
+        if coding in encoded and request.accept_encodings[coding]:
+            content_encoding = coding
+            body = encoded[coding]
+            break
+
+    response = Response(body, mimetype='application/json')
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'  # Always revalidate - 304s are cheap
+    response.headers['Vary'] = 'Accept-Encoding'
+    if content_encoding:
+        response.headers['Content-Encoding'] = content_encoding
+    return response
 
-    # Calculate GBP income
-    daily_gbp = daily_kas_after_fee * kas_price_gbp
-    monthly_gbp = daily_gbp * 30
-    yearly_gbp = daily_gbp * 365
+@app.route('/api/calculator')
+def get_calculator_data():
+    """API endpoint to get calculator results with optional coin selection"""
+    coins = get_coin_selection()
 
-    # Calculate ROI
-    roi_days = KS5M_COST_GBP / daily_gbp if daily_gbp > 0 else 0
+    # Served from the warm snapshot; only a cold start waits for the first run
+    if snapshots.get_encoded(coins) is None:
+        snapshots.wait_for(coins, timeout=FIRST_SNAPSHOT_WAIT_S)
 
-    return {
-        "daily_kas": round(daily_kas_after_fee, 2),
-        "daily_gbp": round(daily_gbp, 2),
-        "monthly_gbp": round(monthly_gbp, 2),
-        "yearly_gbp": round(yearly_gbp, 2),
-        "roi_days": round(roi_days, 1),
-        "pool_fee_percent": pool_fee_percent,
-        "kas_price_gbp": kas_price_gbp
-    }
+    encoded = snapshots.get_encoded(coins)
+    if encoded:
+        return encoded_response(encoded)
+    else:
+        return jsonify({"error": "Failed to fetch calculator data"}), 500
 
-def calculate_daily_zec_production(
-    miner_hashrate_ksol: float,
-    network_hashrate_sol: float,
-    block_reward: float,
-    block_time_seconds: float
-) -> float:
+@app.route('/api/stream')
+def stream_calculator_data():
+    """Server-Sent Events stream that pushes a snapshot whenever it changes"""
+    coins = get_coin_selection()
+
+    def events():
+        yield f"retry: {SSE_RETRY_MS}\n\n"
+
+        # Version 0 means "never sent", so the current snapshot goes out first
+        version = 0
+        while True:
+            snapshot, version = snapshots.wait_for(coins, after_version=version,
+                                                   timeout=SSE_KEEPALIVE_S)
+            # An open stream is an active client - keep the scheduler awake
+            record_client_poll()
+
+            if snapshot is None:
+                yield ": keepalive\n\n"
+            else:
+                # Compact pre-serialised JSON has no newlines, so it fits one data: line
+                yield b"data: " + snapshots.get_encoded(coins)["body"] + b"\n\n"
+
+    return Response(events(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'  # Disable proxy buffering (nginx)
+    })
+
+def parse_float_list(name: str, default: str) -> list:
+    """Parse a comma-separated list of numbers from a query parameter"""
+    raw = request.args.get(name, default)
+    try:
+        values = [float(v) for v in raw.split(',') if v.strip()]
+    except ValueError:
+        raise ValueError(f"'{name}' must be a comma-separated list of numbers")
+    if not values:
+        raise ValueError(f"'{name}' must contain at least one number")
+    if len(values) > MAX_AXIS_LENGTH:
+        raise ValueError(f"'{name}' accepts at most {MAX_AXIS_LENGTH} values")
+    return values
+
+@app.route('/api/projections')
+def get_projections():
     """
-    Calculate expected daily ZEC production
-
-    Formula:
-    Daily ZEC = (Your Hashrate / Network Hashrate) × Blocks per Day × Block Reward
+    API endpoint for the full fleet income/ROI grid
+
+    Query params (comma-separated lists):
+        coin: kaspa, zcash or aeternity (default kaspa)
+        miners: fleet sizes (default 1,5,10,20)
+        fees: pool fees in percent (default 0,1)
+        tariffs: electricity tariffs in GBP/kWh (default 0)
+        price: coin price multipliers (default 1)
+        hashrate: network hashrate multipliers (default 1)
+        forecast: p5/p25/p50/p75/p95 - follow the forecast network hashrate
+            growth (that earnings band) instead of a frozen network
     """
-    # Convert miner hashrate to Sol/s
-    miner_hashrate_sol = miner_hashrate_ksol * 1000
+    coin = request.args.get('coin', 'kaspa')
+    adapter = COINS.get(coin)
+    if adapter is None:
+        return jsonify({"error": f"coin must be one of {', '.join(COINS)}"}), 400
 
-    # Calculate blocks per day
-    seconds_per_day = 86400
-    blocks_per_day = seconds_per_day / block_time_seconds
-
-    # Calculate your share of network hashrate
-    hashrate_share = miner_hashrate_sol / network_hashrate_sol
-
-    # Calculate daily ZEC
-    daily_zec = hashrate_share * blocks_per_day * block_reward
-
-    return daily_zec
-
-def calculate_zec_income_projections(
-    daily_zec: float,
-    zec_price_gbp: float,
-    pool_fee_percent: float = 0.0
-) -> Dict:
+    try:
+        axes = {
+            "miners": parse_float_list('miners', '1,5,10,20'),
+            "pool_fee_percent": parse_float_list('fees', '0,1'),
+            "tariff_gbp_kwh": parse_float_list('tariffs', '0'),
+            "price_multiplier": parse_float_list('price', '1'),
+            "hashrate_multiplier": parse_float_list('hashrate', '1')
+        }
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    band = request.args.get('forecast')
+    if band is not None and band not in BAND_Z:
+        return jsonify({"error": f"forecast must be one of {', '.join(BAND_Z)}"}), 400
+
+    cells = 1
+    for values in axes.values():
+        cells *= len(values)
+    if cells > MAX_GRID_CELLS:
+        return jsonify({"error": f"Grid too large ({cells} cells, max {MAX_GRID_CELLS})"}), 400
+
+    # Projections use the inputs of the latest warm snapshot - no upstream calls
+    snapshot = snapshots.get(coin)
+    if not snapshot or coin not in snapshot:
+        return jsonify({"error": f"No {coin} data available yet"}), 503
+
+    data = snapshot[coin]
+    network = data["network"]
+    daily_coin = adapter.daily_coin(network)
+    price_gbp = data["market"][adapter.price_key()]
+    reward_curve = adapter.reward_curve(network)
+
+    if band is not None:
+        reward_ratios = np.diff(reward_curve) if reward_curve is not None else None
+        curves = forecasters[coin].earnings_curves(MAX_HORIZON_DAYS, reward_ratios)
+        if curves is None:
+            return jsonify({"error": f"Not enough {coin} hashrate history to forecast yet"}), 503
+        reward_curve = curves[band]
+
+    grid = project_fleet(
+        daily_coin, price_gbp, data["miner"]["power_w"], data["miner"]["cost_gbp"],
+        miner_counts=axes["miners"],
+        pool_fees_percent=axes["pool_fee_percent"],
+        tariffs_gbp_kwh=axes["tariff_gbp_kwh"],
+        price_multipliers=axes["price_multiplier"],
+        hashrate_multipliers=axes["hashrate_multiplier"],
+        reward_curve=reward_curve
+    )
+
+    return jsonify({
+        "coin": coin,
+        "timestamp": snapshot["timestamp"],
+        "inputs": {
+            "daily_coin_per_miner": daily_coin,
+            "coin_price_gbp": price_gbp,
+            "miner": data["miner"]
+        },
+        "axes": {name: axes[name] for name in AXES},
+        "forecast": band,
+        "grid": grid_to_json(grid)
+    })
+
+@app.route('/api/forecast')
+def get_forecast():
     """
-    Calculate Zcash income projections in GBP
+    API endpoint for network hashrate growth forecast and earnings curves
 
-    Args:
-        daily_zec: ZEC earned per day
-        zec_price_gbp: Current ZEC price in GBP
-        pool_fee_percent: Pool fee (0-100)
-
-    Returns:
-        Dict with daily/monthly/yearly projections
+    Query params:
+        coin: kaspa, zcash or aeternity (default kaspa)
+        days: horizon (default 365)
+        miners: fleet size (default 1)
+        fee, tariff: pool fee percent and electricity GBP/kWh (default 0)
     """
-    # Apply pool fee
-    fee_multiplier = 1 - (pool_fee_percent / 100)
-    daily_zec_after_fee = daily_zec * fee_multiplier
-
-    # Calculate GBP income
-    daily_gbp = daily_zec_after_fee * zec_price_gbp
-    monthly_gbp = daily_gbp * 30
-    yearly_gbp = daily_gbp * 365
-
-    # Calculate ROI
-    roi_days = Z15PRO_COST_GBP / daily_gbp if daily_gbp > 0 else 0
+    coin = request.args.get('coin', 'kaspa')
+    adapter = COINS.get(coin)
+    if adapter is None:
+        return jsonify({"error": f"coin must be one of {', '.join(COINS)}"}), 400
 
-    return {
-        "daily_zec": round(daily_zec_after_fee, 4),
-        "daily_gbp": round(daily_gbp, 2),
-        "monthly_gbp": round(monthly_gbp, 2),
-        "yearly_gbp": round(yearly_gbp, 2),
-        "roi_days": round(roi_days, 1),
-        "pool_fee_percent": pool_fee_percent,
-        "zec_price_gbp": zec_price_gbp
-    }
+    snapshot = snapshots.get(coin)
+    if not snapshot or coin not in snapshot:
+        return jsonify({"error": f"No {coin} data available yet"}), 503
 
-# ============================================================================
-# Main Calculator
-# ============================================================================
+    try:
+        days = int(request.args.get('days', 365))
+        miners = int(request.args.get('miners', 1))
+        fee = float(request.args.get('fee', 0))
+        tariff = float(request.args.get('tariff', 0))
+        if not 1 <= days <= MAX_HORIZON_DAYS:
+            raise ValueError(f"days must be between 1 and {MAX_HORIZON_DAYS}")
+        if miners < 1:
+            raise ValueError("miners must be at least 1")
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    forecaster = forecasters[coin]
+    fit = forecaster.fit()
+    if fit is None:
+        return jsonify({
+            "error": f"Not enough {coin} hashrate history to forecast yet",
+            "samples": forecaster.samples
+        }), 503
+
+    data = snapshot[coin]
+    network = data["network"]
+    hashrate_key = adapter.network_hashrate_key
+    daily_coin = adapter.daily_coin(network)
+    price_gbp = data["market"][adapter.price_key()]
+    reward_ratios = adapter.reward_ratios(network, MAX_HORIZON_DAYS)
+
+    multipliers = forecaster.hashrate_multipliers(days, fit=fit)
+    curves = forecaster.earnings_curves(MAX_HORIZON_DAYS, reward_ratios, fit=fit)
+
+    daily_gross = daily_coin * (1 - fee / 100) * price_gbp * miners
+    daily_power = data["miner"]["power_w"] * miners / 1000 * 24 * tariff
+    cost = data["miner"]["cost_gbp"] * miners
+    elapsed = np.arange(days + 1)
+
+    earnings = {}
+    roi_days = {}
+    for band, curve in curves.items():
+        earnings[band] = np.round(daily_gross * curve[:days + 1] - daily_power * elapsed, 2).tolist()
+        roi = float(roi_days_on_curve(curve, np.array(cost), np.array(daily_gross), np.array(daily_power)))
+        roi_days[band] = round(roi, 1) if np.isfinite(roi) else None
+
+    return jsonify({
+        "coin": coin,
+        "timestamp": snapshot["timestamp"],
+        "fit": fit,
+        "day": elapsed.tolist(),
+        "network_hashrate": {
+            "unit": hashrate_key,
+            "now": network[hashrate_key],
+            # Day 0 is today's live value; bands are relative to it
+            **{band: [network[hashrate_key]] + (network[hashrate_key] * m).round(2).tolist()
+               for band, m in multipliers.items()}
+        },
+        "cumulative_net_gbp": earnings,
+        "roi_days": roi_days,
+        "inputs": {
+            "miners": miners,
+            "pool_fee_percent": fee,
+            "tariff_gbp_kwh": tariff,
+            "hardware_cost_gbp": cost
+        }
+    })
 
-def run_calculator(coins: str = "both") -> Dict:
+@app.route('/api/simulate')
+def get_simulation():
     """
-    Run the complete income calculator for selected coins
-
-    Args:
-        coins: "kaspa", "zcash", or "both" (default)
-
-    Returns:
-        Dict with all calculated data and projections
+    API endpoint for a Monte Carlo profitability simulation of a fleet
+
+    Query params:
+        coin: kaspa, zcash or aeternity (default kaspa)
+        miners: fleet size (default 1)
+        trials, days: simulation size (default 100000 trials over 365 days,
+            at most 200000 trials; 429 while the simulation slots are busy)
+        fee, tariff: pool fee percent and electricity GBP/kWh (default 0)
+        price_drift, price_vol, hashrate_growth, hashrate_vol: annualised scenario
+        seed: optional seed for reproducible results
     """
-    results = {
-        "timestamp": datetime.now().isoformat(),
-        "coins_enabled": coins
-    }
-
-    # Kaspa calculations
-    if coins in ["kaspa", "both"]:
-        kas_price = fetch_kas_price()
-        kas_network_stats = fetch_network_stats()
-        kas_pool_stats = fetch_2miners_stats()
-
-        if kas_price and kas_network_stats:
-            # Calculate daily KAS production
-            daily_kas = calculate_daily_kas_production(
-                miner_hashrate_ths=KS5M_HASHRATE_THS,
-                network_hashrate_ths=kas_network_stats["network_hashrate_ths"],
-                block_reward=kas_network_stats["block_reward"],
-                block_time_seconds=kas_network_stats["block_time_seconds"]
-            )
-
-            # Calculate income with different pools
-            emcd_income = calculate_income_projections(daily_kas, kas_price, pool_fee_percent=0.0)
-            miners_income = calculate_income_projections(daily_kas, kas_price, pool_fee_percent=1.0)
-
-            results["kaspa"] = {
-                "miner": {
-                    "model": "IceRiver KS5M",
-                    "hashrate_ths": KS5M_HASHRATE_THS,
-                    "power_w": KS5M_POWER_W,
-                    "cost_gbp": KS5M_COST_GBP
-                },
-                "network": kas_network_stats,
-                "market": {
-                    "kas_price_gbp": kas_price,
-                    "kas_price_usd": kas_price * 1.27
-                },
-                "income": {
-                    "emcd_pool": emcd_income,
-                    "2miners_pool": miners_income
-                },
-                "scaling": {}
-            }
-
-            # Calculate scaling (1, 5, 10, 20 miners)
-            for count in [1, 5, 10, 20]:
-                results["kaspa"]["scaling"][f"{count}_miners"] = {
-                    "daily_gbp": round(emcd_income["daily_gbp"] * count, 2),
-                    "monthly_gbp": round(emcd_income["monthly_gbp"] * count, 2),
-                    "yearly_gbp": round(emcd_income["yearly_gbp"] * count, 2),
-                    "daily_kas": round(emcd_income["daily_kas"] * count, 2),
-                    "hardware_cost_gbp": KS5M_COST_GBP * count,
-                    "roi_days": emcd_income["roi_days"]
-                }
-
-    # Zcash calculations
-    if coins in ["zcash", "both"]:
-        zec_price = fetch_zec_price()
-        zec_network_stats = fetch_zec_network_stats()
-
-        if zec_price and zec_network_stats:
-            # Calculate daily ZEC production
-            daily_zec = calculate_daily_zec_production(
-                miner_hashrate_ksol=Z15PRO_HASHRATE_KSOL,
-                network_hashrate_sol=zec_network_stats["network_hashrate_sol"],
-                block_reward=zec_network_stats["block_reward"],
-                block_time_seconds=zec_network_stats["block_time_seconds"]
-            )
-
-            # Calculate income with different pools (2Miners has 1% fee for ZEC)
-            income_0fee = calculate_zec_income_projections(daily_zec, zec_price, pool_fee_percent=0.0)
-            income_1fee = calculate_zec_income_projections(daily_zec, zec_price, pool_fee_percent=1.0)
-
-            results["zcash"] = {
-                "miner": {
-                    "model": "Antminer Z15 Pro",
-                    "hashrate_ksol": Z15PRO_HASHRATE_KSOL,
-                    "power_w": Z15PRO_POWER_W,
-                    "cost_gbp": Z15PRO_COST_GBP
-                },
-                "network": zec_network_stats,
-                "market": {
-                    "zec_price_gbp": zec_price,
-                    "zec_price_usd": zec_price * 1.27
-                },
-                "income": {
-                    "0_fee_pool": income_0fee,
-                    "2miners_pool": income_1fee
-                },
-                "scaling": {}
-            }
-
-            # Calculate scaling (1, 5, 10, 20 miners)
-            for count in [1, 5, 10, 20]:
-                results["zcash"]["scaling"][f"{count}_miners"] = {
-                    "daily_gbp": round(income_0fee["daily_gbp"] * count, 2),
-                    "monthly_gbp": round(income_0fee["monthly_gbp"] * count, 2),
-                    "yearly_gbp": round(income_0fee["yearly_gbp"] * count, 2),
-                    "daily_zec": round(income_0fee["daily_zec"] * count, 4),
-                    "hardware_cost_gbp": Z15PRO_COST_GBP * count,
-                    "roi_days": income_0fee["roi_days"]
-                }
-
-    # Return None if no data was fetched
-    if "kaspa" not in results and "zcash" not in results:
-        return None
+    coin = request.args.get('coin', 'kaspa')
+    adapter = COINS.get(coin)
+    if adapter is None:
+        return jsonify({"error": f"coin must be one of {', '.join(COINS)}"}), 400
 
-    return results
-
-# ============================================================================
-# Background Update Thread
-# ============================================================================
-
-def background_update():
-    """Background thread to continuously update calculator data"""
-    global latest_results, last_update
-
-    while True:
-        try:
-            results = run_calculator()
-            if results:
-                latest_results = results
-                last_update = datetime.now()
-        except Exception as e:
-            print(f"Error in background update: {e}")
-
-        # Update every second for real-time data
-        time.sleep(1)
+    snapshot = snapshots.get(coin)
+    if not snapshot or coin not in snapshot:
+        return jsonify({"error": f"No {coin} data available yet"}), 503
 
-# ============================================================================
-# Flask Routes
-# ============================================================================
+    data = snapshot[coin]
+    network = data["network"]
 
-@app.route('/')
-def index():
-    """Main dashboard page"""
-    return render_template('index.html')
-
-@app.route('/api/calculator')
-def get_calculator_data():
-    """API endpoint to get calculator results with optional coin selection"""
-    global latest_results, last_update, data_source_status
+    try:
+        miners = int(request.args.get('miners', 1))
+        if miners < 1:
+            raise ValueError("miners must be at least 1")
+
+        # Expected blocks the fleet finds per day at today's network hashrate
+        blocks_per_day = 86400 / network["block_time_seconds"]
+        days = int(request.args.get('days', DEFAULT_DAYS))
+        share = adapter.hashrate_share(network, miners)
+        price_gbp = data["market"][adapter.price_key()]
+        reward_ratios = adapter.reward_ratios(network, days)
+
+        seed = request.args.get('seed')
+        summary = simulation_pool.run(
+            expected_blocks_per_day=share * blocks_per_day,
+            block_reward=network["block_reward"],
+            price_gbp=price_gbp,
+            cost_gbp=data["miner"]["cost_gbp"] * miners,
+            power_w=data["miner"]["power_w"] * miners,
+            days=days,
+            trials=int(request.args.get('trials', DEFAULT_TRIALS)),
+            pool_fee_percent=float(request.args.get('fee', 0)),
+            tariff_gbp_kwh=float(request.args.get('tariff', 0)),
+            price_drift_annual=float(request.args.get('price_drift', DEFAULT_PRICE_DRIFT)),
+            price_vol_annual=float(request.args.get('price_vol', DEFAULT_PRICE_VOL)),
+            hashrate_growth_annual=float(request.args.get('hashrate_growth', DEFAULT_HASHRATE_GROWTH)),
+            hashrate_vol_annual=float(request.args.get('hashrate_vol', DEFAULT_HASHRATE_VOL)),
+            reward_ratios=reward_ratios,
+            seed=int(seed) if seed is not None else None
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    if summary is None:
+        return jsonify({"error": "Too many simulations running, try again shortly"}), 429
+
+    summary["coin"] = coin
+    summary["miners"] = miners
+    return jsonify(summary)
+
+def parse_history_range():
+    """
+    Parse start/end (Unix timestamps) or range (e.g. 6h, 30d) query params
 
-    # Get coin selection from query params (kaspa, zcash, or both)
-    coins = request.args.get('coins', 'both')
-    if coins not in ['kaspa', 'zcash', 'both']:
-        coins = 'both'
-
-    if latest_results is None or latest_results.get('coins_enabled') != coins:
-        # Initial calculation or coin selection changed
-        latest_results = run_calculator(coins=coins)
-        last_update = datetime.now()
-
-    if latest_results:
-        # Add last update info and data source status
-        response_data = latest_results.copy()
-        response_data['last_update'] = last_update.isoformat() if last_update else None
-        response_data['data_sources'] = data_source_status
-        return jsonify(response_data)
+    Returns: (start, end) Unix timestamps
+    """
+    units = {"m": 60, "h": 3600, "d": 86400, "w": 7 * 86400}
+    end = float(request.args.get('end', time.time()))
+    if 'start' in request.args:
+        start = float(request.args['start'])
     else:
-        return jsonify({"error": "Failed to fetch calculator data"}), 500
+        span = request.args.get('range', '24h')
+        if len(span) < 2 or span[-1] not in units:
+            raise ValueError("range must look like 30m, 24h, 30d or 12w")
+        start = end - float(span[:-1]) * units[span[-1]]
+    if start >= end:
+        raise ValueError("start must be before end")
+    return start, end
+
+@app.route('/api/history')
+def get_history():
+    """
+    API endpoint for recorded price, network and income history
+
+    Query params:
+        series: comma-separated series names (default: all, see /api/history/series)
+        range: lookback window, e.g. 6h, 30d (default 24h) - or start/end Unix timestamps
+        points: maximum points per series, used to pick the rollup tier (default 1000)
+        tier: force a resolution in seconds (0 = raw, 300, 3600, 86400)
+    """
+    try:
+        start, end = parse_history_range()
+        max_points = int(request.args.get('points', DEFAULT_MAX_POINTS))
+        if not 1 <= max_points <= MAX_POINTS:
+            raise ValueError(f"points must be between 1 and {MAX_POINTS}")
+        tier = int(request.args['tier']) if 'tier' in request.args else None
+
+        series = [s for s in request.args.get('series', '').split(',') if s]
+        result = history.query(series or history.series_names(), start, end,
+                               max_points=max_points, tier=tier)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    return jsonify(result)
+
+@app.route('/api/history/series')
+def get_history_series():
+    """API endpoint listing recorded history series and store size"""
+    return jsonify({
+        "series": history.series_names(),
+        "store": history.stats()
+    })
+
+@app.route('/api/switching')
+def get_switching():
+    """API endpoint for the recommended pool per miner and every ranked coin/pool option"""
+    if switcher.last_evaluation is None:
+        return jsonify({"error": "No calculator data yet"}), 503
+    return jsonify(switcher.last_evaluation)
 
 @app.route('/api/status')
 def get_data_source_status():
@@ -659,23 +771,51 @@ def get_data_source_status():
     global data_source_status
     return jsonify(data_source_status)
 
+def upstream_metrics() -> Dict:
+    """Fetch metrics of this process (connection reuse, coalescing, cache counters)"""
+    return {
+        "http": http_client.stats(),
+        "responses": dict(fetch_engine.responses.stats),
+        "fetch_cycle": fetch_engine.engine.last_cycle,
+        "cache": api_cache.stats(),
+        "scheduler": refresh_scheduler.stats()
+    }
+
+@app.route('/api/metrics')
+def get_metrics():
+    """
+    API endpoint to get upstream fetch metrics (connection reuse, coalescing, cache counters)
+
+    Workers never fetch, so they report the refresher's metrics as of its
+    last published run rather than their own idle counters.
+    """
+    if serving_role == "worker" and refresher_metrics is not None:
+        metrics, source = dict(refresher_metrics), "refresher"
+    else:
+        metrics, source = upstream_metrics(), serving_role
+    metrics["serving"] = {
+        "role": serving_role,
+        "metrics_from": source,
+        "snapshot_hub": dict(snapshot_hub.stats) if snapshot_hub else None
+    }
+    return jsonify(metrics)
+
 @app.route('/api/refresh')
 def refresh_data():
     """Force refresh of calculator data with optional coin selection"""
-    global latest_results, last_update
+    coins = get_coin_selection()
 
-    # Get coin selection from query params
-    coins = request.args.get('coins', 'both')
-    if coins not in ['kaspa', 'zcash', 'both']:
-        coins = 'both'
+    # Refetch every source now rather than waiting for its next scheduled run
+    if serving_role == "worker":
+        version = snapshots.version(coins)
+        if snapshot_hub.request_refresh():
+            snapshots.wait_for(coins, after_version=version, timeout=WORKER_REFRESH_WAIT_S)
+    else:
+        refresh_scheduler.refresh_now()
 
-    results = run_calculator(coins=coins)
-    if results:
-        latest_results = results
-        last_update = datetime.now()
-        response_data = results.copy()
-        response_data['last_update'] = last_update.isoformat()
-        return jsonify(response_data)
+    encoded = snapshots.get_encoded(coins)
+    if encoded:
+        return encoded_response(encoded)
     else:
         return jsonify({"error": "Failed to refresh calculator data"}), 500
 
@@ -685,8 +825,7 @@ def refresh_data():
 
 if __name__ == "__main__":
     # Start background update thread
-    update_thread = threading.Thread(target=background_update, daemon=True)
-    update_thread.start()
+    start_background_updates()
 
     print("Starting KaspaMine Income Calculator Web App...")
     print("Open your browser to http://localhost:8080")
@@ -13,11 +13,19 @@ Features:
 
 import json
 import os
+import sys
 import time
 from datetime import datetime, timedelta
 from pathlib import Path
 import logging
 
+# Live prices come from the calculator's batched CoinGecko price service
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+try:
+    from price_service import TRACKED_COINS, prices
+except ImportError:
+    TRACKED_COINS, prices = {}, None
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
@@ -31,6 +39,37 @@ logging.basicConfig(
 CONFIG_FILE = "/home/user/A5000mine/automation/config.json"
 STATE_FILE = "/home/user/A5000mine/automation/state.json"
 
+# Fallback rates used only when live prices are unavailable
+FALLBACK_USD_RATES = {
+    "AE": 0.035,
+    "KAS": 0.13,
+    "ZEC": 42.50
+}
+FALLBACK_USD_TO_GBP = 0.79
+
+
+def get_usd_rate(crypto):
+    """Get live USD rate for a crypto symbol, falling back to a static estimate"""
+    symbol = crypto.upper()
+    if prices is not None:
+        coin_ids = [cid for cid, sym in TRACKED_COINS.items() if sym == symbol]
+        if coin_ids:
+            rate, status = prices.get_price(coin_ids[0], "usd")
+            if rate is not None:
+                return rate
+    logging.warning(f"Live {symbol} price unavailable, using fallback rate")
+    return FALLBACK_USD_RATES.get(symbol, 0)
+
+
+def get_usd_to_gbp_rate():
+    """Get live USD->GBP rate, falling back to a static estimate"""
+    if prices is not None:
+        rate = prices.usd_to_gbp_rate()
+        if rate is not None:
+            return rate
+    logging.warning("Live USD->GBP rate unavailable, using fallback rate")
+    return FALLBACK_USD_TO_GBP
+
 
 class CryptoConverter:
     """Manages automated cryptocurrency conversions"""
@@ -150,14 +189,8 @@ class CryptoConverter:
         # https://docs.kraken.com/rest/
         logging.info(f"Kraken: {amount} {crypto} → {stablecoin}")
 
-        # Mock conversion
-        mock_rates = {
-            "AE": 0.035,   # AE to USD
-            "KAS": 0.13,   # KAS to USD
-            "ZEC": 42.50   # ZEC to USD
-        }
-
-        rate = mock_rates.get(crypto.upper(), 0)
+        # Mock conversion at live market rate
+        rate = get_usd_rate(crypto)
         usd_value = amount * rate
 
         return {
@@ -210,8 +243,8 @@ class CryptoConverter:
         # https://api-docs.wise.com/
         logging.info(f"Wise: {usd_amount} USD → GBP")
 
-        # Mock conversion (current rate ~0.79)
-        gbp_rate = 0.79
+        # Mock conversion at live market rate
+        gbp_rate = get_usd_to_gbp_rate()
         gbp_amount = usd_amount * gbp_rate
         fee = usd_amount * 0.005  # 0.5% fee
 
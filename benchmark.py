@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+"""
+Calculator API Load Test and Latency Benchmark
+Starts app.py against stubbed upstreams (fixture_server.py), drives
+concurrent pollers at its endpoints and reports p50/p95/p99 latency,
+throughput and server CPU time per request.
+
+- Upstreams: recorded fixtures (upstream_replay.py) if present, otherwise
+  built-in stub payloads, served with configurable latency
+- The app runs in its own process (threaded WSGI server, fresh history DB)
+  so its CPU time can be measured apart from the load generator
+- Results are saved as JSON; --compare flags p95/p99 latency and CPU per
+  request regressions against a previous run (exit code 1)
+
+Examples:
+    python3 benchmark.py --clients 20 --duration 30
+    python3 benchmark.py --mix calculator=90,status=9,refresh=1 --save bench/after.json \\
+        --compare bench/before.json
+"""
+
+import argparse
+import json
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+import requests
+
+from fixture_server import UpstreamBehaviour, make_server
+from upstream_replay import DEFAULT_FIXTURES_DIR, FixtureStore, to_response
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+ENDPOINTS = {
+    "calculator": "/api/calculator?coins=both",
+    "status": "/api/status",
+    "refresh": "/api/refresh?coins=both",
+}
+DEFAULT_MIX = "calculator=90,status=9,refresh=1"   # Weighted like dashboard pollers
+
+DEFAULT_CLIENTS = 10
+DEFAULT_DURATION_S = 20
+DEFAULT_UPSTREAM_LATENCY_MS = 100
+STARTUP_TIMEOUT_S = 30          # Wait for the first snapshot before measuring
+REQUEST_TIMEOUT_S = 30
+REGRESSION_THRESHOLD_PCT = 10   # --compare fails on >10% worse p95/p99/CPU
+
+PERCENTILES = (50, 95, 99)
+
+# Upstream payloads used when no fixtures were recorded (plausible, not live)
+STUB_PAYLOADS = {
+    "https://kas.2miners.com/api/stats": {
+        "nodes": [{"networkhashps": "626000000000000000", "difficulty": "1.0e14"}],
+        "hashrate": 1.0e15, "workers": 1000, "fee": 1.0},
+    "https://zec.2miners.com/api/stats": {
+        "nodes": [{"networkhashps": "13000000000", "difficulty": "1.0e8", "avgBlockTime": 75}],
+        "hashrate": 1.0e9, "workers": 100, "fee": 1.0},
+    "https://ae.2miners.com/api/stats": {
+        "nodes": [{"networkhashps": "5800", "difficulty": "3.0e9", "avgBlockTime": 180}],
+        "hashrate": 100, "workers": 10, "fee": 1.0},
+    "https://api.kaspa.org/info/blockreward": {"blockreward": 3.67},
+}
+STUB_PRICES = {"kaspa": (0.0395, 0.05), "zcash": (45.0, 57.0), "aeternity": (0.004, 0.005)}
+
+
+# ============================================================================
+# Setup
+# ============================================================================
+
+def write_stub_fixtures(path: str):
+    """Write stub upstream fixtures so the benchmark runs without recordings"""
+    from price_service import COINGECKO_API, prices
+
+    store = FixtureStore(path)
+    for url, body in STUB_PAYLOADS.items():
+        store.save(url, None, to_response({"status": 200, "body": json.dumps(body)}, url))
+
+    url = f"{COINGECKO_API}/simple/price"
+    params = {"ids": ",".join(prices.coin_ids), "vs_currencies": ",".join(prices.vs_currencies)}
+    body = {coin: dict(zip(("gbp", "usd"), STUB_PRICES.get(coin, (1.0, 1.3)))) for coin in prices.coin_ids}
+    store.save(url, params, to_response({"status": 200, "body": json.dumps(body)}, url))
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def serve_app(port: int):
+    """Run app.py on a threaded WSGI server (benchmark child process)"""
+    from werkzeug.serving import make_server as make_wsgi_server
+
+    import app as calculator_app
+    calculator_app.start_background_updates()
+    make_wsgi_server("127.0.0.1", port, calculator_app.app, threaded=True).serve_forever()
+
+
+def process_cpu_s(pid: int) -> Optional[float]:
+    """User + system CPU seconds of a process (Linux /proc), or None"""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+def wait_until_ready(base_url: str, timeout: float = STARTUP_TIMEOUT_S):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if requests.get(base_url + ENDPOINTS["calculator"], timeout=5).status_code == 200:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.25)
+    raise RuntimeError(f"App did not serve calculator data within {timeout}s")
+
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in ENDPOINTS:
+            raise ValueError(f"Unknown endpoint '{name}' (choose from {', '.join(ENDPOINTS)})")
+        weights[name] = float(weight or 1)
+    return weights
+
+
+# ============================================================================
+# Load Generator
+# ============================================================================
+
+def run_clients(base_url: str, weights: Dict[str, float], clients: int, duration: float,
+                seed: int = 0) -> Dict[str, Dict[str, List]]:
+    """
+    Drive concurrent pollers for duration seconds
+
+    Each client keeps its own keep-alive session and picks endpoints at
+    random by weight, back to back (closed loop).
+
+    Returns: Dict of endpoint -> {"latencies": [s], "errors": int}
+    """
+    names = list(weights)
+    probabilities = np.array([weights[name] for name in names])
+    probabilities /= probabilities.sum()
+    results = {name: {"latencies": [], "errors": 0} for name in names}
+    lock = threading.Lock()
+    stop_at = time.monotonic() + duration
+
+    def client(index: int):
+        rng = np.random.default_rng([seed, index])
+        session = requests.Session()
+        latencies = {name: [] for name in names}
+        errors = dict.fromkeys(names, 0)
+        while time.monotonic() < stop_at:
+            name = names[rng.choice(len(names), p=probabilities)]
+            started = time.perf_counter()
+            try:
+                response = session.get(base_url + ENDPOINTS[name], timeout=REQUEST_TIMEOUT_S)
+                response.content  # Include body transfer
+                ok = response.status_code == 200
+            except requests.RequestException:
+                ok = False
+            if ok:
+                latencies[name].append(time.perf_counter() - started)
+            else:
+                errors[name] += 1
+        with lock:
+            for name in names:
+                results[name]["latencies"].extend(latencies[name])
+                results[name]["errors"] += errors[name]
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def summarise(samples: Dict[str, Dict[str, List]], elapsed: float, cpu_s: Optional[float]) -> Dict:
+    """Latency percentiles (ms), throughput and CPU per request"""
+    endpoints = {}
+    total = errors = 0
+    for name, data in samples.items():
+        latencies = np.array(data["latencies"]) * 1000
+        total += len(latencies)
+        errors += data["errors"]
+        entry = {"requests": len(latencies), "errors": data["errors"],
+                 "throughput_rps": round(len(latencies) / elapsed, 1)}
+        if len(latencies):
+            entry.update({f"p{p}_ms": round(float(v), 2)
+                          for p, v in zip(PERCENTILES, np.percentile(latencies, PERCENTILES))})
+            entry["max_ms"] = round(float(latencies.max()), 2)
+        endpoints[name] = entry
+
+    return {
+        "requests": total,
+        "errors": errors,
+        "elapsed_s": round(elapsed, 2),
+        "throughput_rps": round(total / elapsed, 1),
+        "server_cpu_s": round(cpu_s, 3) if cpu_s is not None else None,
+        "cpu_ms_per_request": round(cpu_s / total * 1000, 3) if cpu_s is not None and total else None,
+        "endpoints": endpoints
+    }
+
+
+# ============================================================================
+# Comparison
+# ============================================================================
+
+def compare(current: Dict, previous: Dict, threshold_pct: float = REGRESSION_THRESHOLD_PCT) -> List[str]:
+    """
+    Regressions of the current run against a previous one
+
+    Returns: Human-readable regression lines (empty = no regression)
+    """
+    regressions = []
+
+    def check(label, now, before):
+        if now is None or not before:
+            return
+        change = (now - before) / before * 100
+        marker = "REGRESSION" if change > threshold_pct else "ok"
+        print(f"  {label:<28} {before:>10.2f} -> {now:>10.2f}  ({change:+.1f}%)  {marker}")
+        if change > threshold_pct:
+            regressions.append(f"{label} {before:.2f} -> {now:.2f} ({change:+.1f}%)")
+
+    print(f"\nCompared with {previous.get('timestamp', 'previous run')}:")
+    check("cpu_ms_per_request", current["summary"]["cpu_ms_per_request"],
+          previous["summary"].get("cpu_ms_per_request"))
+    for name, entry in current["summary"]["endpoints"].items():
+        before = previous["summary"]["endpoints"].get(name, {})
+        for key in ("p95_ms", "p99_ms"):
+            check(f"{name} {key}", entry.get(key), before.get(key))
+    return regressions
+
+
+def display(report: Dict):
+    summary = report["summary"]
+    print(f"\n{'Endpoint':<12} {'Requests':>9} {'Errors':>7} {'RPS':>8} "
+          f"{'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    print("-" * 78)
+    for name, e in summary["endpoints"].items():
+        print(f"{name:<12} {e['requests']:>9,} {e['errors']:>7,} {e['throughput_rps']:>8.1f} "
+              f"{e.get('p50_ms', 0):>9.2f} {e.get('p95_ms', 0):>9.2f} {e.get('p99_ms', 0):>9.2f} "
+              f"{e.get('max_ms', 0):>9.2f}")
+    print("-" * 78)
+    cpu = summary["cpu_ms_per_request"]
+    print(f"Total: {summary['requests']:,} requests in {summary['elapsed_s']}s = "
+          f"{summary['throughput_rps']} req/s, "
+          f"server CPU {cpu if cpu is not None else 'n/a'} ms/request")
+
+
+# ============================================================================
+# CLI Interface
+# ============================================================================
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(
+        description="Load test the calculator API against stubbed upstreams",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__.split("Examples:")[1])
+    parser.add_argument('--clients', type=int, default=DEFAULT_CLIENTS,
+                        help=f'Concurrent pollers (default: {DEFAULT_CLIENTS})')
+    parser.add_argument('--duration', type=float, default=DEFAULT_DURATION_S,
+                        help=f'Measured seconds (default: {DEFAULT_DURATION_S})')
+    parser.add_argument('--mix', default=DEFAULT_MIX,
+                        help=f'Endpoint weights (default: {DEFAULT_MIX})')
+    parser.add_argument('--upstream-latency-ms', type=float, default=DEFAULT_UPSTREAM_LATENCY_MS,
+                        help=f'Stub upstream latency (default: {DEFAULT_UPSTREAM_LATENCY_MS})')
+    parser.add_argument('--upstream-error-rate', type=float, default=0.0,
+                        help='Fraction of upstream requests failing with HTTP 503')
+    parser.add_argument('--fixtures', default=None,
+                        help=f'Recorded fixtures to serve (default: {DEFAULT_FIXTURES_DIR} if present, else stubs)')
+    parser.add_argument('--save', metavar='FILE', help='Save results as JSON')
+    parser.add_argument('--compare', metavar='FILE', help='Previous results to check for regressions')
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD_PCT,
+                        help=f'Regression threshold in percent (default: {REGRESSION_THRESHOLD_PCT})')
+    parser.add_argument('--serve-app', type=int, metavar='PORT', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve_app:
+        serve_app(args.serve_app)
+        return 0
+
+    weights = parse_mix(args.mix)
+    workdir = tempfile.mkdtemp(prefix="calculator-bench-")
+
+    fixtures = args.fixtures
+    if fixtures is None:
+        has_recordings = os.path.isdir(DEFAULT_FIXTURES_DIR) and any(FixtureStore(DEFAULT_FIXTURES_DIR))
+        fixtures = DEFAULT_FIXTURES_DIR if has_recordings else os.path.join(workdir, "fixtures")
+        if not has_recordings:
+            write_stub_fixtures(fixtures)
+
+    behaviour = UpstreamBehaviour(latency_ms=args.upstream_latency_ms,
+                                  error_rate=args.upstream_error_rate, seed=0)
+    upstream = make_server(fixtures, port=0, behaviour=behaviour, quiet=True)
+    threading.Thread(target=upstream.serve_forever, daemon=True).start()
+
+    port = free_port()
+    env = dict(os.environ,
+               UPSTREAM_URL=f"http://127.0.0.1:{upstream.server_address[1]}",
+               HISTORY_DB=os.path.join(workdir, "history.db"))
+    server = subprocess.Popen([sys.executable, os.path.abspath(__file__), "--serve-app", str(port)],
+                              env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    base_url = f"http://127.0.0.1:{port}"
+
+    try:
+        print(f"Starting app against stub upstreams ({fixtures}, {args.upstream_latency_ms:.0f} ms)...")
+        wait_until_ready(base_url)
+        print(f"Running {args.clients} clients for {args.duration:.0f}s ({args.mix})...")
+
+        cpu_before = process_cpu_s(server.pid)
+        started = time.perf_counter()
+        samples = run_clients(base_url, weights, args.clients, args.duration)
+        elapsed = time.perf_counter() - started
+        cpu_after = process_cpu_s(server.pid)
+    finally:
+        server.terminate()
+        server.wait()
+        upstream.shutdown()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    cpu_s = cpu_after - cpu_before if cpu_before is not None and cpu_after is not None else None
+    report = {
+        "timestamp": datetime.now().isoformat(),
+        "config": {
+            "clients": args.clients, "duration_s": args.duration, "mix": weights,
+            "upstream_latency_ms": args.upstream_latency_ms,
+            "upstream_error_rate": args.upstream_error_rate, "cpus": os.cpu_count()
+        },
+        "summary": summarise(samples, elapsed, cpu_s),
+        "upstream": dict(behaviour.stats)
+    }
+    display(report)
+
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        with open(args.save, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Saved results to {args.save}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(report, json.load(f), args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) over {args.threshold}%")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Thread-Safe TTL Cache for Upstream API Data
+Shared by the background update thread and Flask request threads.
+
+- Monotonic-clock TTLs (immune to wall-clock jumps)
+- Lock striping: keys hash onto a fixed set of locks, so loads of different
+  keys never block each other
+- Single-flight: only one thread loads or refreshes a given key at a time
+- Stale-while-revalidate: an expired entry is served immediately while one
+  background thread refreshes it
+- LRU eviction beyond max_entries, and hit/miss/stale counters
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_LOCK_STRIPES = 16
+DEFAULT_STALE_TTL = 300  # Seconds an expired entry may still be served while refreshing
+
+
+# ============================================================================
+# TTL Cache
+# ============================================================================
+
+class _Entry:
+    __slots__ = ("value", "expires_at", "stale_until", "refreshing")
+
+    def __init__(self, value: Any, ttl: float, stale_ttl: float):
+        now = time.monotonic()
+        self.value = value
+        self.expires_at = now + ttl
+        self.stale_until = now + ttl + stale_ttl
+        self.refreshing = False
+
+
+class TTLCache:
+    """Lock-striped TTL cache with single-flight loading and stale-while-revalidate"""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 stripes: int = DEFAULT_LOCK_STRIPES,
+                 stale_ttl: float = DEFAULT_STALE_TTL):
+        self.max_entries = max_entries
+        self.stale_ttl = stale_ttl
+        self._entries = OrderedDict()  # key -> _Entry, in LRU order
+        self._lock = threading.Lock()  # Guards _entries and counters (held briefly)
+        self._stripes = [threading.Lock() for _ in range(stripes)]
+        self._counters = {
+            "hits": 0, "misses": 0, "stale": 0,
+            "loads": 0, "refreshes": 0, "load_errors": 0, "evictions": 0
+        }
+
+    def _stripe(self, key: str) -> threading.Lock:
+        return self._stripes[hash(key) % len(self._stripes)]
+
+    def _count(self, name: str):
+        with self._lock:
+            self._counters[name] += 1
+
+    def _lookup(self, key: str) -> Optional[_Entry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, value: Any, ttl: float, stale_ttl: Optional[float] = None):
+        """Store a value for ttl seconds (servable stale for stale_ttl more)"""
+        entry = _Entry(value, ttl, self.stale_ttl if stale_ttl is None else stale_ttl)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._counters["evictions"] += 1
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get a value only if it has not expired"""
+        entry = self._lookup(key)
+        if entry is not None and time.monotonic() < entry.expires_at:
+            self._count("hits")
+            return entry.value
+        self._count("misses")
+        return None
+
+    def invalidate(self, key: str):
+        """Drop a key so the next lookup reloads it"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def get_or_load(self, key: str, loader: Callable[[], Any], ttl: float,
+                    stale_ttl: Optional[float] = None) -> Tuple[Optional[Any], str]:
+        """
+        Get a value, loading it with loader() if missing or expired
+
+        A loader result of None (or an exception) counts as a failed load and
+        is never cached.
+
+        Returns:
+            (value, status) where status is:
+            - "hit": fresh cached value
+            - "stale": expired value served while a background refresh runs,
+              or the last known value after a failed load
+            - "miss": value just loaded by this call
+            - "error": no value available
+        """
+        entry = self._lookup(key)
+        now = time.monotonic()
+
+        if entry is not None and now < entry.expires_at:
+            self._count("hits")
+            return entry.value, "hit"
+
+        if entry is not None and now < entry.stale_until:
+            self._count("stale")
+            self._refresh_in_background(key, entry, loader, ttl, stale_ttl)
+            return entry.value, "stale"
+
+        # Missing or too stale to serve: load synchronously, one thread per key
+        with self._stripe(key):
+            current = self._lookup(key)
+            if current is not None and current is not entry and time.monotonic() < current.expires_at:
+                # Another thread loaded it while we waited
+                self._count("hits")
+                return current.value, "hit"
+
+            self._count("misses")
+            value = self._load(key, loader, ttl, stale_ttl)
+            if value is not None:
+                return value, "miss"
+
+        # Last resort: serve whatever we had, however old
+        if entry is not None:
+            return entry.value, "stale"
+        return None, "error"
+
+    def _load(self, key: str, loader: Callable[[], Any], ttl: float,
+              stale_ttl: Optional[float]) -> Optional[Any]:
+        self._count("loads")
+        try:
+            value = loader()
+        except Exception as e:
+            print(f"Cache load for '{key}' failed: {e}")
+            value = None
+
+        if value is None:
+            self._count("load_errors")
+            return None
+
+        self.set(key, value, ttl, stale_ttl)
+        return value
+
+    def _refresh_in_background(self, key: str, entry: _Entry, loader: Callable[[], Any],
+                               ttl: float, stale_ttl: Optional[float]):
+        # Test-and-set only - the load itself runs without any lock held, so
+        # other stale readers (and keys on the same stripe) never wait on it
+        with self._lock:
+            if entry.refreshing:
+                return
+            entry.refreshing = True
+
+        def refresh():
+            try:
+                self._count("refreshes")
+                self._load(key, loader, ttl, stale_ttl)
+            finally:
+                with self._lock:
+                    entry.refreshing = False
+
+        threading.Thread(target=refresh, name=f"cache-refresh-{key}", daemon=True).start()
+
+    def stats(self) -> Dict:
+        """
+        Cache counters
+
+        Returns: Dict with hit/miss/stale/load counters, hit rate and entry count
+        """
+        with self._lock:
+            counters = dict(self._counters)
+            counters["entries"] = len(self._entries)
+        lookups = counters["hits"] + counters["misses"] + counters["stale"]
+        counters["hit_rate"] = round((counters["hits"] + counters["stale"]) / lookups, 3) if lookups else 0.0
+        return counters
+
+
+# Shared cache for upstream API data (web app, price service)
+api_cache = TTLCache()
@@ -4,18 +4,28 @@ KaspaMine Real-Time Income Calculator
 Fetches live data from multiple sources and calculates accurate income projections
 
 Data Sources:
-- CoinGecko API: KAS price in GBP
+- CoinGecko API: KAS price in GBP and USD
 - 2Miners API: Network hashrate and difficulty
 - Kaspa API: Real block reward (updates with emission schedule)
 - Pool APIs: EMCD, 2Miners pool stats
+
+Net profit after electricity uses the tariff profiles in config/tariffs.json
 """
 
 import json
-import requests
 import sys
 from datetime import datetime
 from typing import Dict, Optional
 
+import numpy as np
+
+from emission import MAX_HORIZON_DAYS, kaspa_emission
+from energy import net_profit, tariff_config
+from fetch_engine import get_json, run_concurrently
+from price_service import prices
+from projections import roi_days_on_curve
+from simulator import DEFAULT_DAYS, DEFAULT_TRIALS, run_simulation
+
 # ============================================================================
 # Configuration
 # ============================================================================
@@ -29,6 +39,9 @@ COINGECKO_API = "https://api.coingecko.com/api/v3"
 KASPA_EXPLORER_API = "https://api.kaspa.org"  # Primary
 KASPA_EXPLORER_BACKUP = "https://explorer.kaspa.org/api"  # Backup
 
+# Concurrent fetch cycle - all upstream calls run in parallel within this deadline
+FETCH_CYCLE_DEADLINE_S = 12.0
+
 # Colors for terminal output
 GREEN = '\033[92m'
 YELLOW = '\033[93m'
@@ -43,42 +56,47 @@ RESET = '\033[0m'
 
 def fetch_kas_price() -> Optional[float]:
     """
-    Fetch current KAS price in GBP from CoinGecko
+    Fetch current KAS price in GBP from CoinGecko (batched with all tracked coins)
     Returns: Price in GBP or None if failed
     """
-    try:
-        url = f"{COINGECKO_API}/simple/price"
-        params = {
-            "ids": "kaspa",
-            "vs_currencies": "gbp"
-        }
-        response = requests.get(url, params=params, timeout=10)
-        response.raise_for_status()
-        data = response.json()
+    price, status = prices.get_price("kaspa", "gbp")
+    if price is not None:
+        print(f"{GREEN}✓{RESET} Fetched KAS price: £{price:.4f}")
+    else:
+        print(f"{RED}✗{RESET} Error fetching KAS price from CoinGecko")
 
-        price = data.get("kaspa", {}).get("gbp")
-        if price:
-            print(f"{GREEN}✓{RESET} Fetched KAS price: £{price:.4f}")
-            return float(price)
+    return price
 
+
+def fetch_kas_block_reward() -> float:
+    """
+    Fetch real Kaspa block reward from Kaspa API
+    Returns: Block reward in KAS (falls back to 3.67 if the API is unavailable)
+    """
+    block_reward = 3.67  # Default fallback
+    try:
+        reward_data = get_json(f"{KASPA_EXPLORER_API}/info/blockreward", timeout=10)
+        block_reward = float(reward_data.get("blockreward", 3.67))
+        print(f"{GREEN}✓{RESET} Fetched real block reward from Kaspa API: {block_reward} KAS")
     except Exception as e:
-        print(f"{RED}✗{RESET} Error fetching KAS price from CoinGecko: {e}")
+        print(f"{YELLOW}⚠{RESET} Could not fetch block reward from Kaspa API: {e}, using fallback: {block_reward} KAS")
 
-    return None
+    return block_reward
 
 
-def fetch_network_stats() -> Optional[Dict]:
+def fetch_network_stats(include_block_reward: bool = True) -> Optional[Dict]:
     """
     Fetch Kaspa network statistics from 2Miners API and Kaspa API (REAL DATA ONLY)
+
+    Args:
+        include_block_reward: Also fetch the block reward (sequentially) from Kaspa API
+
     Returns: Dict with network_hashrate_ths, block_reward, block_time_seconds
     """
     try:
         # Fetch network hashrate from 2Miners
         url = "https://kas.2miners.com/api/stats"
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-
-        data = response.json()
+        data = get_json(url, timeout=10)
 
         # Extract real network hashrate from nodes[0].networkhashps
         nodes = data.get("nodes", [])
@@ -95,16 +113,9 @@ def fetch_network_stats() -> Optional[Dict]:
         # Get difficulty if available
         difficulty = data.get("nodes", [{}])[0].get("difficulty", 0)
 
-        # Fetch real block reward from Kaspa API
-        block_reward = 3.67  # Default fallback
-        try:
-            reward_response = requests.get("https://api.kaspa.org/info/blockreward", timeout=10)
-            reward_response.raise_for_status()
-            reward_data = reward_response.json()
-            block_reward = float(reward_data.get("blockreward", 3.67))
-            print(f"{GREEN}✓{RESET} Fetched real block reward from Kaspa API: {block_reward} KAS")
-        except Exception as e:
-            print(f"{YELLOW}⚠{RESET} Could not fetch block reward from Kaspa API: {e}, using fallback: {block_reward} KAS")
+        # Block reward comes from a separate endpoint; run_calculator fetches it
+        # concurrently and passes include_block_reward=False
+        block_reward = fetch_kas_block_reward() if include_block_reward else None
 
         stats = {
             "network_hashrate_ths": network_hashrate_hs / 1e12,  # Convert H/s to TH/s
@@ -131,9 +142,7 @@ def fetch_2miners_stats() -> Optional[Dict]:
     """
     try:
         url = "https://kas.2miners.com/api/stats"
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        data = response.json()
+        data = get_json(url, timeout=10)
 
         stats = {
             "pool_hashrate": data.get("hashrate", 0),
@@ -181,15 +190,20 @@ def calculate_daily_kas_production(
 def calculate_income_projections(
     daily_kas: float,
     kas_price_gbp: float,
-    pool_fee_percent: float = 0.0
+    pool_fee_percent: float = 0.0,
+    block_reward: Optional[float] = None
 ) -> Dict:
     """
     Calculate income projections in GBP
 
+    Monthly, yearly and ROI figures follow the emission schedule's declining
+    block reward rather than multiplying today's income.
+
     Args:
         daily_kas: KAS earned per day
         kas_price_gbp: Current KAS price in GBP
         pool_fee_percent: Pool fee (0-100)
+        block_reward: Live block reward, used to place today on the emission schedule
 
     Returns:
         Dict with daily/monthly/yearly projections
@@ -200,11 +214,15 @@ def calculate_income_projections(
 
     # Calculate GBP income
     daily_gbp = daily_kas_after_fee * kas_price_gbp
-    monthly_gbp = daily_gbp * 30
-    yearly_gbp = daily_gbp * 365
+    reward_curve = kaspa_emission.reward_curve(block_reward, MAX_HORIZON_DAYS)
+    monthly_gbp = daily_gbp * float(reward_curve[30])
+    yearly_gbp = daily_gbp * float(reward_curve[365])
 
-    # Calculate ROI
-    roi_days = KS5M_COST_GBP / daily_gbp if daily_gbp > 0 else 0
+    # Calculate ROI (0 = never pays back)
+    roi_days = float(roi_days_on_curve(reward_curve, np.array(KS5M_COST_GBP),
+                                       np.array(daily_gbp), np.array(0.0)))
+    if not np.isfinite(roi_days):
+        roi_days = 0
 
     return {
         "daily_kas": round(daily_kas_after_fee, 2),
@@ -221,10 +239,14 @@ def calculate_income_projections(
 # Main Calculator
 # ============================================================================
 
-def run_calculator(verbose: bool = True) -> Dict:
+def run_calculator(verbose: bool = True, tariff: Optional[str] = None) -> Dict:
     """
     Run the complete income calculator
 
+    Args:
+        verbose: Print results to console
+        tariff: Electricity tariff to highlight (default: config/tariffs.json default)
+
     Returns:
         Dict with all calculated data and projections
     """
@@ -237,9 +259,21 @@ def run_calculator(verbose: bool = True) -> Dict:
     if verbose:
         print(f"{BLUE}Fetching live data...{RESET}\n")
 
-    kas_price = fetch_kas_price()
-    network_stats = fetch_network_stats()
-    pool_stats = fetch_2miners_stats()
+    # Fetch every independent upstream source concurrently
+    fetched = run_concurrently({
+        "kas_price": fetch_kas_price,
+        "network": lambda: fetch_network_stats(include_block_reward=False),
+        "block_reward": fetch_kas_block_reward,
+        "pool": fetch_2miners_stats
+    }, deadline=FETCH_CYCLE_DEADLINE_S)
+
+    kas_price = fetched["kas_price"]
+    network_stats = fetched["network"]
+    pool_stats = fetched["pool"]
+
+    if network_stats:
+        block_reward = fetched["block_reward"]
+        network_stats["block_reward"] = block_reward if block_reward is not None else 3.67
 
     if not kas_price or not network_stats:
         print(f"\n{RED}✗ Failed to fetch required data{RESET}")
@@ -255,8 +289,11 @@ def run_calculator(verbose: bool = True) -> Dict:
     )
 
     # Calculate income with different pools
-    emcd_income = calculate_income_projections(daily_kas, kas_price, pool_fee_percent=0.0)
-    miners_income = calculate_income_projections(daily_kas, kas_price, pool_fee_percent=1.0)
+    block_reward = network_stats["block_reward"]
+    emcd_income = calculate_income_projections(daily_kas, kas_price, pool_fee_percent=0.0,
+                                               block_reward=block_reward)
+    miners_income = calculate_income_projections(daily_kas, kas_price, pool_fee_percent=1.0,
+                                                 block_reward=block_reward)
 
     # Compile results
     results = {
@@ -270,7 +307,7 @@ def run_calculator(verbose: bool = True) -> Dict:
         "network": network_stats,
         "market": {
             "kas_price_gbp": kas_price,
-            "kas_price_usd": kas_price * 1.27  # Approx conversion
+            "kas_price_usd": prices.get_price("kaspa", "usd")[0]
         },
         "income": {
             "emcd_pool": emcd_income,
@@ -290,6 +327,15 @@ def run_calculator(verbose: bool = True) -> Dict:
             "roi_days": emcd_income["roi_days"]
         }
 
+    # Net profit after electricity under every tariff (EMCD 0% fee)
+    tariffs = tariff_config["tariffs"]
+    results["net_profit"] = {
+        "tariff": tariff or tariff_config["default"],
+        "tariffs": net_profit(
+            list(tariffs.values()), KS5M_POWER_W, daily_kas * kas_price, KS5M_COST_GBP,
+            reward_curve=kaspa_emission.reward_curve(block_reward, MAX_HORIZON_DAYS)) if tariffs else {}
+    }
+
     # Display results
     if verbose:
         display_results(results)
@@ -340,6 +386,8 @@ def display_results(results: Dict):
         scale = results['scaling'][f"{count}_miners"]
         print(f"{count:<8} £{scale['daily_gbp']:<11,.2f} £{scale['monthly_gbp']:<13,.2f} £{scale['yearly_gbp']:<13,.2f} {scale['roi_days']:.1f}")
 
+    display_net_profit(results['net_profit'])
+
     print(f"\n{BLUE}{'='*60}{RESET}")
     print(f"{GREEN}Data sources:{RESET}")
     print(f"  • KAS Price: CoinGecko API")
@@ -348,6 +396,86 @@ def display_results(results: Dict):
     print(f"{BLUE}{'='*60}{RESET}\n")
 
 
+def display_net_profit(net: Dict):
+    """Display net profit after electricity for each tariff"""
+    if not net['tariffs']:
+        return
+
+    print(f"\n{BLUE}{'='*60}{RESET}")
+    print(f"{BLUE}NET PROFIT PER KS5M AFTER ELECTRICITY ({KS5M_POWER_W} W){RESET}")
+    print(f"{BLUE}{'='*60}{RESET}")
+
+    selected = net['tariffs'].get(net['tariff'])
+    if selected:
+        roi = f"{selected['roi_days']:.1f} days" if selected['roi_days'] is not None else "never"
+        print(f"\n{GREEN}{net['tariff']} - {selected['description']}:{RESET}")
+        print(f"  Power:   {selected['daily_energy_kwh']:>8,.1f} kWh = £{selected['daily_cost_gbp']:>8,.2f}/day")
+        print(f"  Daily:                £{selected['daily_net_gbp']:>8,.2f}")
+        print(f"  Monthly:              £{selected['monthly_net_gbp']:>8,.2f}")
+        print(f"  Yearly:               £{selected['365d_net_gbp']:>8,.2f}")
+        print(f"  ROI:                  {roi:>13}")
+
+    print(f"\n{'Tariff':<16} {'£/kWh':<8} {'Daily net':<12} {'Yearly net':<13} {'Curtailed':<12} {'Hours'}")
+    print(f"{'-'*68}")
+    for name, t in net['tariffs'].items():
+        color = YELLOW if t['365d_net_gbp'] < 0 else ''
+        print(f"{color}{name:<16} {t['mean_rate_gbp_kwh']:<8.4f} £{t['daily_net_gbp']:<11,.2f} "
+              f"£{t['365d_net_gbp']:<12,.2f} £{t['curtailed']['365d_net_gbp']:<11,.2f} "
+              f"{t['curtailed']['mining_hours_per_day']:.1f}{RESET if color else ''}")
+    print("\nCurtailed = only mine in half-hours where income beats the power cost")
+
+
+def simulate_fleet(results: Dict, miners: int = 1, trials: int = DEFAULT_TRIALS,
+                   days: int = DEFAULT_DAYS, workers: Optional[int] = None) -> Dict:
+    """Run a Monte Carlo simulation for a KS5M fleet from live calculator results"""
+    network = results["network"]
+
+    # Electricity at the mean rate of the selected tariff (--tariff)
+    net = results.get("net_profit", {})
+    selected = net.get("tariffs", {}).get(net.get("tariff"))
+    tariff_gbp_kwh = selected["mean_rate_gbp_kwh"] if selected else 0.0
+
+    # Expected blocks the fleet finds per day at today's network hashrate
+    blocks_per_day = 86400 / network["block_time_seconds"]
+    share = miners * KS5M_HASHRATE_THS / network["network_hashrate_ths"]
+
+    print(f"\n{BLUE}Running {trials:,} simulated futures for {miners} miner(s)...{RESET}")
+    return run_simulation(
+        expected_blocks_per_day=share * blocks_per_day,
+        block_reward=network["block_reward"],
+        price_gbp=results["market"]["kas_price_gbp"],
+        cost_gbp=KS5M_COST_GBP * miners,
+        power_w=KS5M_POWER_W * miners,
+        days=days,
+        trials=trials,
+        tariff_gbp_kwh=tariff_gbp_kwh,
+        reward_ratios=kaspa_emission.daily_ratios(network["block_reward"], days),
+        workers=workers
+    )
+
+
+def display_simulation(simulation: Dict):
+    """Display Monte Carlo simulation results to console"""
+    print(f"\n{BLUE}{'='*60}{RESET}")
+    print(f"{BLUE}MONTE CARLO SIMULATION ({simulation['days']} DAYS){RESET}")
+    print(f"{BLUE}{'='*60}{RESET}")
+    print(f"Trials: {simulation['trials']:,} on {simulation['workers']} worker(s) in {simulation['elapsed_s']}s")
+    print(f"Electricity: £{simulation['inputs']['tariff_gbp_kwh']:.4f}/kWh")
+
+    coin = simulation['payout_coin']
+    gbp = simulation['net_gbp']
+    print(f"\n{'Percentile':<12} {'KAS mined':>14} {'Net GBP':>14}")
+    print(f"{'-'*42}")
+    for p in ("p5", "p25", "p50", "p75", "p95"):
+        print(f"{p:<12} {coin[p]:>14,.0f} £{gbp[p]:>13,.2f}")
+
+    roi = simulation['roi']
+    print(f"\nChance of ROI within {simulation['days']} days: {roi['probability_within_horizon']:.1%}")
+    if roi['median_days'] is not None:
+        print(f"Median time to ROI: {roi['median_days']:.0f} days")
+    print(f"{BLUE}{'='*60}{RESET}\n")
+
+
 def update_config_file(results: Dict, config_path: str = "operations/kaspa/config.json"):
     """Update the Kaspa config file with latest income projections"""
 
@@ -407,6 +535,12 @@ Examples:
 
   # Quiet mode (just numbers)
   python3 calculator.py --quiet
+
+  # Net profit on an Economy 7 tariff
+  python3 calculator.py --tariff economy_7
+
+  # Monte Carlo simulation for 5 miners over 2 years
+  python3 calculator.py --simulate --miners 5 --days 730 --trials 200000
         """
     )
 
@@ -428,14 +562,61 @@ Examples:
         help='Minimal output'
     )
 
+    parser.add_argument(
+        '--simulate',
+        action='store_true',
+        help='Run a Monte Carlo simulation (block luck, price and hashrate drift)'
+    )
+
+    parser.add_argument(
+        '--miners',
+        type=int,
+        default=1,
+        help='Fleet size for --simulate (default: 1)'
+    )
+
+    parser.add_argument(
+        '--trials',
+        type=int,
+        default=DEFAULT_TRIALS,
+        help=f'Simulated futures for --simulate (default: {DEFAULT_TRIALS})'
+    )
+
+    parser.add_argument(
+        '--days',
+        type=int,
+        default=DEFAULT_DAYS,
+        help=f'Simulation horizon in days (default: {DEFAULT_DAYS})'
+    )
+
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help='Worker processes for --simulate (default: all CPUs)'
+    )
+
+    parser.add_argument(
+        '--tariff',
+        choices=sorted(tariff_config["tariffs"]),
+        default=tariff_config["default"],
+        help=f'Electricity tariff from config/tariffs.json (default: {tariff_config["default"]})'
+    )
+
     args = parser.parse_args()
 
     # Run calculator
-    results = run_calculator(verbose=not args.quiet)
+    results = run_calculator(verbose=not args.quiet, tariff=args.tariff)
 
     if not results:
         sys.exit(1)
 
+    # Run Monte Carlo simulation if requested
+    if args.simulate:
+        simulation = simulate_fleet(results, args.miners, args.trials, args.days, args.workers)
+        display_simulation(simulation)
+        results["simulation"] = simulation
+
     # Update config if requested
     if args.update_config:
         update_config_file(results)
@@ -0,0 +1,477 @@
+#!/usr/bin/env python3
+"""
+Coin / Miner Adapter Registry
+Each supported coin is one CoinAdapter that declares its data sources and
+refresh cadence, network hashrate unit, pool fee tiers, emission rules and
+the miner model we run on it. app.py iterates the registry - fetching every
+adapter's sources in one concurrent cycle - instead of keeping a separate
+fetch chain and income path per coin.
+
+Adding a coin:
+1. Subclass CoinAdapter, set the class attributes and implement
+   declare_sources() (plus network_stats() if it merges several sources)
+2. register() an instance with its MinerModel
+"""
+
+from datetime import datetime
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from cache import api_cache
+from emission import MAX_HORIZON_DAYS, kaspa_emission
+from energy import net_profit, tariff_config
+from fetch_engine import get_json
+from price_service import prices
+from projections import roi_days_on_curve, scaling_table
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+SCALING_MINER_COUNTS = (1, 5, 10, 20)
+CACHE_TTL_FACTOR = 2   # Cached values live 2x their refresh interval, so they only
+                       # expire if a scheduled refresh fails
+
+KASPA_EXPLORER_API = "https://api.kaspa.org"
+
+
+# ============================================================================
+# Building Blocks
+# ============================================================================
+
+class MinerModel:
+    """Hardware spec of one miner model"""
+
+    def __init__(self, model: str, hashrate: float, hashrate_unit: str, power_w: float,
+                 cost_gbp: float, network_units_per_hashrate: float = 1.0):
+        self.model = model
+        self.hashrate = hashrate
+        self.hashrate_unit = hashrate_unit      # e.g. "ths" -> "hashrate_ths" in API output
+        self.power_w = power_w
+        self.cost_gbp = cost_gbp
+        # Converts hashrate to the coin's network hashrate unit (e.g. KSol/s -> Sol/s = 1000)
+        self.network_units_per_hashrate = network_units_per_hashrate
+
+    def to_dict(self) -> Dict:
+        return {
+            "model": self.model,
+            f"hashrate_{self.hashrate_unit}": self.hashrate,
+            "power_w": self.power_w,
+            "cost_gbp": self.cost_gbp
+        }
+
+
+class DataSource:
+    """One upstream source of a coin, cached and refreshed on its own interval"""
+
+    def __init__(self, name: str, loader: Callable[[], Optional[Any]], interval: float):
+        self.name = name
+        self.loader = loader        # Returns the value, or None on failure
+        self.interval = interval
+        self.ttl = interval * CACHE_TTL_FACTOR
+
+
+# ============================================================================
+# Coin Adapter Base
+# ============================================================================
+
+class CoinAdapter:
+    """Data sources, units and income rules for one coin"""
+
+    key = ""                    # Coin id used in API output and selections
+    symbol = ""                 # Ticker, lower-cased for output keys (kas_price_gbp, daily_kas)
+    coingecko_id = ""
+    network_hashrate_key = ""   # Network stats key in the miner's network units
+    coin_decimals = 2           # Rounding of daily coin amounts
+    fee_tiers = {}              # Income key -> pool fee percent; the first is the headline tier
+    history_tier = "2miners_pool"  # Income tier recorded in history (same pool for every coin)
+    status_sources = {}         # Status name -> label shown on the dashboard
+
+    def __init__(self, miner: MinerModel):
+        self.miner = miner
+        self.status = {name: {"status": "unknown", "timestamp": None, "source": label}
+                       for name, label in self.status_sources.items()}
+        self.sources = {source.name: source for source in self.declare_sources()}
+
+    # ------------------------------------------------------------------
+    # Data sources
+    # ------------------------------------------------------------------
+
+    def declare_sources(self) -> List[DataSource]:
+        """Upstream sources fetched every cycle (besides the batched price)"""
+        return []
+
+    def cache_key(self, source_name: str) -> str:
+        return f"{self.key}_{source_name}"
+
+    def mark(self, source: str, status: str):
+        """Record the status of a data source with the current timestamp"""
+        if source in self.status:
+            self.status[source]["status"] = status
+            self.status[source]["timestamp"] = datetime.now().isoformat()
+
+    def fetch_price(self) -> Optional[float]:
+        """Coin price in GBP from the batched price service"""
+        price, status = prices.get_price(self.coingecko_id, "gbp")
+        self.mark("price", status)
+        return price
+
+    def fetch_source(self, name: str) -> Optional[Any]:
+        """Get a source value from api_cache, loading it if missing or expired"""
+        source = self.sources[name]
+        value, cache_status = api_cache.get_or_load(self.cache_key(name), source.loader, ttl=source.ttl)
+        if value is None:
+            return None
+        if cache_status == "stale" and name in self.status:
+            self.mark(name, "cached")
+        return dict(value) if isinstance(value, dict) else value  # Cached value is shared
+
+    def refresh_source(self, name: str) -> Optional[Any]:
+        """Load one source now and store it in api_cache (scheduled refresh job)"""
+        source = self.sources[name]
+        value = source.loader()
+        if value is not None:
+            api_cache.set(self.cache_key(name), value, ttl=source.ttl)
+        return value
+
+    def fetch_tasks(self) -> Dict[str, Callable[[], Any]]:
+        """Independent fetches for one calculator cycle (run concurrently)"""
+        tasks = {"price": self.fetch_price}
+        for name in self.sources:
+            tasks[name] = partial(self.fetch_source, name)
+        return tasks
+
+    def network_stats(self, fetched: Dict[str, Any]) -> Optional[Dict]:
+        """Combine fetched sources into network stats (block_reward, block_time_seconds, ...)"""
+        return fetched.get("network")
+
+    # ------------------------------------------------------------------
+    # Income
+    # ------------------------------------------------------------------
+
+    def hashrate_share(self, network: Dict, miners: float = 1) -> float:
+        """Fraction of the network hashrate a fleet of miners holds"""
+        miner_hashrate = miners * self.miner.hashrate * self.miner.network_units_per_hashrate
+        return miner_hashrate / network[self.network_hashrate_key]
+
+    def daily_coin(self, network: Dict, miners: float = 1) -> float:
+        """
+        Expected daily coin production
+
+        Formula:
+        Daily coin = (Your Hashrate / Network Hashrate) x Blocks per Day x Block Reward
+        """
+        blocks_per_day = 86400 / network["block_time_seconds"]
+        return self.hashrate_share(network, miners) * blocks_per_day * network["block_reward"]
+
+    def reward_curve(self, network: Dict, days: int = MAX_HORIZON_DAYS) -> Optional[np.ndarray]:
+        """Cumulative block reward relative to today (None = constant reward)"""
+        return None
+
+    def reward_ratios(self, network: Dict, days: int) -> Optional[np.ndarray]:
+        """Block reward per day relative to today (None = constant reward)"""
+        curve = self.reward_curve(network, days)
+        return np.diff(curve) if curve is not None else None
+
+    def price_key(self) -> str:
+        return f"{self.symbol.lower()}_price_gbp"
+
+    def income_projection(self, daily_coin: float, price_gbp: float, pool_fee_percent: float = 0.0,
+                          reward_curve: Optional[np.ndarray] = None) -> Dict:
+        """
+        Calculate income projections in GBP for one miner
+
+        Monthly, yearly and ROI figures follow reward_curve when given,
+        otherwise today's income is multiplied out.
+
+        Returns:
+            Dict with daily/monthly/yearly projections
+        """
+        # Apply pool fee
+        daily_coin_after_fee = daily_coin * (1 - pool_fee_percent / 100)
+        daily_gbp = daily_coin_after_fee * price_gbp
+
+        if reward_curve is None:
+            monthly_gbp = daily_gbp * 30
+            yearly_gbp = daily_gbp * 365
+            roi_days = self.miner.cost_gbp / daily_gbp if daily_gbp > 0 else 0
+        else:
+            monthly_gbp = daily_gbp * float(reward_curve[30])
+            yearly_gbp = daily_gbp * float(reward_curve[365])
+            roi_days = float(roi_days_on_curve(reward_curve, np.array(self.miner.cost_gbp),
+                                               np.array(daily_gbp), np.array(0.0)))
+            if not np.isfinite(roi_days):
+                roi_days = 0  # Never pays back
+
+        symbol = self.symbol.lower()
+        return {
+            f"daily_{symbol}": round(daily_coin_after_fee, self.coin_decimals),
+            "daily_gbp": round(daily_gbp, 2),
+            "monthly_gbp": round(monthly_gbp, 2),
+            "yearly_gbp": round(yearly_gbp, 2),
+            "roi_days": round(roi_days, 1),
+            "pool_fee_percent": pool_fee_percent,
+            self.price_key(): price_gbp
+        }
+
+    def extra_results(self, network: Dict) -> Dict:
+        """Coin-specific additions to the calculator result"""
+        return {}
+
+    def calculate(self, fetched: Dict[str, Any]) -> Optional[Dict]:
+        """
+        Build this coin's calculator result from one cycle's fetched sources
+
+        Returns: Dict with miner, network, market, income, net_profit and
+        scaling, or None if the price or network stats are missing
+        """
+        price = fetched.get("price")
+        network = self.network_stats(fetched)
+        if not price or not network:
+            return None
+
+        daily = self.daily_coin(network)
+        curve = self.reward_curve(network)
+
+        result = {
+            "miner": self.miner.to_dict(),
+            "network": network,
+            "market": {
+                self.price_key(): price,
+                f"{self.symbol.lower()}_price_usd": prices.get_price(self.coingecko_id, "usd")[0]
+            },
+            "income": {tier: self.income_projection(daily, price, fee, curve)
+                       for tier, fee in self.fee_tiers.items()},
+        }
+        result.update(self.extra_results(network))
+
+        # Net of electricity under every tariff profile, at the headline pool fee
+        headline_fee = next(iter(self.fee_tiers.values()))
+        tariffs = tariff_config["tariffs"]
+        result["net_profit"] = {
+            "default_tariff": tariff_config["default"],
+            "pool_fee_percent": headline_fee,
+            "tariffs": net_profit(
+                list(tariffs.values()), self.miner.power_w,
+                daily * (1 - headline_fee / 100) * price, self.miner.cost_gbp,
+                reward_curve=curve) if tariffs else {}
+        }
+
+        # Calculate scaling (1, 5, 10, 20 miners) in one vectorised pass
+        result["scaling"] = scaling_table(
+            daily, price, self.miner.power_w, self.miner.cost_gbp,
+            pool_fee_percent=headline_fee,
+            miner_counts=SCALING_MINER_COUNTS,
+            coin_key=f"daily_{self.symbol.lower()}", coin_decimals=self.coin_decimals,
+            reward_curve=curve)
+        return result
+
+
+def _load_2miners_network(adapter: CoinAdapter, url: str, hashrate_key: str,
+                          hashrate_divisor: float, default_block_time: Optional[float]) -> Optional[Dict]:
+    """
+    Load network hashrate, difficulty and block time from a 2Miners stats API
+    (REAL DATA ONLY, cache loader)
+
+    Returns: Dict with hashrate_key, difficulty and (if known) block_time_seconds
+    """
+    try:
+        data = get_json(url, timeout=5)
+
+        # Extract real network hashrate from nodes[0].networkhashps
+        nodes = data.get("nodes", [])
+        network_hashrate = int(nodes[0].get("networkhashps", 0)) if nodes else 0
+        if network_hashrate <= 0:
+            adapter.mark("network", "failed")
+            return None
+
+        stats = {
+            hashrate_key: network_hashrate / hashrate_divisor,
+            "difficulty": nodes[0].get("difficulty", 0),
+        }
+        if default_block_time is not None:
+            stats["block_time_seconds"] = float(nodes[0].get("avgBlockTime", default_block_time))
+
+        adapter.mark("network", "live")
+        return stats
+
+    except Exception as e:
+        print(f"2Miners {adapter.symbol} API failed: {e}")
+        adapter.mark("network", "failed")
+        return None
+
+
+# ============================================================================
+# Kaspa - IceRiver KS5M
+# ============================================================================
+
+class KaspaAdapter(CoinAdapter):
+    key = "kaspa"
+    symbol = "KAS"
+    coingecko_id = "kaspa"
+    network_hashrate_key = "network_hashrate_ths"
+    coin_decimals = 2
+    fee_tiers = {"emcd_pool": 0.0, "2miners_pool": 1.0}
+    status_sources = {"price": "CoinGecko API", "network": "2Miners API", "block_reward": "Kaspa API"}
+
+    STATS_URL = "https://kas.2miners.com/api/stats"
+    BLOCK_TIME_S = 0.1             # 10 blocks per second after the Crescendo upgrade
+    FALLBACK_BLOCK_REWARD = 3.67
+
+    def declare_sources(self) -> List[DataSource]:
+        return [
+            DataSource("network", self._load_network, 10),
+            DataSource("pool", self._load_pool, 10),
+            DataSource("block_reward", self._load_block_reward, 300),  # Emission changes monthly
+        ]
+
+    def _load_network(self) -> Optional[Dict]:
+        """Network hashrate (H/s -> TH/s) and difficulty from 2Miners"""
+        stats = _load_2miners_network(self, self.STATS_URL, "network_hashrate_ths", 1e12, None)
+        if stats is None:
+            return None
+        return {
+            "network_hashrate_ths": stats["network_hashrate_ths"],
+            "block_reward": None,  # Filled in from Kaspa API by network_stats
+            "block_time_seconds": self.BLOCK_TIME_S,
+            "difficulty": stats["difficulty"],
+            "source": "2Miners API + Kaspa API (Real-time)"
+        }
+
+    def _load_pool(self) -> Optional[Dict]:
+        """Pool hashrate, miners and fee from 2Miners"""
+        try:
+            data = get_json(self.STATS_URL, timeout=10)
+            return {
+                "pool_hashrate": data.get("hashrate", 0),
+                "pool_miners": data.get("workers", 0),
+                "pool_fee": data.get("fee", 1.0),
+            }
+        except Exception as e:
+            print(f"Could not fetch 2Miners stats: {e}")
+            return None
+
+    def _load_block_reward(self) -> Optional[float]:
+        """Real block reward from Kaspa API (updates with the emission schedule)"""
+        try:
+            reward_data = get_json(f"{KASPA_EXPLORER_API}/info/blockreward", timeout=5)
+            block_reward = float(reward_data.get("blockreward", self.FALLBACK_BLOCK_REWARD))
+            self.mark("block_reward", "live")
+            return block_reward
+        except Exception as e:
+            print(f"Warning: Could not fetch block reward from Kaspa API: {e}, using fallback")
+            return None
+
+    def network_stats(self, fetched: Dict[str, Any]) -> Optional[Dict]:
+        network = fetched.get("network")
+        if not network:
+            return None
+        block_reward = fetched.get("block_reward")
+        if block_reward is None:
+            self.mark("block_reward", "cached")
+            block_reward = self.FALLBACK_BLOCK_REWARD
+        network["block_reward"] = block_reward
+        return network
+
+    def reward_curve(self, network: Dict, days: int = MAX_HORIZON_DAYS) -> Optional[np.ndarray]:
+        return kaspa_emission.reward_curve(network["block_reward"], days)
+
+    def extra_results(self, network: Dict) -> Dict:
+        return {"emission": kaspa_emission.summary(network["block_reward"])}
+
+
+# ============================================================================
+# Zcash - Antminer Z15 Pro
+# ============================================================================
+
+class ZcashAdapter(CoinAdapter):
+    key = "zcash"
+    symbol = "ZEC"
+    coingecko_id = "zcash"
+    network_hashrate_key = "network_hashrate_sol"
+    coin_decimals = 4
+    fee_tiers = {"0_fee_pool": 0.0, "2miners_pool": 1.0}  # 2Miners has 1% fee for ZEC
+    status_sources = {"price": "CoinGecko API", "network": "2Miners API",
+                      "block_reward": "Hardcoded (1.25 ZEC)"}
+
+    STATS_URL = "https://zec.2miners.com/api/stats"
+    BLOCK_REWARD = 1.25  # ZEC per block (current after Nov 2025 halving)
+
+    def declare_sources(self) -> List[DataSource]:
+        return [DataSource("network", self._load_network, 30)]  # ~75s block time
+
+    def _load_network(self) -> Optional[Dict]:
+        """Network hashrate (Sol/s), difficulty and block time from 2Miners"""
+        stats = _load_2miners_network(self, self.STATS_URL, "network_hashrate_sol", 1, 75)
+        if stats is None:
+            return None
+
+        # Block reward is hardcoded for now
+        self.mark("block_reward", "live")
+
+        network_hashrate_sol = stats["network_hashrate_sol"]
+        return {
+            "network_hashrate_sol": network_hashrate_sol,  # Sol/s
+            "network_hashrate_ksol": network_hashrate_sol / 1000,  # KSol/s
+            "network_hashrate_msol": network_hashrate_sol / 1_000_000,  # MSol/s
+            "block_reward": self.BLOCK_REWARD,
+            "block_time_seconds": stats["block_time_seconds"],
+            "difficulty": stats["difficulty"],
+            "source": "2Miners API (Real-time)"
+        }
+
+
+# ============================================================================
+# Aeternity - NVIDIA A5000 (GPU)
+# ============================================================================
+
+class AeternityAdapter(CoinAdapter):
+    key = "aeternity"
+    symbol = "AE"
+    coingecko_id = "aeternity"
+    network_hashrate_key = "network_hashrate_gps"
+    coin_decimals = 2
+    fee_tiers = {"2miners_pool": 1.0, "f2pool": 2.0}  # Pools from operations/aeternity/config.json
+    status_sources = {"price": "CoinGecko API", "network": "2Miners API"}
+
+    STATS_URL = "https://ae.2miners.com/api/stats"
+    # Estimated miner reward per key block - not published by the pool API.
+    # Matches the ae_per_day estimate in operations/aeternity/config.json.
+    BLOCK_REWARD = 41.6
+
+    def declare_sources(self) -> List[DataSource]:
+        return [DataSource("network", self._load_network, 60)]  # ~3 minute key blocks
+
+    def _load_network(self) -> Optional[Dict]:
+        """Network hashrate (graphs/s), difficulty and key block time from 2Miners"""
+        stats = _load_2miners_network(self, self.STATS_URL, "network_hashrate_gps", 1, 180)
+        if stats is None:
+            return None
+        stats.update({
+            "block_reward": self.BLOCK_REWARD,
+            "block_reward_estimated": True,
+            "source": "2Miners API (Real-time)"
+        })
+        return stats
+
+
+# ============================================================================
+# Registry
+# ============================================================================
+
+COINS: Dict[str, CoinAdapter] = {}
+
+
+def register(adapter: CoinAdapter) -> CoinAdapter:
+    """Add a coin adapter to the registry (keyed by adapter.key)"""
+    COINS[adapter.key] = adapter
+    return adapter
+
+
+register(KaspaAdapter(MinerModel("IceRiver KS5M", 15.0, "ths", power_w=3400, cost_gbp=600)))
+register(ZcashAdapter(MinerModel("Antminer Z15 Pro", 840, "ksol", power_w=2780, cost_gbp=3500,
+                                 network_units_per_hashrate=1000)))
+register(AeternityAdapter(MinerModel("NVIDIA A5000", 5.0, "gps", power_w=230,
+                                     cost_gbp=1800)))  # Approximate GPU cost
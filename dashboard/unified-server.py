@@ -12,7 +12,9 @@ import glob
 from datetime import datetime, timedelta
 from http.server import HTTPServer, SimpleHTTPRequestHandler
 from pathlib import Path
-import re
+
+from gpu_sampler import GpuSampler
+from log_tokens import tokenize
 
 # Configuration
 OPERATIONS_DIR = "/home/user/A5000mine/operations"
@@ -20,6 +22,7 @@ DASHBOARD_DIR = os.path.dirname(os.path.abspath(__file__))
 
 # Global state
 start_time = time.time()
+gpu_sampler = GpuSampler()
 
 
 def load_operation_config(operation_name):
@@ -54,30 +57,17 @@ def get_all_operations():
 
 
 def get_gpu_stats():
-    """Get GPU statistics using nvidia-smi for Aeternity operation"""
+    """Latest GPU statistics for Aeternity operation from the streaming nvidia-smi sampler"""
     gpus = []
-    try:
-        cmd = [
-            "nvidia-smi",
-            "--query-gpu=index,name,temperature.gpu,power.draw,utilization.gpu,memory.used",
-            "--format=csv,noheader,nounits"
-        ]
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=5)
-
-        if result.returncode == 0:
-            for line in result.stdout.strip().split('\n'):
-                parts = [p.strip() for p in line.split(',')]
-                if len(parts) >= 6:
-                    gpus.append({
-                        "index": int(parts[0]),
-                        "name": parts[1],
-                        "temperature": int(float(parts[2])),
-                        "power_draw": int(float(parts[3])),
-                        "utilization": int(float(parts[4])),
-                        "memory_used": int(float(parts[5]))
-                    })
-    except Exception as e:
-        print(f"Error getting GPU stats: {e}")
+    for index, gpu in sorted(gpu_sampler.latest().items()):
+        gpus.append({
+            "index": index,
+            "name": gpu["name"],
+            "temperature": int(gpu["temperature"] or 0),
+            "power_draw": int(gpu["power_draw"] or 0),
+            "utilization": int(gpu["utilization"] or 0),
+            "memory_used": int(gpu["memory_used"] or 0)
+        })
 
     return gpus
 
@@ -112,23 +102,21 @@ def parse_aeternity_logs():
                 lines = f.readlines()[-100:]
 
                 for line in lines:
-                    line = line.strip()
+                    event = tokenize(line.strip())
+                    if event is None:
+                        continue
 
                     # Extract hashrate
-                    hashrate_match = re.search(r'Speed[:\s]+(\d+\.?\d*)\s*G', line, re.IGNORECASE)
-                    if hashrate_match:
-                        stats["hashrate"] = float(hashrate_match.group(1))
+                    if event.speed is not None:
+                        stats["hashrate"] = event.speed
 
                     # Count shares
-                    if re.search(r'accepted|share.+accepted', line, re.IGNORECASE):
-                        stats["shares_accepted"] += 1
-                    if re.search(r'rejected|share.+rejected', line, re.IGNORECASE):
-                        stats["shares_rejected"] += 1
+                    stats["shares_accepted"] += event.accepted
+                    stats["shares_rejected"] += event.rejected
 
                     # Collect relevant logs
-                    if any(keyword in line.lower() for keyword in
-                           ['speed', 'accepted', 'rejected', 'share', 'gpu', 'temp']):
-                        stats["recent_logs"].append(line[-200:])
+                    if event.relevant:
+                        stats["recent_logs"].append(event.line[-200:])
 
                 stats["recent_logs"] = stats["recent_logs"][-10:]
     except Exception as e:
@@ -344,6 +332,8 @@ def main():
     """Start unified dashboard server"""
     port = 8090  # Use different port to not conflict with existing dashboard
 
+    gpu_sampler.start()
+
     server_address = ('', port)
     httpd = HTTPServer(server_address, UnifiedDashboardHandler)
 
@@ -369,6 +359,7 @@ def main():
     except KeyboardInterrupt:
         print("\nShutting down server...")
         httpd.shutdown()
+        gpu_sampler.stop()
 
 
 if __name__ == "__main__":
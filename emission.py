@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Kaspa Emission Schedule Model
+Kaspa's block reward does not halve every four years - it falls by a factor
+of (1/2)^(1/12) every "month" of 2,629,800 seconds (chromatic halving), so a
+flat daily_income * 365 overstates a year of mining.
+
+The subsidy table is indexed by DAA score (the per-second clock the
+consensus uses) and converted to a per-day block reward curve plus its
+running sum, all built once at import. Any forward window - 30 days, a year,
+the days until ROI - is then an O(1) difference of that running sum.
+
+Used by:
+- app.py / calculator.py: monthly/yearly income and ROI days
+- projections.py grids and simulator.py trials via reward_curve()/daily_ratios()
+"""
+
+import math
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Dict, Optional
+
+import numpy as np
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+# Chromatic phase: per-second subsidy starts at 440 KAS and decays monthly
+DEFLATIONARY_PHASE_DAA_SCORE = 15_519_600
+DEFLATIONARY_PHASE_INITIAL_SUBSIDY_KAS = 440.0
+SECONDS_PER_MONTH = 2_629_800
+SUBSIDY_MONTHS = 426                 # Table length - the subsidy reaches 0 sompi after this
+SOMPI_PER_KAS = 100_000_000
+
+# Crescendo hardfork: 1 -> 10 blocks per second, so each block gets 1/10 of the per-second subsidy
+CRESCENDO_DAA_SCORE = 110_165_000
+CRESCENDO_ACTIVATION = datetime(2025, 5, 5, 15, 0, tzinfo=timezone.utc)  # Approximate
+BLOCKS_PER_SECOND = 10
+
+# Pre-Crescendo the DAA score advanced once per second, which dates the chromatic phase start
+DEFLATIONARY_PHASE_START = CRESCENDO_ACTIVATION.timestamp() - (CRESCENDO_DAA_SCORE - DEFLATIONARY_PHASE_DAA_SCORE)
+
+DAY_S = 86400
+MAX_HORIZON_DAYS = 10 * 365          # Longest forward window (ROI search, scenarios)
+
+
+# ============================================================================
+# Subsidy Table
+# ============================================================================
+
+def build_subsidy_table(months: int = SUBSIDY_MONTHS) -> np.ndarray:
+    """
+    Per-second subsidy (KAS) for each chromatic month, floored to whole sompi
+    like the consensus table
+    """
+    sompi = np.floor(DEFLATIONARY_PHASE_INITIAL_SUBSIDY_KAS * SOMPI_PER_KAS
+                     * 2.0 ** (-np.arange(months) / 12))
+    return sompi / SOMPI_PER_KAS
+
+
+def month_for_daa_score(daa_score: int) -> int:
+    """Chromatic month index for a DAA score (0 before the deflationary phase)"""
+    if daa_score <= DEFLATIONARY_PHASE_DAA_SCORE:
+        return 0
+    # Schedule time: 1 DAA per second before Crescendo, BLOCKS_PER_SECOND after
+    seconds = min(daa_score, CRESCENDO_DAA_SCORE) - DEFLATIONARY_PHASE_DAA_SCORE
+    if daa_score > CRESCENDO_DAA_SCORE:
+        seconds += (daa_score - CRESCENDO_DAA_SCORE) / BLOCKS_PER_SECOND
+    return int(seconds // SECONDS_PER_MONTH)
+
+
+def month_for_timestamp(ts: float) -> int:
+    """Chromatic month index for a Unix timestamp"""
+    return max(0, int((ts - DEFLATIONARY_PHASE_START) // SECONDS_PER_MONTH))
+
+
+# ============================================================================
+# Emission Schedule
+# ============================================================================
+
+class EmissionSchedule:
+    """Per-day block reward curve with prefix sums for O(1) window integrals"""
+
+    def __init__(self, blocks_per_second: int = BLOCKS_PER_SECOND):
+        self.blocks_per_second = blocks_per_second
+        self.subsidy_per_second = build_subsidy_table()
+
+        # Per-block reward for every day from the phase start to the end of the
+        # table, padded with zero-reward days so any horizon can be sliced
+        days = math.ceil(SUBSIDY_MONTHS * SECONDS_PER_MONTH / DAY_S) + MAX_HORIZON_DAYS
+        day_months = (np.arange(days) * DAY_S) // SECONDS_PER_MONTH
+        subsidy = np.append(self.subsidy_per_second, 0.0)
+        self.daily_block_reward = subsidy[np.minimum(day_months, SUBSIDY_MONTHS)] / blocks_per_second
+        self.cumulative = np.concatenate(([0.0], np.cumsum(self.daily_block_reward)))
+
+    def block_reward_for_month(self, month: int) -> float:
+        if month >= SUBSIDY_MONTHS:
+            return 0.0
+        return float(self.subsidy_per_second[max(month, 0)] / self.blocks_per_second)
+
+    def block_reward_at_daa_score(self, daa_score: int) -> float:
+        """Per-block reward (KAS) at a DAA score"""
+        return self.block_reward_for_month(month_for_daa_score(daa_score))
+
+    def block_reward_at(self, when: Optional[datetime] = None) -> float:
+        """Per-block reward (KAS) at a date (default: now)"""
+        ts = (when or datetime.now(timezone.utc)).timestamp()
+        return self.block_reward_for_month(month_for_timestamp(ts))
+
+    def day_index(self, block_reward: Optional[float] = None, ts: Optional[float] = None) -> int:
+        """
+        Today's position in the daily curve
+
+        The date gives the position within the month. If a live block reward
+        is given, the month is taken from it instead, so an approximate
+        activation date never puts projections a month out of step with the chain.
+        """
+        ts = ts if ts is not None else datetime.now(timezone.utc).timestamp()
+        elapsed = max(0.0, ts - DEFLATIONARY_PHASE_START)
+        month, into_month = divmod(elapsed, SECONDS_PER_MONTH)
+
+        if block_reward:
+            per_block = self.subsidy_per_second / self.blocks_per_second
+            month = int(np.abs(per_block - block_reward).argmin())
+
+        return int((month * SECONDS_PER_MONTH + into_month) // DAY_S)
+
+    def reward_curve(self, block_reward: Optional[float] = None, days: int = 365,
+                     ts: Optional[float] = None) -> np.ndarray:
+        """
+        Cumulative reward relative to today, in "today-equivalent days"
+
+        Returns: Array of length days + 1 where curve[d] is the income of the
+        next d days divided by today's daily income (curve[d] == d if the
+        reward never changed)
+        """
+        return _reward_curve(self, self.day_index(block_reward, ts), min(days, MAX_HORIZON_DAYS))
+
+    def daily_ratios(self, block_reward: Optional[float] = None, days: int = 365,
+                     ts: Optional[float] = None) -> np.ndarray:
+        """Block reward for each of the next days relative to today's"""
+        return np.diff(self.reward_curve(block_reward, days, ts))
+
+    def effective_days(self, days: int, block_reward: Optional[float] = None) -> float:
+        """Income of the next days expressed in today-equivalent days"""
+        return float(self.reward_curve(block_reward, days)[-1])
+
+    def summary(self, block_reward: Optional[float] = None) -> Dict:
+        """Emission facts for API responses"""
+        start = self.day_index(block_reward)
+        month = int(start * DAY_S // SECONDS_PER_MONTH)
+        return {
+            "model": "chromatic halving",
+            "month": month,
+            "block_reward_now": round(self.block_reward_for_month(month), 8),
+            "block_reward_in_1y": round(float(self.daily_block_reward[start + 365]), 8),
+            "effective_days_30": round(self.effective_days(30, block_reward), 2),
+            "effective_days_365": round(self.effective_days(365, block_reward), 2)
+        }
+
+
+@lru_cache(maxsize=64)
+def _reward_curve(schedule: EmissionSchedule, start: int, days: int) -> np.ndarray:
+    """Cached per (start day, horizon) - changes once a day, shared by every request"""
+    today = schedule.daily_block_reward[start]
+    if today <= 0:
+        return np.zeros(days + 1)
+    curve = (schedule.cumulative[start:start + days + 1] - schedule.cumulative[start]) / today
+    curve.flags.writeable = False  # Shared between callers
+    return curve
+
+
+# Built once at import and reused by every calculation
+kaspa_emission = EmissionSchedule()
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Electricity Cost and Net Profit Engine
+Turns gross mining revenue into net profit under flat or time-of-use
+tariffs, one half-hour slot at a time over a whole year.
+
+- Tariffs (config/tariffs.json) have a base rate plus optional periods
+  with their own rate, limited to weekdays or weekends if needed
+- Each tariff's (days x 48) half-hourly rate grid is built once and cached,
+  and so are its electricity costs per miner power draw (cost per day, and
+  each day profile's slot costs sorted), which don't change between
+  refreshes
+- Revenue changes on every refresh, so it is applied per call: one NumPy
+  pass per tariff over the days, with the coin's declining block reward
+  applied per day
+- Besides running 24/7, each result reports "curtailed" mining: the miner
+  is switched off in slots where power costs more than it earns
+
+Used by:
+- coins.py: net_profit section of each coin in /api/calculator
+- calculator.py: net profit table in the CLI output (--tariff)
+"""
+
+import json
+import os
+import threading
+from collections import OrderedDict
+from datetime import date
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+from emission import MAX_HORIZON_DAYS
+from projections import roi_days_on_curve
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+DEFAULT_TARIFFS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config", "tariffs.json")
+
+SLOTS_PER_DAY = 48
+SLOT_HOURS = 0.5
+DAYS_PER_YEAR = 365
+
+DAY_FILTERS = ("all", "weekdays", "weekends")
+
+COST_CACHE_SIZE = 32     # Slot costs kept per tariff, one per (power, days, start weekday) (LRU)
+
+
+# ============================================================================
+# Tariffs
+# ============================================================================
+
+def _slot(hhmm: str) -> int:
+    """Half-hour slot index of an "HH:MM" time (00:00 -> 0, 23:30 -> 47, 24:00 -> 48)"""
+    hours, minutes = (int(part) for part in hhmm.split(":"))
+    if minutes not in (0, 30) or not 0 <= hours <= 24 or (hours == 24 and minutes):
+        raise ValueError(f"Tariff times must be on the half hour, got '{hhmm}'")
+    return hours * 2 + minutes // 30
+
+
+class Tariff:
+    """A flat or time-of-use electricity tariff"""
+
+    def __init__(self, name: str, rate_gbp_kwh: float, periods: Sequence[Dict] = (),
+                 standing_charge_gbp_day: float = 0.0, description: str = ""):
+        self.name = name
+        self.rate_gbp_kwh = float(rate_gbp_kwh)
+        self.standing_charge_gbp_day = float(standing_charge_gbp_day)
+        self.description = description
+        self.periods = [dict(period) for period in periods]
+        for period in self.periods:
+            if period.get("days", "all") not in DAY_FILTERS:
+                raise ValueError(f"Tariff '{name}': days must be one of {', '.join(DAY_FILTERS)}")
+        self._day_profiles = self._build_day_profiles()
+        self._grids = {}  # (days, start weekday) -> rate grid
+        self._costs = OrderedDict()  # (power, days, start weekday) -> slot costs (LRU)
+        self._costs_lock = threading.Lock()
+
+    def _build_day_profiles(self) -> Dict[str, np.ndarray]:
+        """48 slot rates for a weekday and a weekend day"""
+        profiles = {}
+        for kind in ("weekday", "weekend"):
+            rates = np.full(SLOTS_PER_DAY, self.rate_gbp_kwh)
+            for period in self.periods:
+                applies = period.get("days", "all")
+                if applies != "all" and applies != kind + "s":
+                    continue
+                start, end = _slot(period["start"]), _slot(period["end"])
+                slots = np.arange(SLOTS_PER_DAY)
+                # end before start wraps past midnight (e.g. 23:00-07:00)
+                active = (slots >= start) & (slots < end) if start < end else (slots >= start) | (slots < end)
+                rates[active] = period["rate_gbp_kwh"]
+            profiles[kind] = rates
+        return profiles
+
+    @property
+    def is_flat(self) -> bool:
+        return not self.periods
+
+    def slot_rates(self, days: int = DAYS_PER_YEAR, start: Optional[date] = None) -> np.ndarray:
+        """
+        Half-hourly rates (GBP/kWh) for each day from start (default: today)
+
+        Returns: Read-only array shaped (days, 48), cached per tariff
+        """
+        start_weekday = (start or date.today()).weekday()
+        key = (days, start_weekday)
+        grid = self._grids.get(key)
+        if grid is None:
+            weekend = (start_weekday + np.arange(days)) % 7 >= 5
+            grid = np.where(weekend[:, None], self._day_profiles["weekend"], self._day_profiles["weekday"])
+            grid.flags.writeable = False
+            self._grids[key] = grid
+        return grid
+
+    def slot_costs(self, power_w: float, days: int = DAYS_PER_YEAR,
+                   start: Optional[date] = None) -> Dict[str, np.ndarray]:
+        """
+        Electricity cost of running power_w continuously, for each day from start
+
+        Returns: Dict with "daily" (cost per day), "kind" (0 weekday, 1 weekend
+        per day), "sorted" (each kind's 48 slot costs, ascending) and
+        "cumulative" (running sums of "sorted", from 0) as read-only arrays,
+        and "mean_rate" (GBP/kWh over the days). Cached per tariff (LRU)
+        """
+        start_weekday = (start or date.today()).weekday()
+        key = (power_w, days, start_weekday)
+        with self._costs_lock:
+            costs = self._costs.get(key)
+            if costs is not None:
+                self._costs.move_to_end(key)
+                return costs
+
+        kind = ((start_weekday + np.arange(days)) % 7 >= 5).astype(np.intp)
+        profiles = np.stack([self._day_profiles["weekday"], self._day_profiles["weekend"]])
+        slot_cost = profiles * (power_w / 1000 * SLOT_HOURS)
+        ordered = np.sort(slot_cost, axis=1)
+        costs = {
+            "daily": slot_cost.sum(axis=1)[kind],
+            "kind": kind,
+            "sorted": ordered,
+            "cumulative": np.concatenate((np.zeros((2, 1)), np.cumsum(ordered, axis=1)), axis=1),
+        }
+        for values in costs.values():
+            values.flags.writeable = False
+        costs["mean_rate"] = float(profiles.mean(axis=1)[kind].mean())
+
+        with self._costs_lock:
+            self._costs[key] = costs
+            self._costs.move_to_end(key)
+            while len(self._costs) > COST_CACHE_SIZE:
+                self._costs.popitem(last=False)
+        return costs
+
+    def to_dict(self) -> Dict:
+        return {
+            "name": self.name,
+            "description": self.description,
+            "rate_gbp_kwh": self.rate_gbp_kwh,
+            "periods": self.periods,
+            "standing_charge_gbp_day": self.standing_charge_gbp_day
+        }
+
+
+def load_tariffs(path: str = DEFAULT_TARIFFS_PATH) -> Dict:
+    """
+    Load tariff profiles from JSON
+
+    Returns: Dict with "default" (tariff name) and "tariffs" (name -> Tariff)
+    """
+    try:
+        with open(path) as f:
+            config = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Could not load tariffs from {path}: {e} - assuming free electricity")
+        return {"default": "free", "tariffs": {"free": Tariff("free", 0.0, description="No electricity cost")}}
+
+    tariffs = {}
+    for name, spec in config.get("tariffs", {}).items():
+        tariffs[name] = Tariff(
+            name, spec.get("rate_gbp_kwh", 0.0), periods=spec.get("periods", ()),
+            standing_charge_gbp_day=spec.get("standing_charge_gbp_day", 0.0),
+            description=spec.get("description", ""))
+
+    default = config.get("default")
+    if default not in tariffs:
+        default = next(iter(tariffs), None)
+    return {"default": default, "tariffs": tariffs}
+
+
+# ============================================================================
+# Net Profit Engine
+# ============================================================================
+
+def net_profit(
+    tariffs: Sequence[Tariff],
+    power_w: float,
+    daily_gross_gbp: float,
+    cost_gbp: float,
+    reward_curve: Optional[np.ndarray] = None,
+    days: int = DAYS_PER_YEAR,
+    start: Optional[date] = None
+) -> Dict[str, Dict]:
+    """
+    Net profit of one miner under each tariff, half-hour by half-hour
+
+    Args:
+        tariffs: Tariff profiles to evaluate (all in one vectorised pass)
+        power_w: Miner power draw
+        daily_gross_gbp: Today's gross revenue per day (after pool fee)
+        cost_gbp: Hardware cost, for ROI
+        reward_curve: Cumulative block reward relative to today
+            (EmissionSchedule.reward_curve), at least days + 1 long and
+            longer to search further for ROI. None = constant reward
+        days: Horizon of the half-hourly model
+        start: First day (default: today) - sets which days are weekends
+
+    Returns:
+        Dict of tariff name -> daily/monthly/yearly cost, gross and net,
+        always-on ROI days (None = never) and curtailed-mining results
+    """
+    if reward_curve is None:
+        reward_curve = np.arange(max(days, MAX_HORIZON_DAYS) + 1, dtype=float)
+    daily_gross = daily_gross_gbp * np.diff(reward_curve[:days + 1])
+    slot_gross = daily_gross / SLOTS_PER_DAY
+
+    month = min(30, days)
+    results = {}
+    for tariff in tariffs:
+        costs = tariff.slot_costs(power_w, days, start)
+        daily_cost, kind = costs["daily"], costs["kind"]
+        daily_net = daily_gross - daily_cost
+
+        # Curtailed: mine only in slots that cost less than they earn - the
+        # cheapest mining_slots of that day's sorted slot costs
+        mining_slots = np.empty(days, dtype=np.intp)
+        for k in (0, 1):
+            on_kind = kind == k
+            mining_slots[on_kind] = np.searchsorted(costs["sorted"][k], slot_gross[on_kind], side="left")
+        curtailed_net = mining_slots * slot_gross - costs["cumulative"][kind, mining_slots]
+
+        # Rates repeat weekly, so the mean day is exact for ROI beyond the horizon
+        mean_daily_cost = float(daily_cost.mean())
+        roi = float(roi_days_on_curve(reward_curve, np.array(cost_gbp),
+                                      np.array(daily_gross_gbp), np.array(mean_daily_cost)))
+        results[tariff.name] = {
+            "description": tariff.description,
+            "time_of_use": not tariff.is_flat,
+            "mean_rate_gbp_kwh": round(costs["mean_rate"], 4),
+            "daily_energy_kwh": round(power_w / 1000 * 24, 2),
+            "daily_cost_gbp": round(float(daily_cost[0]), 2),
+            "daily_net_gbp": round(float(daily_net[0]), 2),
+            "monthly_net_gbp": round(float(daily_net[:month].sum()), 2),
+            f"{days}d_cost_gbp": round(float(daily_cost.sum()), 2),
+            f"{days}d_gross_gbp": round(float(daily_gross.sum()), 2),
+            f"{days}d_net_gbp": round(float(daily_net.sum()), 2),
+            "roi_days": round(roi, 1) if np.isfinite(roi) else None,
+            "standing_charge_gbp_day": tariff.standing_charge_gbp_day,  # Per site, not per miner
+            "curtailed": {
+                f"{days}d_net_gbp": round(float(curtailed_net.sum()), 2),
+                "mining_hours_per_day": round(float(mining_slots.mean()) * SLOT_HOURS, 1)
+            }
+        }
+    return results
+
+
+# Tariff profiles shared by the web app and CLI (rate grids and slot costs cached per profile)
+tariff_config = load_tariffs()
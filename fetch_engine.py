@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Concurrent Upstream Fetch Engine
+Runs independent data-source fetchers in parallel with a per-cycle deadline,
+so a calculator cycle costs the latency of the slowest call rather than the sum.
+
+Also provides a shared response layer: each upstream URL is requested once per
+cycle, and concurrent callers for the same URL wait on the same in-flight
+request and read the same decoded JSON payload.
+
+Used by:
+- app.py: Flask web app calculator cycle
+- calculator.py: CLI calculator
+"""
+
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Optional
+
+import http_client
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+DEFAULT_MAX_WORKERS = 8        # Enough for every fetcher of every coin at once
+DEFAULT_CYCLE_DEADLINE = 6.0   # Seconds - every upstream call, retries included, is fitted inside it
+RESPONSE_REUSE_S = 1.0         # Completed responses are shared for one cycle
+
+
+# ============================================================================
+# Fetch Engine
+# ============================================================================
+
+class FetchEngine:
+    """Issues named fetch tasks concurrently and collects results by deadline"""
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS,
+                 deadline: float = DEFAULT_CYCLE_DEADLINE):
+        # Long-lived pool so threads are reused across cycles. HTTP timeouts
+        # inside a task are cut to the cycle deadline (http_client.deadline),
+        # so a slow upstream can't leave tasks holding workers into later cycles.
+        self.executor = ThreadPoolExecutor(max_workers=max_workers,
+                                           thread_name_prefix="fetch")
+        self.deadline = deadline
+        self.last_cycle = {"duration_ms": 0.0, "timed_out": [], "failed": []}
+
+    def run(self, tasks: Dict[str, Callable[[], Any]],
+            deadline: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Run all tasks concurrently and wait until they finish or the deadline passes
+
+        Args:
+            tasks: Mapping of task name to zero-argument callable
+            deadline: Seconds to wait for the whole cycle (default: engine deadline)
+
+        Returns:
+            Dict of task name to result (None for tasks that failed or timed out)
+        """
+        start = time.monotonic()
+        deadline = self.deadline if deadline is None else deadline
+        futures = {name: self.executor.submit(_run_before, start + deadline, fn)
+                   for name, fn in tasks.items()}
+        done, _ = wait(futures.values(), timeout=deadline)
+
+        results = {}
+        timed_out = []
+        failed = []
+        for name, future in futures.items():
+            if future not in done:
+                timed_out.append(name)
+                results[name] = None
+            elif future.exception() is not None:
+                print(f"Fetch task '{name}' failed: {future.exception()}")
+                failed.append(name)
+                results[name] = None
+            else:
+                results[name] = future.result()
+
+        if timed_out:
+            print(f"Fetch cycle deadline exceeded, skipping: {', '.join(timed_out)}")
+
+        self.last_cycle = {
+            "duration_ms": round((time.monotonic() - start) * 1000, 1),
+            "timed_out": timed_out,
+            "failed": failed
+        }
+        return results
+
+
+def _run_before(ends_at: float, fn: Callable[[], Any]) -> Any:
+    """Run one task with its upstream calls bounded by the cycle deadline"""
+    with http_client.deadline(ends_at):
+        return fn()
+
+
+# Shared engine instance used by the web app and CLI calculator
+engine = FetchEngine()
+
+
+def run_concurrently(tasks: Dict[str, Callable[[], Any]],
+                     deadline: Optional[float] = None) -> Dict[str, Any]:
+    """Run tasks on the shared fetch engine"""
+    return engine.run(tasks, deadline=deadline)
+
+
+# ============================================================================
+# Shared Response Layer
+# ============================================================================
+
+class SharedResponses:
+    """Coalesces identical upstream GETs so each URL is fetched once per cycle"""
+
+    def __init__(self, max_age: float = RESPONSE_REUSE_S):
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._entries = {}  # key -> {"future": Future, "completed_at": float}
+        self.stats = {"requests": 0, "upstream": 0, "shared": 0}
+
+    def get_json(self, url: str, params: Optional[Dict] = None, timeout: float = 5) -> Any:
+        """
+        Fetch and decode a JSON response, sharing it with concurrent callers
+
+        Args:
+            url: Upstream URL
+            params: Query parameters (part of the dedup key)
+            timeout: Request timeout in seconds (used by whichever caller fetches)
+
+        Returns:
+            Decoded JSON payload. Treat it as read-only - it is shared between callers.
+
+        Raises:
+            Whatever the underlying request raised, for every coalesced caller
+        """
+        key = (url, tuple(sorted((params or {}).items())))
+
+        with self._lock:
+            self.stats["requests"] += 1
+            entry = self._entries.get(key)
+            if entry is not None and (entry["completed_at"] is None or
+                                      time.monotonic() - entry["completed_at"] < self.max_age):
+                self.stats["shared"] += 1
+                owner = False
+            else:
+                entry = {"future": Future(), "completed_at": None}
+                self._entries[key] = entry
+                self.stats["upstream"] += 1
+                owner = True
+
+        if owner:
+            future = entry["future"]
+            try:
+                future.set_result(http_client.get_json(url, params=params, timeout=timeout))
+            except Exception as e:
+                future.set_exception(e)
+            finally:
+                with self._lock:
+                    if future.exception() is not None:
+                        # Don't reuse failures - the next caller retries
+                        self._entries.pop(key, None)
+                    else:
+                        entry["completed_at"] = time.monotonic()
+
+        return entry["future"].result()
+
+
+# Shared response layer used by every fetcher
+responses = SharedResponses()
+
+
+def get_json(url: str, params: Optional[Dict] = None, timeout: float = 5) -> Any:
+    """Fetch a JSON payload through the shared response layer"""
+    return responses.get_json(url, params=params, timeout=timeout)
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Stand-in Upstream Server
+Serves recorded upstream fixtures (upstream_replay.py) over HTTP so the web
+app and CLI calculator can be exercised and timed without network access.
+
+Requests arrive as /<upstream host>/<path>?<query> (http_client.py rewrites
+them when UPSTREAM_URL is set) and are answered from the fixture recorded
+for https://<upstream host>/<path>?<query>. Latency, errors and rate limits
+are configurable to reproduce a slow or flaky upstream:
+
+    python3 fixture_server.py --port 8099 --latency-ms 80 --jitter-ms 40 \\
+        --error-rate 0.05 --rate-limit 10
+    UPSTREAM_URL=http://127.0.0.1:8099 python3 calculator.py
+
+Used by:
+- Offline runs of app.py, calculator.py and the test scripts
+"""
+
+import argparse
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+
+from upstream_replay import DEFAULT_FIXTURES_DIR, FixtureStore, from_standin_path
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+DEFAULT_PORT = 8099
+ERROR_STATUS = 503              # Status of injected errors (retried by http_client)
+RATE_LIMIT_WINDOW_S = 1.0       # --rate-limit counts requests per upstream host per window
+
+
+# ============================================================================
+# Fault Injection
+# ============================================================================
+
+class UpstreamBehaviour:
+    """Latency, error and rate limit settings shared by every request"""
+
+    def __init__(self, latency_ms: float = 0.0, jitter_ms: float = 0.0,
+                 error_rate: float = 0.0, rate_limit: Optional[int] = None,
+                 seed: Optional[int] = None):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._windows = {}  # host -> (window start, requests in window)
+        self.stats = {"requests": 0, "served": 0, "missing": 0, "errors": 0, "rate_limited": 0}
+
+    def count(self, key: str):
+        with self._lock:
+            self.stats[key] += 1
+
+    def delay(self) -> float:
+        """Seconds to wait before answering"""
+        with self._lock:
+            jitter = self._random.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0.0
+        return max(0.0, self.latency_ms + jitter) / 1000
+
+    def should_fail(self) -> bool:
+        with self._lock:
+            return self.error_rate > 0 and self._random.random() < self.error_rate
+
+    def rate_limited(self, host: str) -> Optional[float]:
+        """Seconds until the host's window resets if over the limit, else None"""
+        if not self.rate_limit:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            started, count = self._windows.get(host, (now, 0))
+            if now - started >= RATE_LIMIT_WINDOW_S:
+                started, count = now, 0
+            self._windows[host] = (started, count + 1)
+            if count < self.rate_limit:
+                return None
+            return RATE_LIMIT_WINDOW_S - (now - started)
+
+
+# ============================================================================
+# HTTP Server
+# ============================================================================
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """Answers upstream requests from recorded fixtures"""
+
+    protocol_version = "HTTP/1.1"   # Keep-alive, like the real upstreams
+    store: FixtureStore = None
+    behaviour: UpstreamBehaviour = None
+    quiet = False
+
+    def do_GET(self):
+        behaviour = self.behaviour
+        behaviour.count("requests")
+        url = from_standin_path(self.path)
+        host = url.split("/")[2]
+
+        time.sleep(behaviour.delay())
+
+        retry_after = behaviour.rate_limited(host)
+        if retry_after is not None:
+            behaviour.count("rate_limited")
+            self.send_body(429, b'{"error": "rate limited"}', headers={"Retry-After": f"{retry_after:.0f}"})
+            return
+
+        if behaviour.should_fail():
+            behaviour.count("errors")
+            self.send_body(ERROR_STATUS, b'{"error": "injected failure"}')
+            return
+
+        fixture = self.store.load(url)
+        if fixture is None:
+            behaviour.count("missing")
+            self.send_body(404, b'{"error": "no recorded fixture"}')
+            return
+
+        behaviour.count("served")
+        self.send_body(fixture["status"], fixture["body"].encode(),
+                       content_type=fixture.get("content_type", "application/json"))
+
+    def send_body(self, status: int, body: bytes, content_type: str = "application/json",
+                  headers: Optional[Dict[str, str]] = None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            super().log_message(format, *args)
+
+
+def make_server(fixtures_dir: str = DEFAULT_FIXTURES_DIR, host: str = "127.0.0.1",
+                port: int = DEFAULT_PORT, behaviour: Optional[UpstreamBehaviour] = None,
+                quiet: bool = False) -> ThreadingHTTPServer:
+    """
+    Build a stand-in server (port 0 picks a free port - see server.server_address)
+
+    Returns: ThreadingHTTPServer; call serve_forever() (e.g. in a thread)
+    """
+    handler = type("BoundFixtureHandler", (FixtureHandler,), {
+        "store": FixtureStore(fixtures_dir),
+        "behaviour": behaviour or UpstreamBehaviour(),
+        "quiet": quiet
+    })
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+# ============================================================================
+# CLI Interface
+# ============================================================================
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Stand-in upstream server for recorded fixtures")
+    parser.add_argument('--fixtures', default=DEFAULT_FIXTURES_DIR,
+                        help='Fixture directory (record with UPSTREAM_MODE=record)')
+    parser.add_argument('--host', default="127.0.0.1", help='Bind address (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f'Port (default: {DEFAULT_PORT})')
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='Added response latency')
+    parser.add_argument('--jitter-ms', type=float, default=0.0, help='Random +/- latency jitter')
+    parser.add_argument('--error-rate', type=float, default=0.0,
+                        help=f'Fraction of requests answered with HTTP {ERROR_STATUS}')
+    parser.add_argument('--rate-limit', type=int, default=None,
+                        help='Requests per second per upstream host before HTTP 429')
+    parser.add_argument('--seed', type=int, default=None, help='Seed for reproducible jitter and errors')
+    parser.add_argument('--quiet', action='store_true', help='No per-request logging')
+    args = parser.parse_args()
+
+    behaviour = UpstreamBehaviour(args.latency_ms, args.jitter_ms, args.error_rate,
+                                  args.rate_limit, args.seed)
+    server = make_server(args.fixtures, args.host, args.port, behaviour, args.quiet)
+    fixtures = sum(1 for _ in server.RequestHandlerClass.store)
+    print(f"Serving {fixtures} fixture(s) from {args.fixtures} on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\nStopped: {behaviour.stats}")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Network Hashrate Growth Forecaster
+Fits log(network hashrate) = a + b * t to the recorded hashrate history so
+projections stop assuming today's network hashrate holds for a year.
+
+The fit is a weighted least-squares regression kept as running sums, so each
+new sample is an O(1) update instead of a refit over the whole history.
+Older samples fade out with a configurable half-life, letting the trend
+follow regime changes (new ASIC generations, hardforks).
+
+Forecasts come as hashrate multipliers relative to now with percentile
+bands (slope uncertainty plus residual noise), and as cumulative earnings
+curves that plug straight into projections.project_fleet(reward_curve=...).
+
+A trend fitted over weeks must not be compounded unchecked over years: the
+slope is clamped, its effect is damped beyond a few times the observed span,
+and its uncertainty widens with how far the horizon extrapolates past it.
+
+Used by:
+- app.py: fed from history.py, serves /api/forecast (workers load the
+  refresher's fit via state()/load_state())
+"""
+
+import math
+import threading
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+DEFAULT_HALF_LIFE_DAYS = 90    # Weight of a sample halves every 90 days
+MIN_SAMPLE_SPACING_S = 3600    # Ingest at most one sample per hour (refreshes run every 10s)
+MIN_SAMPLES = 14 * 24          # Effective samples needed before forecasting (two weeks hourly)
+MIN_SPAN_DAYS = 30.0           # History span needed before forecasting
+MAX_GROWTH_ANNUAL = 3.0        # Fitted slope clamped to x4 (or /4) per year
+DAMPING_SPAN_FACTOR = 2.0      # Trend effect fades over horizons beyond 2x the observed span
+
+# Normal quantiles for the hashrate bands
+BAND_Z = {"p5": -1.645, "p25": -0.674, "p50": 0.0, "p75": 0.674, "p95": 1.645}
+
+# Attributes that make up a fit (exported by state() for other processes)
+STATE_FIELDS = ("origin", "first_ts", "last_ts", "samples",
+                "_w", "_t", "_y", "_tt", "_ty", "_yy", "_w2")
+
+DAY_S = 86400
+
+
+# ============================================================================
+# Forecaster
+# ============================================================================
+
+class LogLinearForecaster:
+    """Incrementally updated exponential growth fit with forgetting"""
+
+    def __init__(self, half_life_days: float = DEFAULT_HALF_LIFE_DAYS,
+                 min_spacing_s: float = MIN_SAMPLE_SPACING_S):
+        self.half_life_days = half_life_days
+        self.min_spacing_s = min_spacing_s
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.origin = None        # Timestamp of t = 0 (keeps sums well conditioned)
+            self.first_ts = None
+            self.last_ts = None
+            self.samples = 0
+            # Weighted sums of 1, t, y, t^2, t*y, y^2 and of squared weights
+            self._w = self._t = self._y = self._tt = self._ty = self._yy = self._w2 = 0.0
+
+    def state(self) -> Dict:
+        """Running sums and timestamps of the fit (JSON-safe)"""
+        with self._lock:
+            return {name: getattr(self, name) for name in STATE_FIELDS}
+
+    def load_state(self, state: Dict):
+        """Replace the fit with one exported by state() - e.g. the refresher's"""
+        with self._lock:
+            for name in STATE_FIELDS:
+                setattr(self, name, state[name])
+
+    def add(self, ts: float, value: float) -> bool:
+        """
+        Fold one hashrate sample into the fit
+
+        Returns: True if the sample was used (False if too soon after the
+        previous one, out of order or not positive)
+        """
+        if value is None or value <= 0:
+            return False
+
+        with self._lock:
+            if self.last_ts is not None and ts - self.last_ts < self.min_spacing_s:
+                return False
+            if self.origin is None:
+                self.origin = self.first_ts = ts
+
+            if self.last_ts is not None:
+                # Age every previous sample by the time since the last one
+                decay = 0.5 ** ((ts - self.last_ts) / DAY_S / self.half_life_days)
+                self._w *= decay
+                self._t *= decay
+                self._y *= decay
+                self._tt *= decay
+                self._ty *= decay
+                self._yy *= decay
+                self._w2 *= decay * decay
+
+            t = (ts - self.origin) / DAY_S
+            y = math.log(value)
+            self._w += 1.0
+            self._t += t
+            self._y += y
+            self._tt += t * t
+            self._ty += t * y
+            self._yy += y * y
+            self._w2 += 1.0
+            self.last_ts = ts
+            self.samples += 1
+            return True
+
+    def fit(self) -> Optional[Dict]:
+        """
+        Current fit
+
+        Returns:
+            Dict with growth_per_day (clamped log slope), growth_annual
+            (expected fractional change over the next year after damping,
+            e.g. 0.5 = +50%), slope_se, residual_sd, effective_samples,
+            span_days, damping_days and last_ts - or None until there is
+            MIN_SPAN_DAYS of history
+        """
+        with self._lock:
+            if self.samples < 2 or self._w <= 0:
+                return None
+            w = self._w
+            sxx = self._tt - self._t * self._t / w
+            sxy = self._ty - self._t * self._y / w
+            syy = self._yy - self._y * self._y / w
+            effective = w * w / self._w2
+            span_days = (self.last_ts - self.first_ts) / DAY_S
+            last_t = (self.last_ts - self.origin) / DAY_S
+            mean_t = self._t / w
+            mean_y = self._y / w
+
+        if effective < MIN_SAMPLES or span_days < MIN_SPAN_DAYS or sxx <= 0:
+            return None
+
+        slope = sxy / sxx
+        max_slope = math.log1p(MAX_GROWTH_ANNUAL) / 365
+        residual_var = max(syy - slope * sxy, 0.0) / w * effective / (effective - 2)
+        fit = {
+            "growth_per_day": min(max(slope, -max_slope), max_slope),
+            "slope_se": math.sqrt(residual_var / sxx),
+            "residual_sd": math.sqrt(residual_var),
+            "fitted_now": math.exp(mean_y + slope * (last_t - mean_t)),
+            "effective_samples": round(effective, 1),
+            "span_days": round(span_days, 1),
+            "damping_days": round(span_days * DAMPING_SPAN_FACTOR, 1),
+            "last_ts": self.last_ts
+        }
+        fit["growth_annual"] = math.expm1(float(self._log_growth(fit, np.array([365.0]))[0]))
+        return fit
+
+    @staticmethod
+    def _log_growth(fit: Dict, d: np.ndarray) -> np.ndarray:
+        """
+        Expected log hashrate change after d days (damped trend)
+
+        Grows like slope * d over the observed span, then levels off towards
+        slope * damping_days instead of compounding for ever.
+        """
+        tau = fit["damping_days"]
+        return fit["growth_per_day"] * tau * -np.expm1(-d / tau)
+
+    def hashrate_multipliers(self, days: int, fit: Optional[Dict] = None) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Forecast network hashrate relative to now for days 1..days
+
+        Returns: Dict of band ("p5".."p95") -> array of multipliers, or None
+        """
+        fit = fit or self.fit()
+        if fit is None:
+            return None
+        d = np.arange(1, days + 1, dtype=float)
+        log_mean = self._log_growth(fit, d)
+        # Slope variance grows with how far the horizon extrapolates past the history
+        extrapolation = np.maximum(d / max(fit["span_days"], 1.0), 1.0)
+        log_sd = np.sqrt((fit["slope_se"] * d) ** 2 * extrapolation + fit["residual_sd"] ** 2)
+        return {band: np.exp(log_mean + z * log_sd) for band, z in BAND_Z.items()}
+
+    def earnings_curves(self, days: int, reward_ratios: Optional[Sequence[float]] = None,
+                        fit: Optional[Dict] = None) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Cumulative earnings relative to today's daily earnings, per band
+
+        Each curve has days + 1 entries (curve[d] = income of the next d days
+        in today-equivalent days) and can be passed as project_fleet's
+        reward_curve. Earnings bands are the mirror of hashrate bands: the
+        p5 earnings curve uses the p95 network hashrate.
+
+        Args:
+            days: Horizon
+            reward_ratios: Block reward per day relative to today (emission schedule)
+        """
+        multipliers = self.hashrate_multipliers(days, fit)
+        if multipliers is None:
+            return None
+        ratios = np.ones(days) if reward_ratios is None else np.asarray(reward_ratios[:days], dtype=float)
+        return {
+            band: np.concatenate(([0.0], np.cumsum(ratios / multipliers[mirror])))
+            for band, mirror in zip(BAND_Z, reversed(list(BAND_Z)))
+        }
@@ -0,0 +1,43 @@
+"""
+Gunicorn settings for the calculator web app
+
+    gunicorn -c gunicorn.conf.py 'wsgi:create_app()'
+
+The master starts the single refresher process (wsgi.py --refresher) before
+forking workers and stops it on exit. Set SNAPSHOT_REFRESHER=external when
+the refresher runs as its own service.
+
+/api/metrics in a worker reports the refresher's upstream metrics as of its
+last published run (workers never fetch themselves).
+"""
+
+import multiprocessing
+import os
+import subprocess
+import sys
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8080')}"
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+worker_class = "gthread"
+# Every open /api/stream (SSE) connection holds one thread for as long as the
+# page is open, so size this for the dashboards expected per worker plus
+# headroom for ordinary requests
+threads = int(os.environ.get("WEB_THREADS", 32))
+timeout = 60
+graceful_timeout = 10
+
+refresher = None
+
+
+def on_starting(server):
+    global refresher
+    if os.environ.get("SNAPSHOT_REFRESHER", "managed") == "managed":
+        wsgi_py = os.path.join(os.path.dirname(os.path.abspath(__file__)), "wsgi.py")
+        refresher = subprocess.Popen([sys.executable, wsgi_py, "--refresher"])
+        server.log.info("Started snapshot refresher (pid %s)", refresher.pid)
+
+
+def on_exit(server):
+    if refresher is not None and refresher.poll() is None:
+        refresher.terminate()
+        refresher.wait(timeout=10)
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Time-Series History Store
+Append-only SQLite (WAL mode) store for every fetched price, network
+hashrate, difficulty, block reward and income figure, so history survives
+restarts and the dashboard can chart months of data.
+
+Each sample is written to the raw tier and folded into the rollup tiers
+(5 minute, 1 hour, 1 day buckets holding mean/min/max) in the same
+transaction, so downsampling never needs a batch job. Each tier keeps its
+own retention window, and range queries read the finest tier that covers
+the range within the requested number of points. Series names and row
+counts per tier are kept up to date on write, so listing series and store
+stats never scan the samples.
+
+Used by:
+- app.py: records every published calculator run, serves /api/history
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+DEFAULT_DB_PATH = os.environ.get(
+    "HISTORY_DB", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "history.db"))
+
+DAY_S = 86400
+
+# Tier resolution in seconds (0 = raw samples) -> retention in seconds (None = forever)
+TIERS = {
+    0: 7 * DAY_S,
+    300: 90 * DAY_S,
+    3600: 2 * 365 * DAY_S,
+    DAY_S: None,
+}
+RAW_RESOLUTION_S = 10          # Fastest refresh interval - used to size raw-tier queries
+
+DEFAULT_MAX_POINTS = 1000
+MAX_POINTS = 10000
+PRUNE_EVERY_S = 3600           # How often old samples are dropped
+
+SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS samples (
+        series TEXT NOT NULL,
+        tier INTEGER NOT NULL,
+        ts INTEGER NOT NULL,
+        value REAL NOT NULL,
+        min REAL NOT NULL,
+        max REAL NOT NULL,
+        count INTEGER NOT NULL,
+        PRIMARY KEY (series, tier, ts)
+    ) WITHOUT ROWID
+    """,
+    "CREATE TABLE IF NOT EXISTS series (name TEXT PRIMARY KEY) WITHOUT ROWID",
+    "CREATE TABLE IF NOT EXISTS tier_rows (tier INTEGER PRIMARY KEY, rows INTEGER NOT NULL)",
+)
+
+# Row counts per tier follow every insert and delete (upserts that update a
+# bucket fire neither)
+TRIGGERS = (
+    """
+    CREATE TRIGGER IF NOT EXISTS samples_insert AFTER INSERT ON samples
+    BEGIN UPDATE tier_rows SET rows = rows + 1 WHERE tier = NEW.tier; END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS samples_delete AFTER DELETE ON samples
+    BEGIN UPDATE tier_rows SET rows = rows - 1 WHERE tier = OLD.tier; END
+    """,
+)
+
+# A raw sample at an existing timestamp replaces it (an update, so it is not counted twice)
+RAW_UPSERT = """
+INSERT INTO samples (series, tier, ts, value, min, max, count)
+VALUES (?, 0, ?, ?, ?, ?, 1)
+ON CONFLICT (series, tier, ts) DO UPDATE SET
+    value = excluded.value,
+    min = excluded.min,
+    max = excluded.max
+"""
+
+# Running mean/min/max of a rollup bucket, updated in place per sample
+ROLLUP_UPSERT = """
+INSERT INTO samples (series, tier, ts, value, min, max, count)
+VALUES (?, ?, ?, ?, ?, ?, 1)
+ON CONFLICT (series, tier, ts) DO UPDATE SET
+    value = (value * count + excluded.value) / (count + 1),
+    min = MIN(min, excluded.min),
+    max = MAX(max, excluded.max),
+    count = count + 1
+"""
+
+
+# ============================================================================
+# History Store
+# ============================================================================
+
+class HistoryStore:
+    """Thread-safe embedded time-series store (one writer, concurrent readers)"""
+
+    def __init__(self, path: str = DEFAULT_DB_PATH):
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        self._write_lock = threading.Lock()
+        self._local = threading.local()
+        self._writer = self._connect()
+        self._create_schema()
+        self._last_prune = 0.0
+        self.samples_written = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False, timeout=10)
+        conn.execute("PRAGMA journal_mode=WAL")    # Readers never block the writer
+        conn.execute("PRAGMA synchronous=NORMAL")  # Safe with WAL, far fewer fsyncs
+        return conn
+
+    def _create_schema(self):
+        """Create the tables, counting series and rows once for databases from before them"""
+        self._writer.execute("BEGIN IMMEDIATE")  # Other processes opening the store wait
+        with self._writer:
+            for statement in SCHEMA:
+                self._writer.execute(statement)
+            if self._writer.execute("SELECT COUNT(*) FROM tier_rows").fetchone()[0] == 0:
+                self._writer.execute("INSERT OR IGNORE INTO series SELECT DISTINCT series FROM samples")
+                self._writer.execute("INSERT INTO tier_rows SELECT tier, COUNT(*) FROM samples GROUP BY tier")
+            self._writer.executemany("INSERT OR IGNORE INTO tier_rows VALUES (?, 0)",
+                                     [(tier,) for tier in TIERS])
+            for trigger in TRIGGERS:
+                self._writer.execute(trigger)
+
+    def _reader(self) -> sqlite3.Connection:
+        """Per-thread read connection (WAL allows reads alongside the writer)"""
+        if self.path == ":memory:":
+            return self._writer  # An in-memory database exists on one connection only
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+        return conn
+
+    def record(self, samples: Dict[str, float], ts: Optional[float] = None):
+        """
+        Append one sample per series at the same timestamp
+
+        Args:
+            samples: Dict of series name -> value (None values are skipped)
+            ts: Unix timestamp (default: now)
+        """
+        ts = int(ts if ts is not None else time.time())
+        rows = [(name, float(value)) for name, value in samples.items() if value is not None]
+        if not rows:
+            return
+
+        with self._write_lock:
+            with self._writer:  # One transaction for the raw samples and every rollup
+                self._writer.executemany(
+                    RAW_UPSERT, [(name, ts, value, value, value) for name, value in rows])
+                for tier in TIERS:
+                    if tier:
+                        bucket = ts - ts % tier
+                        self._writer.executemany(
+                            ROLLUP_UPSERT,
+                            [(name, tier, bucket, value, value, value) for name, value in rows])
+                self._writer.executemany("INSERT OR IGNORE INTO series VALUES (?)",
+                                         [(name,) for name, _ in rows])
+            self.samples_written += len(rows)
+
+            if time.monotonic() - self._last_prune > PRUNE_EVERY_S:
+                self._prune(ts)
+
+    def _prune(self, now: int):
+        """Drop samples older than each tier's retention (write lock held)"""
+        with self._writer:
+            for tier, retention in TIERS.items():
+                if retention is not None:
+                    self._writer.execute("DELETE FROM samples WHERE tier = ? AND ts < ?",
+                                         (tier, now - retention))
+        self._last_prune = time.monotonic()
+
+    def pick_tier(self, start: float, end: float, max_points: int = DEFAULT_MAX_POINTS,
+                  now: Optional[float] = None) -> int:
+        """
+        Choose the finest tier that still holds data back to start and
+        returns at most about max_points for the range
+        """
+        now = now if now is not None else time.time()
+        for tier, retention in TIERS.items():
+            if retention is not None and start < now - retention:
+                continue
+            if (end - start) / (tier or RAW_RESOLUTION_S) <= max_points:
+                return tier
+        return max(TIERS)
+
+    def query(self, series: Iterable[str], start: float, end: float,
+              max_points: int = DEFAULT_MAX_POINTS, tier: Optional[int] = None) -> Dict:
+        """
+        Range query for one or more series
+
+        Args:
+            series: Series names
+            start, end: Unix timestamp range (inclusive)
+            max_points: Point budget per series, used to pick the tier
+            tier: Force a tier resolution (seconds, 0 = raw) instead of picking one
+
+        Returns:
+            Dict with the tier used and, per series, a list of
+            [ts, mean, min, max] points in time order
+        """
+        if tier is None:
+            tier = self.pick_tier(start, end, max_points)
+        elif tier not in TIERS:
+            raise ValueError(f"tier must be one of {sorted(TIERS)}")
+
+        # Include the rollup bucket that straddles start
+        first = int(start) - int(start) % tier if tier else int(start)
+
+        conn = self._reader()
+        points = {}
+        for name in series:
+            rows = conn.execute(
+                "SELECT ts, value, min, max FROM samples "
+                "WHERE series = ? AND tier = ? AND ts BETWEEN ? AND ? ORDER BY ts",
+                (name, tier, first, int(end))).fetchall()
+            points[name] = [list(row) for row in rows]
+
+        return {"tier_s": tier, "start": int(start), "end": int(end), "series": points}
+
+    def series_names(self) -> List[str]:
+        """All series ever recorded (the daily tier keeps them for ever)"""
+        rows = self._reader().execute("SELECT name FROM series ORDER BY name")
+        return [row[0] for row in rows]
+
+    def span(self, name: str) -> Optional[Tuple[int, int]]:
+        """First and last sample timestamp of a series (None if empty)"""
+        row = self._reader().execute(
+            "SELECT MIN(ts), MAX(ts) FROM samples WHERE series = ?", (name,)).fetchone()
+        return (row[0], row[1]) if row and row[0] is not None else None
+
+    def stats(self) -> Dict:
+        """Row counts per tier and samples written since startup"""
+        rows = self._reader().execute("SELECT tier, rows FROM tier_rows ORDER BY tier")
+        return {
+            "path": self.path,
+            "samples_written": self.samples_written,
+            "rows_per_tier": {str(tier): count for tier, count in rows}
+        }
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Pooled HTTP Client for Upstream APIs
+One long-lived requests.Session with keep-alive connection pools per upstream
+host, retry/backoff for transient failures, and connection reuse metrics.
+A 429/503 Retry-After is honoured when the wait still fits the deadline;
+otherwise that response is returned straight away.
+
+Inside a fetch cycle (fetch_engine.py) every GET, retries and backoff
+included, is sized to finish before the cycle deadline, so an overrunning
+call can't hold a fetch thread into later cycles.
+
+Offline runs: UPSTREAM_MODE=record|replay and UPSTREAM_URL switch requests to
+recorded fixtures or the stand-in server (see upstream_replay.py).
+
+Used by:
+- fetch_engine.py: shared response layer (web app and CLI calculator)
+- test_zcash.py: API smoke test
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import MaxRetryError, ResponseError
+from urllib3.util.retry import Retry
+
+from upstream_replay import DEFAULT_FIXTURES_DIR, MODES, FixtureStore, to_standin_url
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+USER_AGENT = "A5000mine-calculator/1.0"
+
+# Connections kept alive per upstream host. Sized to the number of fetchers
+# that can hit a host concurrently in one calculator cycle.
+HOST_POOL_SIZES = {
+    "https://api.coingecko.com": 2,   # KAS + ZEC price
+    "https://kas.2miners.com": 2,     # Network + pool stats (usually coalesced)
+    "https://zec.2miners.com": 2,     # Network stats
+    "https://api.kaspa.org": 2,       # Block reward
+}
+DEFAULT_POOL_SIZE = 4                 # Any host not listed above...
+DEFAULT_POOL_HOSTS = 10               # ...with this many such hosts kept alive at once
+
+# Retry transient upstream failures with exponential backoff (0.3s, 0.6s)
+RETRY_TOTAL = 2
+RETRY_BACKOFF_FACTOR = 0.3
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+RETRY_BACKOFF_MAX_S = sum(RETRY_BACKOFF_FACTOR * 2 ** i for i in range(RETRY_TOTAL))  # Worst case, 0.9s
+
+# Under a deadline each attempt gets an equal share of what is left after backoff
+MIN_ATTEMPT_TIMEOUT_S = 0.5   # Less than this left: fail at once instead of starting
+
+# A 429/503 Retry-After is waited out only if the remaining attempts still fit
+# the deadline afterwards (or, outside a fetch cycle, if it is this short);
+# otherwise the response is returned and the next cycle retries
+MAX_RETRY_AFTER_S = 5.0
+
+# Record/replay (upstream_replay.py) - live by default
+UPSTREAM_MODE = os.environ.get("UPSTREAM_MODE", "live")
+UPSTREAM_FIXTURES = os.environ.get("UPSTREAM_FIXTURES", DEFAULT_FIXTURES_DIR)
+UPSTREAM_URL = os.environ.get("UPSTREAM_URL")   # Stand-in server, e.g. http://127.0.0.1:8099
+
+
+# ============================================================================
+# HTTP Client
+# ============================================================================
+
+def _build_adapter(pool_size: int, pool_hosts: int = 1) -> HTTPAdapter:
+    """Create a keep-alive adapter with the shared retry policy"""
+    retry = DeadlineRetry(
+        total=RETRY_TOTAL,
+        backoff_factor=RETRY_BACKOFF_FACTOR,
+        status_forcelist=RETRY_STATUS_CODES,
+        allowed_methods=["GET"],
+        respect_retry_after_header=True,
+        raise_on_status=False
+    )
+    return HTTPAdapter(pool_connections=pool_hosts, pool_maxsize=pool_size,
+                       max_retries=retry, pool_block=False)
+
+
+_call_deadline = threading.local()
+
+
+@contextmanager
+def deadline(at: float):
+    """Fit every GET this thread makes inside the block before time.monotonic() reaches `at`"""
+    previous = getattr(_call_deadline, "at", None)
+    _call_deadline.at = at if previous is None else min(at, previous)
+    try:
+        yield
+    finally:
+        _call_deadline.at = previous
+
+
+def attempt_timeout(timeout: float) -> float:
+    """
+    Per-attempt timeout so all retries and backoff finish before the deadline
+
+    Raises: requests.Timeout if too little time is left to try at all
+    """
+    at = getattr(_call_deadline, "at", None)
+    if at is None:
+        return timeout
+    per_attempt = (at - time.monotonic() - RETRY_BACKOFF_MAX_S) / (RETRY_TOTAL + 1)
+    if per_attempt < MIN_ATTEMPT_TIMEOUT_S:
+        raise requests.Timeout("Fetch cycle deadline passed before the request started")
+    _call_deadline.attempt = min(timeout, per_attempt)
+    return _call_deadline.attempt
+
+
+class DeadlineRetry(Retry):
+    """Retry policy that only waits out a Retry-After the caller's deadline can afford"""
+
+    def retry_after_budget(self) -> float:
+        """Longest Retry-After worth waiting for before the next attempt"""
+        at = getattr(_call_deadline, "at", None)
+        if at is None:
+            return MAX_RETRY_AFTER_S
+        # The wait, every attempt still allowed and the worst-case backoff must all fit
+        attempts = self.total if self.total is not None else RETRY_TOTAL
+        return at - time.monotonic() - attempts * _call_deadline.attempt - RETRY_BACKOFF_MAX_S
+
+    def increment(self, method=None, url=None, response=None, error=None, _pool=None, _stacktrace=None):
+        if response is not None:
+            retry_after = self.get_retry_after(response)
+            if retry_after is not None and retry_after > self.retry_after_budget():
+                # urllib3 hands back the response itself (raise_on_status=False)
+                raise MaxRetryError(_pool, url, ResponseError(
+                    f"Retry-After {retry_after:.0f}s does not fit the deadline"))
+        return super().increment(method=method, url=url, response=response, error=error,
+                                 _pool=_pool, _stacktrace=_stacktrace)
+
+
+class HttpClient:
+    """Shared, connection-pooled client for all upstream API calls"""
+
+    def __init__(self, host_pool_sizes: Optional[Dict[str, int]] = None,
+                 default_pool_size: int = DEFAULT_POOL_SIZE,
+                 mode: str = UPSTREAM_MODE, fixtures_dir: str = UPSTREAM_FIXTURES,
+                 standin_url: Optional[str] = UPSTREAM_URL):
+        if mode not in MODES:
+            raise ValueError(f"UPSTREAM_MODE must be one of {', '.join(MODES)}, got '{mode}'")
+        self.mode = mode
+        self.standin_url = standin_url
+        self.fixtures = FixtureStore(fixtures_dir)
+
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = USER_AGENT
+
+        self.adapters = {}
+        for prefix in ("https://", "http://"):
+            self.adapters[prefix] = _build_adapter(default_pool_size, DEFAULT_POOL_HOSTS)
+        for prefix, pool_size in (host_pool_sizes or HOST_POOL_SIZES).items():
+            self.adapters[prefix] = _build_adapter(pool_size)
+
+        # requests picks the longest matching prefix, so host adapters win
+        for prefix, adapter in self.adapters.items():
+            self.session.mount(prefix, adapter)
+
+    def get(self, url: str, params: Optional[Dict] = None, timeout: float = 5) -> requests.Response:
+        """
+        Issue a GET over a pooled keep-alive connection
+
+        Returns: Response (call raise_for_status() as with requests.get)
+        """
+        if self.mode == "replay" and not self.standin_url:
+            return self.fixtures.replay(url, params)
+
+        timeout = attempt_timeout(timeout)
+        if self.standin_url:
+            return self.session.get(to_standin_url(self.standin_url, url), params=params, timeout=timeout)
+
+        response = self.session.get(url, params=params, timeout=timeout)
+        if self.mode == "record":
+            self.fixtures.save(url, params, response)
+        return response
+
+    def get_json(self, url: str, params: Optional[Dict] = None, timeout: float = 5) -> Any:
+        """
+        Issue a GET and decode the JSON body
+
+        Raises: requests.HTTPError on non-2xx status (after retries)
+        """
+        response = self.get(url, params=params, timeout=timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def stats(self) -> Dict:
+        """
+        Connection reuse metrics per host
+
+        Returns: Dict with per-host and total requests, new connections and reuse rate
+        """
+        hosts = {}
+        for adapter in self.adapters.values():
+            pools = adapter.poolmanager.pools
+            for key in list(pools.keys()):
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                host = f"{pool.scheme}://{pool.host}"
+                if pool.port not in (None, 80, 443):
+                    host += f":{pool.port}"
+                entry = hosts.setdefault(host, {"requests": 0, "connections": 0})
+                entry["requests"] += pool.num_requests
+                entry["connections"] += pool.num_connections
+
+        total_requests = sum(h["requests"] for h in hosts.values())
+        total_connections = sum(h["connections"] for h in hosts.values())
+        for entry in hosts.values():
+            entry["reuse_rate"] = _reuse_rate(entry["requests"], entry["connections"])
+
+        return {
+            "hosts": hosts,
+            "requests": total_requests,
+            "connections": total_connections,
+            "reuse_rate": _reuse_rate(total_requests, total_connections),
+            "upstream_mode": self.mode,
+            "standin_url": self.standin_url,
+            "fixtures": dict(self.fixtures.stats)
+        }
+
+
+def _reuse_rate(requests_made: int, connections_opened: int) -> float:
+    """Fraction of requests served on an already-open connection"""
+    if requests_made <= 0:
+        return 0.0
+    return round(max(0.0, 1 - connections_opened / requests_made), 3)
+
+
+# Shared client instance used by the web app, CLI calculator and test scripts
+client = HttpClient()
+
+
+def get(url: str, params: Optional[Dict] = None, timeout: float = 5) -> requests.Response:
+    """GET through the shared pooled client"""
+    return client.get(url, params=params, timeout=timeout)
+
+
+def get_json(url: str, params: Optional[Dict] = None, timeout: float = 5) -> Any:
+    """GET and decode JSON through the shared pooled client"""
+    return client.get_json(url, params=params, timeout=timeout)
+
+
+def stats() -> Dict:
+    """Connection reuse metrics for the shared client"""
+    return client.stats()
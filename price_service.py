@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Batched CoinGecko Price Service
+Fetches every tracked coin in every needed fiat currency with a single
+/simple/price call, caches the whole price matrix in the shared api_cache,
+and serves per-coin lookups from it.
+
+Used by:
+- app.py / calculator.py: KAS and ZEC prices in GBP and USD
+- automation/crypto-converter.py: AE/KAS/ZEC conversion rates
+"""
+
+from typing import Dict, Optional, Tuple
+
+from cache import TTLCache, api_cache
+from fetch_engine import get_json
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+COINGECKO_API = "https://api.coingecko.com/api/v3"
+
+# CoinGecko id -> ticker symbol for every coin we price
+TRACKED_COINS = {
+    "kaspa": "KAS",
+    "zcash": "ZEC",
+    "aeternity": "AE",
+}
+VS_CURRENCIES = ("gbp", "usd")
+
+PRICE_TTL_S = 60  # CoinGecko free tier updates prices roughly once a minute
+
+
+# ============================================================================
+# Price Service
+# ============================================================================
+
+class PriceService:
+    """Caches a coin x currency price matrix fetched in one batched request"""
+
+    def __init__(self, coin_ids=None, vs_currencies=VS_CURRENCIES,
+                 ttl: float = PRICE_TTL_S, timeout: float = 5, cache: TTLCache = api_cache):
+        self.coin_ids = tuple(coin_ids or TRACKED_COINS)
+        self.vs_currencies = tuple(vs_currencies)
+        self.ttl = ttl
+        self.timeout = timeout
+        self.cache = cache
+        self.cache_key = "prices:" + ",".join(self.coin_ids) + ":" + ",".join(self.vs_currencies)
+
+    def _load_matrix(self) -> Optional[Dict]:
+        """Fetch the price matrix from CoinGecko (cache loader)"""
+        try:
+            data = get_json(f"{COINGECKO_API}/simple/price", params={
+                "ids": ",".join(self.coin_ids),
+                "vs_currencies": ",".join(self.vs_currencies)
+            }, timeout=self.timeout)
+        except Exception as e:
+            print(f"Error fetching prices from CoinGecko: {e}")
+            return None
+
+        matrix = {}
+        for coin_id in self.coin_ids:
+            quotes = data.get(coin_id, {})
+            prices = {cur: float(quotes[cur]) for cur in self.vs_currencies
+                      if quotes.get(cur)}
+            if prices:
+                matrix[coin_id] = prices
+
+        if not matrix:
+            print("CoinGecko returned no prices for tracked coins")
+            return None
+        return matrix
+
+    def get_matrix(self, force: bool = False) -> Tuple[Optional[Dict], str]:
+        """
+        Get the full price matrix, refreshing it if the cache has expired
+
+        Returns:
+            (matrix, status) where status is "live" (within its TTL), "cached"
+            (expired - served stale while refreshing or after an upstream
+            failure) or "failed" (no data available)
+        """
+        if force:
+            self.cache.invalidate(self.cache_key)
+
+        matrix, cache_status = self.cache.get_or_load(self.cache_key, self._load_matrix, ttl=self.ttl)
+        if matrix is None:
+            return None, "failed"
+        return matrix, "cached" if cache_status == "stale" else "live"
+
+    def refresh(self, ttl: Optional[float] = None) -> Optional[Dict]:
+        """
+        Fetch the price matrix now and store it in the cache (scheduled refresh)
+
+        Returns: The new matrix, or None if the fetch failed
+        """
+        matrix = self._load_matrix()
+        if matrix is not None:
+            self.cache.set(self.cache_key, matrix, self.ttl if ttl is None else ttl)
+        return matrix
+
+    def get_price(self, coin_id: str, currency: str = "gbp") -> Tuple[Optional[float], str]:
+        """
+        Look up one coin's price from the cached matrix
+
+        Returns: (price or None, status) - see get_matrix for status values
+        """
+        matrix, status = self.get_matrix()
+        price = (matrix or {}).get(coin_id, {}).get(currency)
+        if price is None:
+            return None, "failed"
+        return price, status
+
+    def usd_to_gbp_rate(self) -> Optional[float]:
+        """
+        USD->GBP exchange rate implied by the price matrix
+
+        Returns: Median GBP/USD ratio across tracked coins, or None
+        """
+        matrix, _ = self.get_matrix()
+        ratios = sorted(prices["gbp"] / prices["usd"] for prices in (matrix or {}).values()
+                        if prices.get("gbp") and prices.get("usd"))
+        if not ratios:
+            return None
+        return ratios[len(ratios) // 2]
+
+
+# Shared price service used by the web app, CLI calculator and converter
+prices = PriceService()
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Vectorised Fleet Income Projection Engine
+Computes the full income/ROI grid for every combination of price scenario,
+network hashrate scenario, pool fee, electricity tariff and fleet size in
+one NumPy broadcast, instead of looping over miner counts and fee tiers.
+
+Grid axes (in order):
+    price x hashrate x fee x tariff x miners
+
+An optional reward curve (see emission.py) replaces the flat 30/365-day
+multipliers with the coin's declining block reward.
+"""
+
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+DAYS_PER_MONTH = 30
+DAYS_PER_YEAR = 365
+HOURS_PER_DAY = 24
+
+MAX_AXIS_LENGTH = 1000       # Per-axis limit for API requests
+MAX_GRID_CELLS = 1_000_000   # Total grid size limit for API requests
+
+ROI_SCAN_BLOCK_DAYS = 32     # ROI on rising-reward curves: days checked per block...
+ROI_SCAN_CHUNK = 4_000_000   # ...and cells x blocks bounded at once
+
+AXES = ("price_multiplier", "hashrate_multiplier", "pool_fee_percent",
+        "tariff_gbp_kwh", "miners")
+
+
+# ============================================================================
+# Projection Engine
+# ============================================================================
+
+def project_fleet(
+    daily_coin_per_miner: float,
+    coin_price_gbp: float,
+    miner_power_w: float,
+    miner_cost_gbp: float,
+    miner_counts: Sequence[float] = (1,),
+    pool_fees_percent: Sequence[float] = (0.0,),
+    tariffs_gbp_kwh: Sequence[float] = (0.0,),
+    price_multipliers: Sequence[float] = (1.0,),
+    hashrate_multipliers: Sequence[float] = (1.0,),
+    reward_curve: Optional[np.ndarray] = None
+) -> Dict[str, np.ndarray]:
+    """
+    Compute the income/ROI grid in one vectorised pass
+
+    Args:
+        daily_coin_per_miner: Coins one miner earns per day at current network hashrate
+        coin_price_gbp: Current coin price in GBP
+        miner_power_w: Power draw per miner
+        miner_cost_gbp: Hardware cost per miner
+        miner_counts: Fleet sizes
+        pool_fees_percent: Pool fees (0-100)
+        tariffs_gbp_kwh: Electricity tariffs in GBP per kWh (0 = free power)
+        price_multipliers: Coin price scenarios relative to current price
+        hashrate_multipliers: Network hashrate scenarios relative to current
+        reward_curve: Cumulative block reward relative to today by day
+            (EmissionSchedule.reward_curve, at least 366 entries). None = flat reward
+
+    Returns:
+        Dict of arrays shaped (price, hashrate, fee, tariff, miners):
+        daily_coin, daily_gross_gbp, daily_power_gbp, daily_net_gbp,
+        monthly_net_gbp, yearly_net_gbp, hardware_cost_gbp, roi_days
+        (roi_days is inf where the fleet never pays back)
+    """
+    price = np.asarray(price_multipliers, dtype=float).reshape(-1, 1, 1, 1, 1)
+    hashrate = np.asarray(hashrate_multipliers, dtype=float).reshape(1, -1, 1, 1, 1)
+    fee = np.asarray(pool_fees_percent, dtype=float).reshape(1, 1, -1, 1, 1)
+    tariff = np.asarray(tariffs_gbp_kwh, dtype=float).reshape(1, 1, 1, -1, 1)
+    miners = np.asarray(miner_counts, dtype=float).reshape(1, 1, 1, 1, -1)
+
+    # Our share of blocks scales inversely with network hashrate
+    daily_coin = daily_coin_per_miner / hashrate * (1 - fee / 100) * miners
+    daily_gross = daily_coin * coin_price_gbp * price
+    daily_power = miner_power_w / 1000 * HOURS_PER_DAY * tariff * miners
+    daily_net = daily_gross - daily_power
+
+    shape = np.broadcast_shapes(daily_net.shape, price.shape, hashrate.shape,
+                                fee.shape, tariff.shape, miners.shape)
+    daily_net = np.broadcast_to(daily_net, shape)
+    hardware_cost = np.broadcast_to(miner_cost_gbp * miners, shape)
+
+    if reward_curve is None:
+        monthly_net = daily_net * DAYS_PER_MONTH
+        yearly_net = daily_net * DAYS_PER_YEAR
+        with np.errstate(divide="ignore", invalid="ignore"):
+            roi_days = np.where(daily_net > 0, hardware_cost / daily_net, np.inf)
+    else:
+        # Gross income follows the reward curve; power costs stay flat
+        monthly_net = daily_gross * reward_curve[DAYS_PER_MONTH] - daily_power * DAYS_PER_MONTH
+        yearly_net = daily_gross * reward_curve[DAYS_PER_YEAR] - daily_power * DAYS_PER_YEAR
+        roi_days = roi_days_on_curve(reward_curve, hardware_cost,
+                                     np.broadcast_to(daily_gross, shape),
+                                     np.broadcast_to(daily_power, shape))
+
+    return {
+        "daily_coin": np.broadcast_to(daily_coin, shape),
+        "daily_gross_gbp": np.broadcast_to(daily_gross, shape),
+        "daily_power_gbp": np.broadcast_to(daily_power, shape),
+        "daily_net_gbp": daily_net,
+        "monthly_net_gbp": np.broadcast_to(monthly_net, shape),
+        "yearly_net_gbp": np.broadcast_to(yearly_net, shape),
+        "hardware_cost_gbp": hardware_cost,
+        "roi_days": roi_days
+    }
+
+
+def roi_days_on_curve(reward_curve: np.ndarray, cost: np.ndarray,
+                      daily_gross: np.ndarray, daily_power: np.ndarray) -> np.ndarray:
+    """
+    Days until cumulative net income covers cost, with a varying reward
+
+    Cumulative net on day d is daily_gross * reward_curve[d] - daily_power * d.
+    With a declining reward (emission schedules) it rises until the daily
+    reward drops below the power cost, so each cell bisects the rising
+    stretch (vectorised over the whole grid). Curves whose daily ratios ever
+    rise (growth forecasts) are scanned day by day for the first covered day.
+
+    Returns: Fractional days, inf where the cost is never covered within the curve
+    """
+    curve = np.asarray(reward_curve, dtype=float)
+    ratios = np.diff(curve)
+
+    def net(day):
+        return daily_gross * curve[day] - daily_power * day
+
+    if np.all(np.diff(ratios) <= 1e-12):
+        hi, reachable = _first_covered_day_declining(ratios, cost, daily_gross, daily_power, net)
+    else:
+        hi, reachable = _first_covered_day_scan(curve, cost, daily_gross, daily_power)
+
+    # Interpolate within the day the cost is covered
+    before = np.maximum(hi - 1, 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        step = net(hi) - net(before)
+        fraction = np.where(step > 0, (cost - net(before)) / step, 0.0)
+    days = np.where(hi > 0, before + np.clip(fraction, 0.0, 1.0), 0.0)
+    return np.where(reachable, days, np.inf)
+
+
+def _first_covered_day_declining(ratios, cost, daily_gross, daily_power, net):
+    """First covered day by bisection - ratios must be non-increasing"""
+    horizon = len(ratios)
+
+    # Last profitable day: ratios are non-increasing, so count days with gross * ratio > power
+    with np.errstate(divide="ignore", invalid="ignore"):
+        breakeven_ratio = np.where(daily_gross > 0, daily_power / daily_gross, np.inf)
+    peak = np.searchsorted(-ratios, -breakeven_ratio.ravel(), side="left").reshape(cost.shape)
+    reachable = net(peak) >= cost
+
+    lo = np.zeros(cost.shape, dtype=np.int64)
+    hi = peak.copy()
+    for _ in range(int(np.ceil(np.log2(horizon + 1))) + 1):
+        mid = (lo + hi) // 2
+        covered = net(mid) >= cost
+        hi = np.where(covered, mid, hi)
+        lo = np.where(covered, lo, mid + 1)
+    return hi, reachable
+
+
+def _first_covered_day_scan(curve, cost, daily_gross, daily_power):
+    """
+    First covered day of any non-decreasing cumulative curve
+
+    Days are checked in blocks. Within a block net is at most
+    gross * curve[block end] - power * block start, so only blocks where that
+    bound reaches the cost are scanned, earliest first.
+    """
+    shape = np.broadcast_shapes(cost.shape, daily_gross.shape, daily_power.shape)
+    cost, gross, power = (np.broadcast_to(a, shape).ravel() for a in (cost, daily_gross, daily_power))
+    last_day = len(curve) - 1
+    block_starts = np.arange(0, len(curve), ROI_SCAN_BLOCK_DAYS)
+    block_ends = np.minimum(block_starts + ROI_SCAN_BLOCK_DAYS - 1, last_day)
+    offsets = np.arange(ROI_SCAN_BLOCK_DAYS)
+
+    first = np.zeros(cost.size, dtype=np.int64)
+    reachable = np.zeros(cost.size, dtype=bool)
+    chunk = max(1, ROI_SCAN_CHUNK // len(block_starts))
+    for start in range(0, cost.size, chunk):
+        c, g, p = cost[start:start + chunk], gross[start:start + chunk], power[start:start + chunk]
+        candidate = g[:, None] * curve[block_ends] - p[:, None] * block_starts >= c[:, None]
+        block = np.argmax(candidate, axis=1)
+        active = np.flatnonzero(candidate.any(axis=1))
+        while active.size:
+            days = np.minimum(block_starts[block[active]][:, None] + offsets, last_day)
+            covered = g[active, None] * curve[days] - p[active, None] * days >= c[active, None]
+            found = covered.any(axis=1)
+            hit = active[found]
+            first[start + hit] = days[found, np.argmax(covered[found], axis=1)]
+            reachable[start + hit] = True
+
+            # Not in this block: move on to the next candidate block, if any
+            active = active[~found]
+            later = candidate[active] & (np.arange(len(block_starts)) > block[active, None])
+            block[active] = np.argmax(later, axis=1)
+            active = active[later.any(axis=1)]
+    return first.reshape(shape), reachable.reshape(shape)
+
+
+def grid_to_json(grid: Dict[str, np.ndarray], decimals: int = 2) -> Dict:
+    """
+    Convert a projection grid to JSON-safe nested lists
+
+    Non-finite ROI values (never pays back) become None.
+    """
+    result = {}
+    for name, values in grid.items():
+        rounded = np.round(values, 6 if name == "daily_coin" else decimals)
+        if name == "roi_days":
+            rounded = rounded.astype(object)
+            rounded[~np.isfinite(values)] = None
+        result[name] = rounded.tolist()
+    return result
+
+
+def scaling_table(daily_coin_per_miner: float, coin_price_gbp: float,
+                  miner_power_w: float, miner_cost_gbp: float,
+                  pool_fee_percent: float, miner_counts: Sequence[int],
+                  coin_key: str, coin_decimals: int,
+                  reward_curve: Optional[np.ndarray] = None) -> Dict:
+    """
+    Build the calculator's per-fleet-size scaling table (gross income, free power)
+
+    Returns: Dict of "<count>_miners" -> daily/monthly/yearly GBP, daily coin,
+    hardware cost and ROI days
+    """
+    grid = project_fleet(daily_coin_per_miner, coin_price_gbp, miner_power_w, miner_cost_gbp,
+                         miner_counts=miner_counts, pool_fees_percent=(pool_fee_percent,),
+                         reward_curve=reward_curve)
+    row = {name: values[0, 0, 0, 0] for name, values in grid.items()}
+
+    table = {}
+    for i, count in enumerate(miner_counts):
+        roi = row["roi_days"][i]
+        table[f"{count}_miners"] = {
+            "daily_gbp": round(float(row["daily_net_gbp"][i]), 2),
+            "monthly_gbp": round(float(row["monthly_net_gbp"][i]), 2),
+            "yearly_gbp": round(float(row["yearly_net_gbp"][i]), 2),
+            coin_key: round(float(row["daily_coin"][i]), coin_decimals),
+            "hardware_cost_gbp": round(float(row["hardware_cost_gbp"][i]), 2),
+            "roi_days": round(float(roi), 1) if np.isfinite(roi) else 0
+        }
+    return table
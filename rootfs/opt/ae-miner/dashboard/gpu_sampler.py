@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Streaming nvidia-smi GPU Sampler
+Keeps one `nvidia-smi --query-gpu=... --loop-ms=N` process running and
+parses its CSV output into a per-GPU ring buffer of recent samples, instead
+of paying nvidia-smi's driver initialisation on every status request.
+
+The process is restarted (with backoff) if it exits or goes silent. Set
+NVIDIA_SMI to another binary - e.g. dashboard/fake-nvidia-smi - to run on a
+machine without a GPU.
+"""
+
+import os
+import subprocess
+import threading
+import time
+from collections import deque
+
+# Configuration
+NVIDIA_SMI = os.environ.get("NVIDIA_SMI", "nvidia-smi")
+LOOP_MS = 1000              # nvidia-smi sampling period
+HISTORY_SAMPLES = 300       # Samples kept per GPU (5 minutes at 1s)
+STALE_AFTER_S = 10          # No output for this long: restart, and stop reporting old values
+RESTART_BACKOFF_S = (1, 2, 5, 10, 30)
+
+# (nvidia-smi field, sample key, parser)
+QUERY_FIELDS = (
+    ("index", "index", int),
+    ("name", "name", str),
+    ("temperature.gpu", "temperature", float),
+    ("power.draw", "power_draw", float),
+    ("utilization.gpu", "utilization", float),
+    ("memory.used", "memory_used", float),
+)
+
+
+def parse_value(raw, parser):
+    """Parse one CSV value; "[N/A]"/"[Not Supported]" become None"""
+    raw = raw.strip()
+    if not raw or raw.startswith("["):
+        return None
+    return parser(raw)
+
+
+class GpuSampler:
+    """Per-GPU ring buffers fed by a long-lived nvidia-smi process"""
+
+    def __init__(self, command=NVIDIA_SMI, loop_ms=LOOP_MS, history=HISTORY_SAMPLES):
+        self.command = command
+        self.loop_ms = loop_ms
+        self.history = history
+        self._samples = {}             # GPU index -> deque of sample dicts
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._process = None
+        self._last_output = 0.0
+        self.starts = 0
+        self.restarts = 0
+        self.parse_errors = 0
+        self.last_error = None
+
+    def command_line(self):
+        fields = ",".join(field for field, _, _ in QUERY_FIELDS)
+        return [self.command, f"--query-gpu={fields}", "--format=csv,noheader,nounits",
+                f"--loop-ms={self.loop_ms}"]
+
+    def _handle_line(self, line):
+        """Parse one CSV row into the ring buffer of its GPU"""
+        parts = line.split(",")
+        if len(parts) != len(QUERY_FIELDS):
+            # Not a sample row (driver error text etc)
+            if line.strip():
+                self._parse_error(line)
+            return
+        try:
+            sample = {key: parse_value(raw, parser)
+                      for (_, key, parser), raw in zip(QUERY_FIELDS, parts)}
+        except ValueError:
+            self._parse_error(line)
+            return
+        if sample["index"] is None:
+            return
+        sample["timestamp"] = time.time()
+
+        with self._lock:
+            ring = self._samples.get(sample["index"])
+            if ring is None:
+                ring = self._samples[sample["index"]] = deque(maxlen=self.history)
+            ring.append(sample)
+
+    def _parse_error(self, line):
+        with self._lock:
+            self.parse_errors += 1
+            self.last_error = line.strip()[:200]
+
+    def _set_error(self, error):
+        with self._lock:
+            self.last_error = error
+
+    def _read(self, process):
+        for line in process.stdout:
+            self._last_output = time.monotonic()
+            self._handle_line(line)
+
+    def _run_once(self):
+        """Run nvidia-smi until it exits, goes silent or we are stopped"""
+        process = subprocess.Popen(self.command_line(), stdout=subprocess.PIPE,
+                                   stderr=subprocess.STDOUT, text=True, bufsize=1)
+        self._last_output = time.monotonic()
+        with self._lock:
+            self._process = process
+            self.starts += 1
+        reader = threading.Thread(target=self._read, args=(process,),
+                                  name="gpu-sampler-reader", daemon=True)
+        reader.start()
+
+        while process.poll() is None and not self._stop.is_set():
+            if time.monotonic() - self._last_output > STALE_AFTER_S:
+                self._set_error(f"No output for {STALE_AFTER_S}s")
+                break
+            self._stop.wait(1)
+
+        if process.poll() is None:
+            process.kill()
+        elif process.returncode:
+            self._set_error(f"{self.command} exited with {process.returncode}")
+        process.wait()
+        reader.join(timeout=5)
+
+    def _run(self):
+        failures = 0
+        while not self._stop.is_set():
+            started = time.monotonic()
+            try:
+                self._run_once()
+            except OSError as e:
+                self._set_error(str(e))
+            if self._stop.is_set():
+                break
+
+            # Reset backoff after a run that lasted; keep backing off while it keeps failing
+            failures = 0 if time.monotonic() - started > STALE_AFTER_S * 3 else failures + 1
+            delay = RESTART_BACKOFF_S[min(failures, len(RESTART_BACKOFF_S)) - 1] if failures else 0
+            with self._lock:
+                self.restarts += 1
+            self._stop.wait(delay)
+
+    def start(self):
+        """Start sampling in the background"""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="gpu-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        with self._lock:
+            process = self._process
+        if process is not None and process.poll() is None:
+            process.kill()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        self._thread = None
+
+    def latest(self, max_age=STALE_AFTER_S):
+        """
+        Most recent sample of each GPU
+
+        Returns: Dict of GPU index -> sample; GPUs with no sample newer than
+        max_age seconds are left out
+        """
+        cutoff = time.time() - max_age
+        with self._lock:
+            return {index: ring[-1] for index, ring in self._samples.items()
+                    if ring and ring[-1]["timestamp"] >= cutoff}
+
+    def recent(self, index, seconds=60):
+        """Samples of one GPU from the last `seconds`, oldest first"""
+        cutoff = time.time() - seconds
+        with self._lock:
+            return [sample for sample in self._samples.get(index, ()) if sample["timestamp"] >= cutoff]
+
+    def stats(self):
+        with self._lock:
+            process = self._process
+            gpus = sorted(self._samples)
+            counters = {
+                "starts": self.starts,
+                "restarts": self.restarts,
+                "parse_errors": self.parse_errors,
+                "last_error": self.last_error
+            }
+        return {
+            "command": self.command,
+            "running": process is not None and process.poll() is None,
+            "gpus": gpus,
+            **counters
+        }
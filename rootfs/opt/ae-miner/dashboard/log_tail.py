@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Incremental Log Tail Follower
+Reads only the bytes appended to a log since the last call, so parsing cost
+tracks new output instead of the total log size.
+
+Remembers the byte offset and the file identity (device + inode) and
+handles rotation (a new file at the path - the rest of the old one is
+drained first) and truncation (copytruncate - restarts from offset 0).
+"""
+
+import os
+import threading
+
+# Configuration
+INITIAL_BACKLOG_BYTES = 64 * 1024   # On first open, start this far from the end (~last few hundred lines)
+MAX_READ_BYTES = 16 * 1024 * 1024   # Cap per call so a burst can't stall a request
+MAX_LINE_BYTES = 64 * 1024          # Partial line kept between calls is capped to this
+
+
+class LogTailer:
+    """Follows a growing (and rotating) log file line by line"""
+
+    def __init__(self, path, initial_backlog=INITIAL_BACKLOG_BYTES):
+        self.path = path
+        self.initial_backlog = initial_backlog
+        self._file = None
+        self._identity = None   # (st_dev, st_ino) of the open file
+        self._offset = 0
+        self._partial = b""
+        self._opened = False    # Only the very first open skips to the backlog
+        self._lock = threading.Lock()
+        self.rotations = 0
+        self.truncations = 0
+        self.bytes_read = 0
+
+    @property
+    def opened(self):
+        """False until the first read - that read returns backlog, not new output"""
+        return self._opened
+
+    def _open(self, from_start):
+        """Open the file at path; start at 0 or near the end (first open)"""
+        f = open(self.path, 'rb')
+        st = os.fstat(f.fileno())
+        self._file = f
+        self._opened = True
+        self._identity = (st.st_dev, st.st_ino)
+        self._partial = b""
+        if from_start or st.st_size <= self.initial_backlog:
+            self._offset = 0
+        else:
+            # Skip to the backlog and drop the partial first line
+            f.seek(st.st_size - self.initial_backlog)
+            f.readline()
+            self._offset = f.tell()
+        f.seek(self._offset)
+
+    def _close(self):
+        if self._file is not None:
+            self._file.close()
+        self._file = None
+        self._identity = None
+
+    def _read_available(self, limit):
+        """Read appended bytes from the open file and split complete lines"""
+        data = self._file.read(limit)
+        if not data:
+            return []
+        self._offset += len(data)
+        self.bytes_read += len(data)
+
+        chunks = (self._partial + data).split(b"\n")
+        self._partial = chunks.pop()[-MAX_LINE_BYTES:]  # Incomplete last line, finished next call
+        return [chunk.decode('utf-8', errors='replace').rstrip("\r") for chunk in chunks]
+
+    def read_new(self):
+        """
+        Complete lines appended since the last call
+
+        Returns: List of lines (without newlines); empty if nothing new or
+        the file does not exist
+        """
+        with self._lock:
+            try:
+                st = os.stat(self.path)
+            except OSError:
+                # Gone (mid-rotation): finish what was written, reopen when it reappears
+                lines = self._read_available(MAX_READ_BYTES) if self._file is not None else []
+                self._close()
+                return lines
+
+            lines = []
+            if self._file is None:
+                self._open(from_start=self._opened)
+            elif (st.st_dev, st.st_ino) != self._identity:
+                # Rotated: finish the old file, then follow the new one from the start
+                lines += self._read_available(MAX_READ_BYTES)
+                if self._partial:
+                    lines.append(self._partial.decode('utf-8', errors='replace'))
+                self._close()
+                self._open(from_start=True)
+                self.rotations += 1
+            elif st.st_size < self._offset:
+                # Truncated in place (copytruncate)
+                self._file.seek(0)
+                self._offset = 0
+                self._partial = b""
+                self.truncations += 1
+
+            lines += self._read_available(MAX_READ_BYTES)
+            return lines
+
+    def stats(self):
+        return {
+            "offset": self._offset,
+            "bytes_read": self.bytes_read,
+            "rotations": self.rotations,
+            "truncations": self.truncations
+        }
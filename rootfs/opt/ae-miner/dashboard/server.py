@@ -8,23 +8,40 @@ import json
 import os
 import subprocess
 import time
+from collections import deque
 from datetime import datetime
-from http.server import HTTPServer, SimpleHTTPRequestHandler
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
 from pathlib import Path
-import re
+
+from gpu_sampler import GpuSampler
+from log_tail import LogTailer
+from log_tokens import tokenize
+from share_stats import ShareAccumulator
+from telemetry import TelemetryCollector
 
 # Configuration
 CONFIG_FILE = "/opt/ae-miner/config.json"
 LOG_FILE = "/opt/ae-miner/logs/miner.log"
 DASHBOARD_DIR = os.path.dirname(os.path.abspath(__file__))
 
+LOG_DISPLAY_LINES = 15  # Relevant log lines shown on the dashboard
+
+# Sampling intervals (seconds) - /api/status serves the latest samples
+# (GPU readings stream from gpu_sampler every second)
+CONFIG_INTERVAL = 30
+SERVICE_INTERVAL = 5
+LOG_INTERVAL = 1
+
 # Global state
 start_time = time.time()
 stats = {
-    "shares_accepted": 0,
-    "shares_rejected": 0,
     "last_hashrate": 0.0
 }
+shares = ShareAccumulator()
+log_tailer = LogTailer(LOG_FILE)
+recent_logs = deque(maxlen=LOG_DISPLAY_LINES)
+collector = TelemetryCollector()
+gpu_sampler = GpuSampler()
 
 
 def load_config():
@@ -38,26 +55,16 @@ def load_config():
 
 
 def get_gpu_stats():
-    """Get GPU statistics using nvidia-smi"""
-    try:
-        cmd = [
-            "nvidia-smi",
-            "--query-gpu=name,temperature.gpu,power.draw,utilization.gpu",
-            "--format=csv,noheader,nounits"
-        ]
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=5)
-
-        if result.returncode == 0:
-            parts = result.stdout.strip().split(',')
-            if len(parts) >= 4:
-                return {
-                    "name": parts[0].strip(),
-                    "temperature": int(float(parts[1].strip())),
-                    "power_draw": int(float(parts[2].strip())),
-                    "utilization": int(float(parts[3].strip()))
-                }
-    except Exception as e:
-        print(f"Error getting GPU stats: {e}")
+    """Latest GPU statistics from the streaming nvidia-smi sampler"""
+    gpus = gpu_sampler.latest()
+    if gpus:
+        gpu = gpus[min(gpus)]
+        return {
+            "name": gpu["name"],
+            "temperature": int(gpu["temperature"] or 0),
+            "power_draw": int(gpu["power_draw"] or 0),
+            "utilization": int(gpu["utilization"] or 0)
+        }
 
     return {
         "name": "N/A",
@@ -82,55 +89,74 @@ def check_mining_status():
 
 
 def parse_log_file():
-    """Parse miner log file for statistics"""
-    logs = []
+    """Parse lines appended to the miner log since the last call"""
     hashrate = 0.0
 
     try:
-        if os.path.exists(LOG_FILE):
-            with open(LOG_FILE, 'r') as f:
-                # Read last 100 lines
-                lines = f.readlines()[-100:]
+        # The first read is backlog from before we started - shown, not counted
+        backlog = not log_tailer.opened
+
+        # Only new bytes are read - cost no longer grows with the log size
+        for line in log_tailer.read_new():
+            # One pass per line classifies speed, shares, temperature
+            event = tokenize(line.strip())
+            if event is None:
+                continue
+
+            # Extract hashrate (example: "Speed: 5.23 G/s")
+            if event.speed is not None:
+                hashrate = event.speed
+
+            # Count shares (each line is seen once)
+            if not backlog and event.accepted:
+                shares.record("accepted")
+            if not backlog and event.rejected:
+                shares.record("rejected")
+
+            # Add to log display
+            if event.relevant:
+                recent_logs.append(event.line[-200:])  # Limit line length
+
+        # Update global hashrate
+        if hashrate > 0:
+            stats["last_hashrate"] = hashrate
 
-                for line in lines:
-                    line = line.strip()
-
-                    # Extract hashrate (example: "Speed: 5.23 G/s")
-                    hashrate_match = re.search(r'Speed[:\s]+(\d+\.?\d*)\s*G', line, re.IGNORECASE)
-                    if hashrate_match:
-                        hashrate = float(hashrate_match.group(1))
-
-                    # Count accepted shares
-                    if re.search(r'accepted|share.+accepted', line, re.IGNORECASE):
-                        stats["shares_accepted"] += 1
+    except Exception as e:
+        print(f"Error parsing log file: {e}")
 
-                    # Count rejected shares
-                    if re.search(r'rejected|share.+rejected', line, re.IGNORECASE):
-                        stats["shares_rejected"] += 1
+    return list(recent_logs)  # Last 15 relevant log entries
 
-                    # Add to log display
-                    if any(keyword in line.lower() for keyword in
-                           ['speed', 'accepted', 'rejected', 'share', 'gpu', 'temp']):
-                        logs.append(line[-200:])  # Limit line length
 
-                # Update global hashrate
-                if hashrate > 0:
-                    stats["last_hashrate"] = hashrate
+def sample_miner_log():
+    """Parse new log output (feeds the share counters)"""
+    logs = parse_log_file()
+    return {
+        "logs": logs,
+        "hashrate": stats["last_hashrate"]
+    }
 
-    except Exception as e:
-        print(f"Error parsing log file: {e}")
 
-    return logs[-15:]  # Return last 15 relevant log entries
+def start_collector():
+    """Sample every status source in the background"""
+    collector.add_source("config", load_config, CONFIG_INTERVAL, default={})
+    collector.add_source("mining", check_mining_status, SERVICE_INTERVAL, default=False)
+    collector.add_source("miner_log", sample_miner_log, LOG_INTERVAL, default={
+        "logs": [],
+        "hashrate": 0.0
+    })
+    collector.start()
+    gpu_sampler.start()
 
 
 def get_status_data():
-    """Compile all status data for API"""
-    config = load_config()
-    is_mining = check_mining_status()
-    gpu_stats = get_gpu_stats()
-    logs = parse_log_file()
+    """Compile all status data for API from the latest collected samples"""
+    snapshot = collector.snapshot()
+    config = snapshot["config"]
+    is_mining = snapshot["mining"]
+    miner_log = snapshot["miner_log"]
 
     uptime = int(time.time() - start_time) if is_mining else 0
+    share_counts = shares.snapshot()  # In-memory ring buffers, no I/O
 
     data = {
         "mining": {
@@ -140,12 +166,15 @@ def get_status_data():
             "uptime": uptime
         },
         "performance": {
-            "hashrate": stats["last_hashrate"],
-            "shares_accepted": stats["shares_accepted"],
-            "shares_rejected": stats["shares_rejected"]
+            "hashrate": miner_log["hashrate"],
+            "shares_accepted": share_counts["lifetime"]["accepted"],
+            "shares_rejected": share_counts["lifetime"]["rejected"],
+            "reject_ratio": share_counts["lifetime"]["reject_ratio"],
+            "shares": share_counts["windows"]
         },
-        "gpu": gpu_stats,
-        "logs": logs,
+        "gpu": get_gpu_stats(),
+        "logs": miner_log["logs"],
+        "telemetry": dict(collector.stats(), gpu_sampler=gpu_sampler.stats()),
         "timestamp": datetime.now().isoformat()
     }
 
@@ -184,8 +213,11 @@ def main():
     config = load_config()
     port = config.get("dashboard", {}).get("port", 8080)
 
+    start_collector()
+
+    # Requests only read the snapshot; threads keep a slow client from blocking others
     server_address = ('', port)
-    httpd = HTTPServer(server_address, DashboardHandler)
+    httpd = ThreadingHTTPServer(server_address, DashboardHandler)
 
     print(f"A5000mine Dashboard Server")
     print(f"Listening on port {port}")
@@ -197,6 +229,8 @@ def main():
     except KeyboardInterrupt:
         print("\nShutting down server...")
         httpd.shutdown()
+        collector.stop()
+        gpu_sampler.stop()
 
 
 if __name__ == "__main__":
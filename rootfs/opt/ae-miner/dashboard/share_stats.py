@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Share Event Accumulator
+Counts accepted/rejected share events exactly once each, with lifetime
+totals and rolling 1m/15m/1h/24h windows held in fixed-size ring buffers.
+
+The 1m window uses 1-second buckets, longer windows 1-minute buckets, so
+memory is constant (60 + 1440 buckets per kind) however long the miner runs
+and a snapshot sums at most 1440 buckets.
+"""
+
+import math
+import threading
+import time
+
+# Configuration
+WINDOWS = {"1m": 60, "15m": 15 * 60, "1h": 3600, "24h": 86400}
+SHARE_KINDS = ("accepted", "rejected")
+
+
+class RingCounter:
+    """Event counts in a ring of fixed-width time buckets"""
+
+    def __init__(self, bucket_s, buckets):
+        self.bucket_s = bucket_s
+        self.counts = [0] * buckets
+        self.stamps = [-1] * buckets   # Absolute bucket number held in each slot
+
+    def add(self, ts, n=1):
+        bucket = int(ts // self.bucket_s)
+        i = bucket % len(self.counts)
+        if self.stamps[i] != bucket:
+            # Slot last held an older bucket - reuse it
+            self.stamps[i] = bucket
+            self.counts[i] = 0
+        self.counts[i] += n
+
+    def total(self, now, span_s):
+        """Events in the last span_s seconds (to bucket resolution)"""
+        newest = int(now // self.bucket_s)
+        oldest = newest - min(math.ceil(span_s / self.bucket_s), len(self.counts)) + 1
+        return sum(count for count, stamp in zip(self.counts, self.stamps)
+                   if oldest <= stamp <= newest)
+
+
+class ShareAccumulator:
+    """Lifetime and rolling-window share counts"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.lifetime = dict.fromkeys(SHARE_KINDS, 0)
+        self.started = time.time()
+        self._seconds = {kind: RingCounter(1, 60) for kind in SHARE_KINDS}
+        self._minutes = {kind: RingCounter(60, 1440) for kind in SHARE_KINDS}
+
+    def record(self, kind, ts=None):
+        """Record one share event ("accepted" or "rejected")"""
+        ts = time.time() if ts is None else ts
+        with self._lock:
+            self.lifetime[kind] += 1
+            self._seconds[kind].add(ts)
+            self._minutes[kind].add(ts)
+
+    def window(self, span_s, now=None):
+        """Counts, accept rate (shares/min) and reject ratio over the last span_s"""
+        now = time.time() if now is None else now
+        rings = self._seconds if span_s <= 60 else self._minutes
+        with self._lock:
+            counts = {kind: rings[kind].total(now, span_s) for kind in SHARE_KINDS}
+        # A young process hasn't been up for the whole window yet
+        minutes = max(min(span_s, now - self.started), 1) / 60
+        total = counts["accepted"] + counts["rejected"]
+        return {
+            "accepted": counts["accepted"],
+            "rejected": counts["rejected"],
+            "accept_rate_per_min": round(counts["accepted"] / minutes, 2),
+            "reject_ratio": round(counts["rejected"] / total, 4) if total else 0.0
+        }
+
+    def snapshot(self, now=None):
+        """Lifetime totals and every rolling window"""
+        now = time.time() if now is None else now
+        with self._lock:
+            lifetime = dict(self.lifetime)
+        total = lifetime["accepted"] + lifetime["rejected"]
+        lifetime["reject_ratio"] = round(lifetime["rejected"] / total, 4) if total else 0.0
+        return {
+            "lifetime": lifetime,
+            "windows": {name: self.window(span, now) for name, span in WINDOWS.items()}
+        }
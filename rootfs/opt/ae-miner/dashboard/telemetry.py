@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Background Telemetry Collector
+Samples each status source (config, service state, miner log) on its
+own interval into an in-memory snapshot, so /api/status only serialises the
+latest values instead of running subprocesses inside the request. GPU
+readings are not a source here: they stream from one long-lived nvidia-smi
+process in gpu_sampler.py, and server.py merges both into the status.
+
+Each source gets its own daemon thread - a slow systemctl call or config
+read delays only its own readings. A source that raises keeps its last
+good value and records the error, but once that value is older than a few
+intervals (failing or hung source) its default is reported instead.
+"""
+
+import threading
+import time
+
+# Configuration
+STALE_AFTER_INTERVALS = 3   # A value older than this many intervals is stale...
+MIN_STALE_AFTER_S = 10      # ...but never sooner than this (slow first sample, bursts)
+
+
+class TelemetrySource:
+    """One sampled value, refreshed every interval seconds"""
+
+    def __init__(self, name, sample, interval, default=None):
+        self.name = name
+        self.sample = sample
+        self.interval = interval
+        self.max_age = max(interval * STALE_AFTER_INTERVALS, MIN_STALE_AFTER_S)
+        self.default = default
+        self.value = default
+        self.updated = None        # time.time() of the last good sample
+        self.duration = 0.0        # Seconds the last sample took
+        self.error = None
+        self.samples = 0
+        self.errors = 0
+
+    def age(self, now):
+        return now - self.updated if self.updated else None
+
+    def stale(self, now):
+        """No good sample within max_age (a new source counts from its first sample)"""
+        return self.updated is not None and now - self.updated > self.max_age
+
+
+class TelemetryCollector:
+    """Runs every source in the background and holds the latest values"""
+
+    def __init__(self):
+        self._sources = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._threads = []
+
+    def add_source(self, name, sample, interval, default=None):
+        """Register sample() to be called every interval seconds"""
+        self._sources[name] = TelemetrySource(name, sample, interval, default)
+
+    def _sample(self, source):
+        started = time.monotonic()
+        try:
+            value = source.sample()
+        except Exception as e:
+            with self._lock:
+                source.duration = time.monotonic() - started
+                source.error = str(e)
+                source.errors += 1
+            print(f"Error sampling {source.name}: {e}")
+            return
+        with self._lock:
+            source.value = value
+            source.updated = time.time()
+            source.duration = time.monotonic() - started
+            source.error = None
+            source.samples += 1
+
+    def _run(self, source):
+        while not self._stop.is_set():
+            started = time.monotonic()
+            self._sample(source)
+            self._stop.wait(max(source.interval - (time.monotonic() - started), 0))
+
+    def start(self):
+        """Start one sampling thread per source"""
+        self._stop.clear()
+        for source in self._sources.values():
+            thread = threading.Thread(target=self._run, args=(source,),
+                                      name=f"telemetry-{source.name}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self):
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout=5)
+        self._threads = []
+
+    def snapshot(self):
+        """Latest value of every source (the default until its first sample or once stale)"""
+        now = time.time()
+        with self._lock:
+            return {name: source.default if source.stale(now) else source.value
+                    for name, source in self._sources.items()}
+
+    def stats(self):
+        """Age, staleness, sample time and error state per source"""
+        now = time.time()
+        with self._lock:
+            return {
+                name: {
+                    "interval": source.interval,
+                    "age": round(source.age(now), 1) if source.updated else None,
+                    "stale": source.stale(now),
+                    "duration_ms": round(source.duration * 1000, 1),
+                    "samples": source.samples,
+                    "errors": source.errors,
+                    "error": source.error
+                }
+                for name, source in self._sources.items()
+            }
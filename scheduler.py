@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Adaptive Background Refresh Scheduler
+Refreshes each upstream data source on its own cadence instead of re-running
+the whole calculator every second.
+
+- Each job has its own interval (price, network, block reward, ...)
+- Failing jobs back off exponentially, capped at max_backoff
+- Refreshing pauses when no client has polled recently, and resumes as soon
+  as one does
+- The on_change callback (recompute derived projections) only runs when a
+  job returned a value different from its previous one
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, List
+
+from fetch_engine import run_concurrently
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+DEFAULT_IDLE_PAUSE_S = 120   # Pause refreshing after this long without a client poll
+DEFAULT_MAX_BACKOFF_S = 600  # Longest delay between retries of a failing source
+
+
+# ============================================================================
+# Refresh Jobs
+# ============================================================================
+
+class RefreshJob:
+    """One data source refreshed on its own interval"""
+
+    def __init__(self, name: str, fn: Callable[[], Any], interval: float,
+                 max_backoff: float = DEFAULT_MAX_BACKOFF_S):
+        self.name = name
+        self.fn = fn                # Returns the new value, or None on failure
+        self.interval = interval
+        self.max_backoff = max_backoff
+        self.next_run = 0.0         # Due immediately
+        self.failures = 0
+        self.last_value = None
+        self.last_success = None    # time.monotonic() of last successful run
+
+    def record(self, value: Any, now: float) -> bool:
+        """
+        Record a run result and schedule the next run
+
+        Returns: True if the job produced a new, different value
+        """
+        if value is None:
+            self.failures += 1
+            self.next_run = now + min(self.interval * (2 ** self.failures), self.max_backoff)
+            return False
+
+        self.failures = 0
+        self.next_run = now + self.interval
+        self.last_success = now
+        changed = value != self.last_value
+        self.last_value = value
+        return changed
+
+
+# ============================================================================
+# Scheduler
+# ============================================================================
+
+class RefreshScheduler:
+    """Runs due refresh jobs concurrently and recomputes only on input changes"""
+
+    def __init__(self, jobs: List[RefreshJob], on_change: Callable[[], None],
+                 idle_pause: float = DEFAULT_IDLE_PAUSE_S):
+        self.jobs = {job.name: job for job in jobs}
+        self.on_change = on_change
+        self.idle_pause = idle_pause
+        self.last_client_poll = time.monotonic()
+        self.recomputes = 0
+        self._wake = threading.Event()
+
+    def record_client_poll(self):
+        """Note client activity; wakes the scheduler if it was paused"""
+        was_idle = self.is_idle()
+        self.last_client_poll = time.monotonic()
+        if was_idle:
+            self._wake.set()
+
+    def is_idle(self) -> bool:
+        return time.monotonic() - self.last_client_poll > self.idle_pause
+
+    def run_due_jobs(self) -> bool:
+        """
+        Run every job that is due, concurrently
+
+        Returns: True if any job's value changed
+        """
+        now = time.monotonic()
+        due = [job for job in self.jobs.values() if job.next_run <= now]
+        if not due:
+            return False
+
+        results = run_concurrently({job.name: job.fn for job in due})
+        now = time.monotonic()
+        changed = False
+        for job in due:
+            if job.record(results.get(job.name), now):
+                changed = True
+        return changed
+
+    def refresh_now(self):
+        """Run every job immediately and recompute, regardless of changes"""
+        for job in self.jobs.values():
+            job.next_run = 0.0
+        self.run_due_jobs()
+        self.recomputes += 1
+        self.on_change()
+
+    def seconds_until_next_job(self) -> float:
+        now = time.monotonic()
+        return max(0.0, min(job.next_run for job in self.jobs.values()) - now)
+
+    def run_forever(self):
+        """Scheduler loop (run in a daemon thread)"""
+        while True:
+            if self.is_idle():
+                # Nobody is watching - sleep until a client polls again
+                self._wake.wait()
+                self._wake.clear()
+                continue
+
+            try:
+                if self.run_due_jobs():
+                    self.recomputes += 1
+                    self.on_change()
+            except Exception as e:
+                print(f"Error in refresh scheduler: {e}")
+
+            self._wake.wait(timeout=max(self.seconds_until_next_job(), 0.1))
+            self._wake.clear()
+
+    def stats(self) -> Dict:
+        """
+        Scheduler state per job
+
+        Returns: Dict with idle flag, recompute count and per-job interval/backoff state
+        """
+        now = time.monotonic()
+        return {
+            "idle": self.is_idle(),
+            "recomputes": self.recomputes,
+            "jobs": {
+                name: {
+                    "interval_s": job.interval,
+                    "failures": job.failures,
+                    "next_run_in_s": round(max(0.0, job.next_run - now), 1),
+                    "last_success_age_s": round(now - job.last_success, 1) if job.last_success else None
+                }
+                for name, job in self.jobs.items()
+            }
+        }
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+Monte Carlo Mining Profitability Simulator
+Replaces the single deterministic daily-income estimate with a distribution:
+each trial simulates a fleet day by day with
+
+- Poisson block finding (luck) at the fleet's share of network hashrate
+- Network hashrate drifting as a geometric random walk (growth + volatility)
+- Coin price drifting as a geometric random walk
+- Optionally, a scheduled block reward decline (emission.py daily_ratios)
+
+Trials are vectorised with NumPy in batches and spread across a process
+pool, so hundreds of thousands of trials finish in seconds on a multi-core box.
+The web app shares one long-lived spawn-context pool (simulation_pool) and
+caps trials and concurrent runs, so requests never fork the threaded server.
+
+Used by:
+- calculator.py --simulate
+- app.py /api/simulate
+"""
+
+import math
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+DEFAULT_TRIALS = 100_000
+DEFAULT_DAYS = 365
+MAX_TRIALS = 1_000_000
+MAX_DAYS = 5 * 365
+
+# Web API limits (the CLI may use up to MAX_TRIALS)
+MAX_API_TRIALS = 200_000
+MAX_CONCURRENT_SIMULATIONS = 2   # Further requests wait for a slot
+SIMULATION_QUEUE_WAIT_S = 30     # ...for this long, then get "busy"
+
+BATCH_TRIALS = 5_000          # Trials per vectorised batch (~15 MB per array at 365 days)
+CHECKPOINT_EVERY_DAYS = 7     # Resolution of the cumulative income bands
+ROI_HISTOGRAM_BIN_DAYS = 30
+PERCENTILES = (5, 25, 50, 75, 95)
+
+# Scenario defaults (annualised)
+DEFAULT_PRICE_DRIFT = 0.0       # No expected price trend
+DEFAULT_PRICE_VOL = 0.8         # Typical altcoin volatility
+DEFAULT_HASHRATE_GROWTH = 0.5   # Network hashrate +50%/year
+DEFAULT_HASHRATE_VOL = 0.3
+
+
+# ============================================================================
+# Simulation Worker
+# ============================================================================
+
+def _simulate_chunk(params: Dict, trials: int, seed: np.random.SeedSequence) -> Dict:
+    """
+    Simulate one chunk of trials (runs in a worker process)
+
+    Returns: Dict of per-trial arrays - total_coin, total_gbp, roi_day
+    (-1 = never) and checkpoints (cumulative net GBP every CHECKPOINT_EVERY_DAYS)
+    """
+    rng = np.random.default_rng(seed)
+    days = params["days"]
+    checkpoint_idx = np.arange(CHECKPOINT_EVERY_DAYS - 1, days, CHECKPOINT_EVERY_DAYS)
+
+    # Daily log-drift and volatility of the two random walks
+    mu_h = math.log1p(params["hashrate_growth_annual"]) / 365
+    sigma_h = params["hashrate_vol_annual"] / math.sqrt(365)
+    mu_p = math.log1p(params["price_drift_annual"]) / 365
+    sigma_p = params["price_vol_annual"] / math.sqrt(365)
+
+    fee_multiplier = 1 - params["pool_fee_percent"] / 100
+    daily_power_gbp = params["power_w"] / 1000 * 24 * params["tariff_gbp_kwh"]
+    hardware_cost = params["cost_gbp"]
+    reward_ratios = params.get("reward_ratios")
+
+    results = {"total_coin": [], "total_gbp": [], "roi_day": [], "checkpoints": []}
+    remaining = trials
+    while remaining > 0:
+        n = min(BATCH_TRIALS, remaining)
+        remaining -= n
+
+        hashrate_mult = np.exp(np.cumsum(
+            rng.normal(mu_h - sigma_h ** 2 / 2, sigma_h, (n, days)), axis=1))
+        price = params["price_gbp"] * np.exp(np.cumsum(
+            rng.normal(mu_p - sigma_p ** 2 / 2, sigma_p, (n, days)), axis=1))
+
+        # Blocks found per day: Poisson around the (shrinking) expected share
+        blocks = rng.poisson(params["expected_blocks_per_day"] / hashrate_mult)
+        coins = blocks * (params["block_reward"] * fee_multiplier)
+        if reward_ratios is not None:
+            coins = coins * reward_ratios
+        cumulative = np.cumsum(coins * price - daily_power_gbp, axis=1)
+
+        paid_back = cumulative >= hardware_cost
+        roi_day = np.where(paid_back.any(axis=1), paid_back.argmax(axis=1) + 1, -1)
+
+        results["total_coin"].append(coins.sum(axis=1))
+        results["total_gbp"].append(cumulative[:, -1])
+        results["roi_day"].append(roi_day)
+        results["checkpoints"].append(cumulative[:, checkpoint_idx].astype(np.float32))
+
+    return {name: np.concatenate(parts) for name, parts in results.items()}
+
+
+# ============================================================================
+# Simulation Runner
+# ============================================================================
+
+def _percentiles(values: np.ndarray, decimals: int = 2) -> Dict:
+    bands = np.percentile(values, PERCENTILES)
+    summary = {f"p{p}": round(float(v), decimals) for p, v in zip(PERCENTILES, bands)}
+    summary["mean"] = round(float(values.mean()), decimals)
+    return summary
+
+
+def run_simulation(
+    expected_blocks_per_day: float,
+    block_reward: float,
+    price_gbp: float,
+    cost_gbp: float,
+    power_w: float = 0.0,
+    days: int = DEFAULT_DAYS,
+    trials: int = DEFAULT_TRIALS,
+    pool_fee_percent: float = 0.0,
+    tariff_gbp_kwh: float = 0.0,
+    price_drift_annual: float = DEFAULT_PRICE_DRIFT,
+    price_vol_annual: float = DEFAULT_PRICE_VOL,
+    hashrate_growth_annual: float = DEFAULT_HASHRATE_GROWTH,
+    hashrate_vol_annual: float = DEFAULT_HASHRATE_VOL,
+    reward_ratios: Optional[Sequence[float]] = None,
+    workers: Optional[int] = None,
+    seed: Optional[int] = None,
+    pool: Optional[Executor] = None
+) -> Dict:
+    """
+    Run a Monte Carlo profitability simulation for a fleet
+
+    Args:
+        expected_blocks_per_day: Blocks the whole fleet finds per day at today's network hashrate
+        block_reward: Coins per block
+        price_gbp: Current coin price in GBP
+        cost_gbp: Hardware cost of the whole fleet
+        power_w: Power draw of the whole fleet
+        days: Simulation horizon
+        trials: Number of simulated futures
+        pool_fee_percent: Pool fee (0-100)
+        tariff_gbp_kwh: Electricity tariff in GBP per kWh
+        price_drift_annual / price_vol_annual: Price random walk (e.g. 0.0 / 0.8)
+        hashrate_growth_annual / hashrate_vol_annual: Network hashrate random walk
+        reward_ratios: Block reward for each day relative to today (None = constant)
+        workers: Worker processes (default: all CPUs)
+        seed: Seed for reproducible runs
+        pool: Existing executor to run chunks on (default: a pool per call)
+
+    Returns:
+        Dict with payout percentiles (coin and GBP), cumulative net income
+        percentile bands over time, and a time-to-ROI histogram
+    """
+    if not 1 <= trials <= MAX_TRIALS:
+        raise ValueError(f"trials must be between 1 and {MAX_TRIALS}")
+    if not 1 <= days <= MAX_DAYS:
+        raise ValueError(f"days must be between 1 and {MAX_DAYS}")
+
+    params = {
+        "expected_blocks_per_day": expected_blocks_per_day,
+        "block_reward": block_reward,
+        "price_gbp": price_gbp,
+        "cost_gbp": cost_gbp,
+        "power_w": power_w,
+        "days": days,
+        "pool_fee_percent": pool_fee_percent,
+        "tariff_gbp_kwh": tariff_gbp_kwh,
+        "price_drift_annual": price_drift_annual,
+        "price_vol_annual": price_vol_annual,
+        "hashrate_growth_annual": hashrate_growth_annual,
+        "hashrate_vol_annual": hashrate_vol_annual,
+    }
+
+    if reward_ratios is not None:
+        if len(reward_ratios) < days:
+            raise ValueError("reward_ratios must cover every simulated day")
+        params["reward_ratios"] = np.asarray(reward_ratios[:days], dtype=float)
+
+    start = time.monotonic()
+    workers = max(1, min(workers or os.cpu_count() or 1, math.ceil(trials / BATCH_TRIALS)))
+
+    # Independent random streams per chunk, reproducible from one seed
+    chunk_sizes = [trials // workers + (1 if i < trials % workers else 0) for i in range(workers)]
+    seeds = np.random.SeedSequence(seed).spawn(workers)
+
+    if pool is not None:
+        chunks = list(pool.map(_simulate_chunk, [params] * workers, chunk_sizes, seeds))
+    elif workers == 1:
+        chunks = [_simulate_chunk(params, chunk_sizes[0], seeds[0])]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            chunks = list(pool.map(_simulate_chunk, [params] * workers, chunk_sizes, seeds))
+
+    total_coin = np.concatenate([c["total_coin"] for c in chunks])
+    total_gbp = np.concatenate([c["total_gbp"] for c in chunks])
+    roi_day = np.concatenate([c["roi_day"] for c in chunks])
+    checkpoints = np.concatenate([c["checkpoints"] for c in chunks])
+
+    # Cumulative net income bands over time
+    bands = np.percentile(checkpoints, PERCENTILES, axis=0)
+    cumulative_bands = {"day": list(range(CHECKPOINT_EVERY_DAYS, days + 1, CHECKPOINT_EVERY_DAYS))}
+    for p, band in zip(PERCENTILES, bands):
+        cumulative_bands[f"p{p}"] = [round(float(v), 2) for v in band]
+
+    # Time-to-ROI histogram
+    paid_back = roi_day[roi_day > 0]
+    edges = np.arange(0, days + ROI_HISTOGRAM_BIN_DAYS, ROI_HISTOGRAM_BIN_DAYS)
+    counts, _ = np.histogram(paid_back, bins=edges)
+
+    return {
+        "trials": trials,
+        "days": days,
+        "workers": workers,
+        "elapsed_s": round(time.monotonic() - start, 2),
+        "inputs": dict(
+            {name: value for name, value in params.items() if name != "reward_ratios"},
+            reward_schedule=reward_ratios is not None),
+        "payout_coin": _percentiles(total_coin, 4),
+        "net_gbp": _percentiles(total_gbp),
+        "cumulative_net_gbp": cumulative_bands,
+        "roi": {
+            "probability_within_horizon": round(len(paid_back) / trials, 4),
+            "median_days": float(np.median(paid_back)) if len(paid_back) else None,
+            "histogram": {
+                "bin_edges_days": edges.tolist(),
+                "counts": counts.tolist(),
+                "never": int(trials - len(paid_back))
+            }
+        }
+    }
+
+
+# ============================================================================
+# Shared Pool (web app)
+# ============================================================================
+
+class SimulationPool:
+    """
+    One long-lived worker pool shared by every /api/simulate request
+
+    Workers are started with the spawn method: forking the multithreaded
+    web server could copy a lock held by another thread into the child.
+    """
+
+    def __init__(self, workers: Optional[int] = None,
+                 max_concurrent: int = MAX_CONCURRENT_SIMULATIONS):
+        self.workers = workers or os.cpu_count() or 1
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def executor(self) -> ProcessPoolExecutor:
+        """The shared pool, started on first use"""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"))
+            return self._executor
+
+    def run(self, wait_s: float = SIMULATION_QUEUE_WAIT_S, **kwargs) -> Optional[Dict]:
+        """
+        run_simulation on the shared pool, at most MAX_API_TRIALS trials
+
+        Returns: Simulation summary, or None if no slot freed up within wait_s
+        """
+        trials = kwargs.get("trials", DEFAULT_TRIALS)
+        if not 1 <= trials <= MAX_API_TRIALS:
+            raise ValueError(f"trials must be between 1 and {MAX_API_TRIALS}")
+        if not self._slots.acquire(timeout=wait_s):
+            return None
+        try:
+            executor = self.executor()
+            try:
+                return run_simulation(workers=self.workers, pool=executor, **kwargs)
+            except BrokenProcessPool:
+                # A worker died (e.g. OOM killed) - start a fresh pool next time
+                self._discard(executor)
+                raise
+        finally:
+            self._slots.release()
+
+    def _discard(self, executor: ProcessPoolExecutor):
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Shared by every /api/simulate request of the process
+simulation_pool = SimulationPool()
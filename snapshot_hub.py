@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Cross-Process Snapshot Hub
+Shares calculator results from the single refresher process with every
+WSGI worker over a local Unix socket, so scaling request handling across
+cores never multiplies upstream API calls.
+
+Protocol: newline-delimited JSON over a Unix stream socket.
+- Hub -> worker: {"op": "publish", "payload": {...}} - the latest payload is
+  sent on connect, then every new one as it is published
+- Worker -> hub: {"op": "refresh"} (forced refresh from /api/refresh) and
+  {"op": "poll"} (client activity, keeps the refresh scheduler awake)
+
+Workers reconnect with backoff, so the refresher can restart independently.
+
+Used by:
+- wsgi.py: refresher process (SnapshotHub) and gunicorn workers (SnapshotSubscriber)
+- app.py: publish_results() pushes to the hub, workers apply what they receive
+"""
+
+import json
+import os
+import socket
+import socketserver
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+DEFAULT_SOCKET_PATH = os.environ.get("SNAPSHOT_SOCKET", "/tmp/kaspamine-snapshots.sock")
+
+RECONNECT_MIN_S = 0.5        # Worker reconnect backoff, doubling up to RECONNECT_MAX_S
+RECONNECT_MAX_S = 10.0
+POLL_FORWARD_S = 5.0         # Forward client activity to the hub at most this often
+
+
+def _encode(message: Dict) -> bytes:
+    return json.dumps(message, separators=(",", ":")).encode() + b"\n"
+
+
+# ============================================================================
+# Hub (refresher process)
+# ============================================================================
+
+class SnapshotHub:
+    """Unix socket server broadcasting published payloads to worker processes"""
+
+    def __init__(self, path: str = DEFAULT_SOCKET_PATH,
+                 on_refresh: Optional[Callable[[], None]] = None,
+                 on_poll: Optional[Callable[[], None]] = None):
+        self.path = path
+        self.on_refresh = on_refresh
+        self.on_poll = on_poll
+        self._lock = threading.Lock()
+        self._connections = {}       # socket -> send lock
+        self._latest = None          # Encoded last publish, sent to new subscribers
+        self._server = None
+        self.stats = {"published": 0, "subscribers": 0, "refresh_requests": 0}
+
+    def start(self):
+        """Bind the socket and serve subscribers in a daemon thread"""
+        if os.path.exists(self.path):
+            os.unlink(self.path)  # Stale socket from a previous refresher
+        hub = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                hub._subscribe(self.connection)
+                try:
+                    for line in self.rfile:
+                        hub._command(line)
+                finally:
+                    hub._unsubscribe(self.connection)
+
+        self._server = socketserver.ThreadingUnixStreamServer(self.path, Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+    def publish(self, payload: Dict):
+        """Send a payload to every worker (and to workers that connect later)"""
+        line = _encode({"op": "publish", "payload": payload})
+        with self._lock:
+            self._latest = line
+            self.stats["published"] += 1
+            connections = list(self._connections.items())
+        for conn, send_lock in connections:
+            self._send(conn, send_lock, line)
+
+    def _send(self, conn: socket.socket, send_lock: threading.Lock, line: bytes):
+        try:
+            with send_lock:
+                conn.sendall(line)
+        except OSError:
+            self._unsubscribe(conn)  # Worker went away; it reconnects if still alive
+
+    def _subscribe(self, conn: socket.socket):
+        send_lock = threading.Lock()
+        with self._lock:
+            self._connections[conn] = send_lock
+            self.stats["subscribers"] = len(self._connections)
+            latest = self._latest
+        if latest is not None:
+            self._send(conn, send_lock, latest)
+
+    def _unsubscribe(self, conn: socket.socket):
+        with self._lock:
+            self._connections.pop(conn, None)
+            self.stats["subscribers"] = len(self._connections)
+
+    def _command(self, line: bytes):
+        try:
+            op = json.loads(line).get("op")
+        except ValueError:
+            return
+        if op == "refresh" and self.on_refresh:
+            with self._lock:
+                self.stats["refresh_requests"] += 1
+            # Off the connection thread - a refresh takes seconds
+            threading.Thread(target=self.on_refresh, daemon=True).start()
+        elif op == "poll" and self.on_poll:
+            self.on_poll()
+
+
+# ============================================================================
+# Subscriber (WSGI worker processes)
+# ============================================================================
+
+class SnapshotSubscriber:
+    """Follows the hub from a worker process, calling on_publish for each payload"""
+
+    def __init__(self, on_publish: Callable[[Dict], None], path: str = DEFAULT_SOCKET_PATH):
+        self.on_publish = on_publish
+        self.path = path
+        self._sock = None
+        self._send_lock = threading.Lock()
+        self._last_poll_forward = 0.0
+        self._thread = None
+        self.stats = {"received": 0, "connects": 0, "connected": False}
+
+    def start(self):
+        """Follow the hub in a daemon thread (once per process)"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        backoff = RECONNECT_MIN_S
+        while True:
+            try:
+                sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                sock.connect(self.path)
+            except OSError:
+                time.sleep(backoff)
+                backoff = min(backoff * 2, RECONNECT_MAX_S)
+                continue
+
+            backoff = RECONNECT_MIN_S
+            self._sock = sock
+            self.stats["connects"] += 1
+            self.stats["connected"] = True
+            try:
+                for line in sock.makefile("rb"):
+                    message = json.loads(line)
+                    if message.get("op") == "publish":
+                        self.stats["received"] += 1
+                        try:
+                            self.on_publish(message["payload"])
+                        except Exception as e:
+                            print(f"Error applying published snapshot: {e}")
+            except (OSError, ValueError) as e:
+                print(f"Snapshot hub connection lost: {e}")
+            finally:
+                self._sock = None
+                self.stats["connected"] = False
+                sock.close()
+            time.sleep(RECONNECT_MIN_S)
+
+    def _send(self, op: str) -> bool:
+        sock = self._sock
+        if sock is None:
+            return False
+        try:
+            with self._send_lock:
+                sock.sendall(_encode({"op": op}))
+            return True
+        except OSError:
+            return False
+
+    def request_refresh(self) -> bool:
+        """Ask the refresher to refetch every source now"""
+        return self._send("refresh")
+
+    def record_client_poll(self):
+        """Forward client activity to the refresher, at most every POLL_FORWARD_S"""
+        now = time.monotonic()
+        if now - self._last_poll_forward >= POLL_FORWARD_S:
+            self._last_poll_forward = now
+            self._send("poll")
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Precomputed Calculator Snapshots
+Holds the latest published calculator result for each coin selection
+(kaspa, zcash, both) so request handlers serve from memory and never
+block on upstream APIs.
+
+The background worker publishes; request threads only read. Published
+snapshots are treated as immutable - publish a new dict instead of
+modifying one in place.
+
+Each snapshot is serialised to JSON once at publish time, with a content
+hash ETag and gzip (and brotli, if installed) precompressed variants, so
+serving a poll costs no JSON encoding or compression.
+"""
+
+import gzip
+import hashlib
+import json
+import threading
+from typing import Dict, Optional, Tuple
+
+try:
+    import brotli  # Optional: pip install brotli
+except ImportError:
+    brotli = None
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+
+def encode_snapshot(snapshot: Dict) -> Dict:
+    """
+    Serialise a snapshot once for serving
+
+    Returns:
+        Dict with "body" (JSON bytes), "etag" (content hash) and a
+        precompressed body per content-coding ("gzip", optionally "br")
+    """
+    body = json.dumps(snapshot, sort_keys=True, separators=(",", ":")).encode()
+    encoded = {
+        "body": body,
+        "etag": hashlib.blake2b(body, digest_size=12).hexdigest(),
+        "gzip": gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+    }
+    if brotli is not None:
+        encoded["br"] = brotli.compress(body, quality=BROTLI_QUALITY)
+    return encoded
+
+
+# ============================================================================
+# Snapshot Store
+# ============================================================================
+
+class SnapshotStore:
+    """Thread-safe store of the latest snapshot per selection"""
+
+    def __init__(self, selections=("kaspa", "zcash", "both")):
+        self.selections = tuple(selections)
+        self._snapshots = {}                     # selection -> dict
+        self._encoded = {}                       # selection -> encode_snapshot() result
+        self._versions = {s: 0 for s in self.selections}
+        self._changed = threading.Condition()
+
+    def publish(self, selection: str, snapshot: Dict):
+        """Publish a new snapshot for a selection and wake any waiters"""
+        encoded = encode_snapshot(snapshot)  # Outside the lock - readers never wait on it
+        with self._changed:
+            self._snapshots[selection] = snapshot
+            self._encoded[selection] = encoded
+            self._versions[selection] += 1
+            self._changed.notify_all()
+
+    def get(self, selection: str) -> Optional[Dict]:
+        """Get the latest snapshot for a selection (None if not yet published)"""
+        return self._snapshots.get(selection)
+
+    def get_encoded(self, selection: str) -> Optional[Dict]:
+        """Get the pre-serialised latest snapshot (see encode_snapshot)"""
+        return self._encoded.get(selection)
+
+    def version(self, selection: str) -> int:
+        """Publication counter for a selection (0 = never published)"""
+        return self._versions.get(selection, 0)
+
+    def wait_for(self, selection: str, after_version: int = 0,
+                 timeout: Optional[float] = None) -> Tuple[Optional[Dict], int]:
+        """
+        Block until a snapshot newer than after_version is published
+
+        Returns: (latest snapshot, its version), or (None, after_version)
+        if the timeout passed first
+        """
+        with self._changed:
+            self._changed.wait_for(lambda: self._versions.get(selection, 0) > after_version,
+                                   timeout=timeout)
+            version = self._versions.get(selection, 0)
+            if version > after_version:
+                return self._snapshots.get(selection), version
+            return None, after_version
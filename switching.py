@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Profit-Switching Decision Engine
+Ranks every (hardware, coin, pool) combination by net GBP/day and
+recommends a pool for each miner listed in operations/<coin>/config.json.
+
+- Inputs are the calculator results app.py has just published, so an
+  evaluation is plain arithmetic over cached values and runs in well under
+  a millisecond after each data refresh - nothing is fetched here
+- Net GBP/day = daily coin x (1 - pool fee) x price - electricity cost at
+  the default tariff (energy.py)
+- Hysteresis: a miner only moves when the best option beats its current
+  assignment by SWITCH_MARGIN_PERCENT and SWITCH_MARGIN_GBP_DAY, and it has
+  held the current assignment for MIN_DWELL_S, so noisy price and hashrate
+  readings don't make it flap between near-equal pools
+
+Used by:
+- app.py: evaluated on every published refresh, served at /api/switching
+"""
+
+import glob
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+from coins import COINS, CoinAdapter
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+OPERATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "operations")
+
+SWITCH_MARGIN_PERCENT = 2.0    # Challenger must beat the current net GBP/day by 2%...
+SWITCH_MARGIN_GBP_DAY = 0.05   # ...and by at least 5p/day
+MIN_DWELL_S = 30 * 60          # Hold an assignment at least 30 minutes between switches
+
+
+# ============================================================================
+# Operations Config
+# ============================================================================
+
+def _pool_fee(adapter: CoinAdapter, pool: Dict) -> float:
+    """
+    Pool fee percent from the config, else from the adapter's fee tier for
+    the same pool, else the adapter's highest tier (never assume a pool is free)
+    """
+    for key in ("fee_percent", "fee"):
+        if key in pool:
+            return float(pool[key])
+    host = urlparse(pool.get("url", "")).hostname or ""
+    for tier, fee in adapter.fee_tiers.items():
+        if tier.split("_")[0] in host:
+            return fee
+    return max(adapter.fee_tiers.values())
+
+
+def load_operations(operations_dir: str = OPERATIONS_DIR) -> List[Dict]:
+    """
+    Read the miners and pools of every operation whose coin is registered
+
+    Returns: List of operations with coin, hardware, pools [{slot, name,
+    url, fee_percent}] and miners [{name, hardware}]
+    """
+    operations = []
+    for path in sorted(glob.glob(os.path.join(operations_dir, "*", "config.json"))):
+        try:
+            with open(path) as f:
+                config = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Could not load {path}: {e}")
+            continue
+
+        adapter = COINS.get(config.get("operation"))
+        if adapter is None:
+            continue
+
+        hardware = config.get("miner_model") or config.get("gpu_model") or adapter.miner.model
+        pools = []
+        for slot, pool in config.get("pool", {}).items():
+            url = pool.get("url", "")
+            pools.append({
+                "slot": slot,
+                "name": pool.get("name") or urlparse(url).hostname or slot,
+                "url": url,
+                "fee_percent": _pool_fee(adapter, pool)
+            })
+
+        miners = config.get("miners") or []
+        if not miners and config.get("worker_name"):
+            miners = [{"name": config["worker_name"]}]  # Single-rig GPU operations
+
+        operations.append({
+            "coin": adapter.key,
+            "hardware": hardware,
+            "pools": pools,
+            "miners": [{"name": miner["name"], "hardware": miner.get("miner_model", hardware)}
+                       for miner in miners if miner.get("name")]
+        })
+    return operations
+
+
+# ============================================================================
+# Decision Engine
+# ============================================================================
+
+class ProfitSwitcher:
+    """Ranks coin/pool options per miner and holds assignments with hysteresis"""
+
+    def __init__(self, operations: Optional[List[Dict]] = None,
+                 margin_percent: float = SWITCH_MARGIN_PERCENT,
+                 margin_gbp_day: float = SWITCH_MARGIN_GBP_DAY,
+                 min_dwell_s: float = MIN_DWELL_S):
+        self.operations = load_operations() if operations is None else operations
+        self.margin_percent = margin_percent
+        self.margin_gbp_day = margin_gbp_day
+        self.min_dwell_s = min_dwell_s
+        self._lock = threading.Lock()
+        self.assignments = {}   # Miner name -> {coin, pool, url, since}
+        self.last_evaluation = None
+
+        # Pools per coin, from every operation that mines it
+        self.pools = {}
+        for operation in self.operations:
+            self.pools.setdefault(operation["coin"], []).extend(operation["pools"])
+
+    def combinations(self, results: Dict) -> List[Dict]:
+        """
+        Net GBP/day of every (hardware, coin, pool) combination with live data
+
+        Returns: List sorted best first
+        """
+        combos = []
+        for coin, pools in self.pools.items():
+            data = results.get(coin)
+            if not data:
+                continue
+            adapter = COINS[coin]
+            price = data["market"][adapter.price_key()]
+            gross = adapter.daily_coin(data["network"]) * price
+            net_profit = data.get("net_profit", {})
+            tariff = net_profit.get("tariffs", {}).get(net_profit.get("default_tariff"), {})
+            power = tariff.get("daily_cost_gbp", 0.0)
+
+            for pool in pools:
+                fee = pool["fee_percent"]
+                combos.append({
+                    "hardware": adapter.miner.model,
+                    "coin": coin,
+                    "pool": pool["name"],
+                    "url": pool["url"],
+                    "fee_percent": fee,
+                    "gross_gbp_day": round(gross * (1 - fee / 100), 4),
+                    "power_gbp_day": power,
+                    "net_gbp_day": round(gross * (1 - fee / 100) - power, 4)
+                })
+        combos.sort(key=lambda combo: combo["net_gbp_day"], reverse=True)
+        return combos
+
+    def _should_switch(self, current: Dict, challenger: Dict, current_net: Optional[float], now: float) -> bool:
+        if current_net is None:
+            return True  # Current pool no longer listed or its coin has no data
+        if now - current["since"] < self.min_dwell_s:
+            return False
+        gain = challenger["net_gbp_day"] - current_net
+        return gain > self.margin_gbp_day and gain > abs(current_net) * self.margin_percent / 100
+
+    def evaluate(self, results: Dict, now: Optional[float] = None) -> Dict:
+        """
+        Recommend a pool for every configured miner from one calculator run
+
+        Returns: Dict with per-miner recommendations, the ranked combinations
+        and the evaluation time
+        """
+        started = time.perf_counter()
+        now = time.time() if now is None else now
+        combos = self.combinations(results)
+        by_key = {(combo["coin"], combo["url"]): combo for combo in combos}
+
+        recommendations = {}
+        with self._lock:
+            for operation in self.operations:
+                for miner in operation["miners"]:
+                    # Options this hardware can run (coins whose miner model matches)
+                    options = [combo for combo in combos if miner["hardware"] in combo["hardware"]]
+                    if not options:
+                        continue
+                    best = options[0]
+
+                    current = self.assignments.get(miner["name"])
+                    current_combo = by_key.get((current["coin"], current["url"])) if current else None
+                    current_net = current_combo["net_gbp_day"] if current_combo else None
+
+                    switched = current is None or (
+                        (best["coin"], best["url"]) != (current["coin"], current["url"])
+                        and self._should_switch(current, best, current_net, now))
+                    if switched:
+                        current = {"coin": best["coin"], "pool": best["pool"], "url": best["url"], "since": now}
+                        self.assignments[miner["name"]] = current
+                        current_net = best["net_gbp_day"]
+
+                    recommendations[miner["name"]] = {
+                        "hardware": miner["hardware"],
+                        "coin": current["coin"],
+                        "pool": current["pool"],
+                        "url": current["url"],
+                        "net_gbp_day": current_net,
+                        "since": current["since"],
+                        "switched": switched,
+                        "best": {"coin": best["coin"], "pool": best["pool"], "net_gbp_day": best["net_gbp_day"]}
+                    }
+
+            self.last_evaluation = {
+                "timestamp": now,
+                "recommendations": recommendations,
+                "combinations": combos,
+                "hysteresis": {
+                    "margin_percent": self.margin_percent,
+                    "margin_gbp_day": self.margin_gbp_day,
+                    "min_dwell_s": self.min_dwell_s
+                },
+                "elapsed_ms": round((time.perf_counter() - started) * 1000, 3)
+            }
+            return self.last_evaluation
+
+
+# Assignments persist for the life of the process
+switcher = ProfitSwitcher()
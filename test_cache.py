@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""Test the TTL cache's stale-while-revalidate behaviour"""
+
+import threading
+import time
+
+from cache import TTLCache
+
+SLOW_LOAD_S = 1.0
+
+
+def test_concurrent_stale_reads_return_immediately():
+    cache = TTLCache(stripes=1)   # Every key on the same stripe
+    cache.set("price", "old", ttl=0)
+    cache.set("other", "old", ttl=0)
+    time.sleep(0.01)
+
+    def slow_loader():
+        time.sleep(SLOW_LOAD_S)
+        return "new"
+
+    timings = []
+
+    def read(key):
+        started = time.monotonic()
+        value, status = cache.get_or_load(key, slow_loader, ttl=60)
+        timings.append((value, status, time.monotonic() - started))
+
+    readers = [threading.Thread(target=read, args=(key,)) for key in ("price", "price", "other")]
+    for reader in readers:
+        reader.start()
+    for reader in readers:
+        reader.join()
+
+    assert [status for _, status, _ in timings] == ["stale"] * 3
+    assert all(value == "old" for value, _, _ in timings)
+    assert max(elapsed for _, _, elapsed in timings) < SLOW_LOAD_S / 4
+
+    # The single background refresh swaps the new value in
+    time.sleep(SLOW_LOAD_S * 1.5)
+    assert cache.get_or_load("price", slow_loader, ttl=60) == ("new", "hit")
+    assert cache.stats()["refreshes"] == 2   # One per key, not per reader
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"✓ {name}")
+    print("\n✓ All tests passed!")
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""Test the network hashrate growth forecaster on synthetic histories"""
+
+import json
+import math
+import random
+
+import numpy as np
+
+from forecast import MAX_GROWTH_ANNUAL, LogLinearForecaster
+from projections import roi_days_on_curve
+
+HOUR_S = 3600
+DAY_S = 86400
+
+
+def fed_forecaster(hours, growth_annual, noise_sd, seed=0):
+    """Forecaster fed hourly samples of noisy exponential growth"""
+    rng = random.Random(seed)
+    forecaster = LogLinearForecaster()
+    slope = math.log1p(growth_annual) / 365
+    for hour in range(hours):
+        days = hour / 24
+        forecaster.add(1_700_000_000 + hour * HOUR_S, 1e15 * math.exp(slope * days + rng.gauss(0, noise_sd)))
+    return forecaster
+
+
+def test_short_noisy_history_has_no_forecast():
+    forecaster = fed_forecaster(30, growth_annual=0.5, noise_sd=0.2)
+    assert forecaster.fit() is None
+    assert forecaster.hashrate_multipliers(365) is None
+    assert forecaster.earnings_curves(365) is None
+
+
+def test_weeks_of_history_stay_bounded():
+    forecaster = fed_forecaster(45 * 24, growth_annual=1.0, noise_sd=0.2)
+    fit = forecaster.fit()
+    assert fit is not None
+    assert -0.75 <= fit["growth_annual"] <= MAX_GROWTH_ANNUAL
+
+    multipliers = forecaster.hashrate_multipliers(365, fit=fit)
+    assert multipliers["p95"][-1] < 20
+    curves = forecaster.earnings_curves(365, fit=fit)
+    assert 100 < curves["p50"][365] < 365
+
+
+def test_steep_trend_is_clamped():
+    forecaster = fed_forecaster(35 * 24, growth_annual=1e4, noise_sd=0.05)
+    fit = forecaster.fit()
+    assert fit is not None
+    assert fit["growth_per_day"] <= math.log1p(MAX_GROWTH_ANNUAL) / 365
+    assert fit["growth_annual"] <= MAX_GROWTH_ANNUAL
+
+
+def test_state_round_trip():
+    # Workers load the refresher's fit through JSON
+    source = fed_forecaster(35 * 24, growth_annual=0.5, noise_sd=0.1)
+    worker = LogLinearForecaster()
+    worker.load_state(json.loads(json.dumps(source.state())))
+    assert worker.fit() == source.fit()
+
+
+def brute_force_roi(curve, cost, daily_gross, daily_power):
+    """First day cumulative net covers cost, interpolated within the day"""
+    previous = 0.0
+    for day in range(1, len(curve)):
+        net = daily_gross * curve[day] - daily_power * day
+        if net >= cost:
+            return day - 1 + (cost - previous) / (net - previous)
+        previous = net
+    return math.inf
+
+
+def test_roi_on_rising_earnings_curve():
+    # Shrinking network hashrate: earnings per day rise, the reward-ratio curve is not monotone
+    forecaster = fed_forecaster(45 * 24, growth_annual=-0.7, noise_sd=0.05)
+    curves = forecaster.earnings_curves(730)
+    rng = random.Random(1)
+    for band, curve in curves.items():
+        for _ in range(50):
+            # Power around today's gross: early losses that later rising earnings may recover
+            gross = rng.uniform(0.1, 5)
+            cost, power = rng.uniform(0, 50), gross * rng.uniform(0.8, 1.8)
+            expected = brute_force_roi(curve, cost, gross, power)
+            got = float(roi_days_on_curve(curve, np.array(cost), np.array(gross), np.array(power)))
+            assert (math.isinf(expected) and math.isinf(got)) or abs(got - expected) < 1e-6, \
+                (band, cost, gross, power, got, expected)
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"✓ {name}")
+    print("\n✓ All tests passed!")
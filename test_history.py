@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""Test the history store's series list and row counters"""
+
+from history import DAY_S, HistoryStore
+
+START = 1_700_000_000
+
+
+def counted_rows(store):
+    rows = store._reader().execute("SELECT tier, COUNT(*) FROM samples GROUP BY tier")
+    return {str(tier): count for tier, count in rows}
+
+
+def test_counters_follow_inserts_replacements_and_pruning():
+    store = HistoryStore(":memory:")
+    for i in range(100):
+        store.record({"kaspa.price_gbp": 0.1 + i, "zcash.price_gbp": None}, ts=START + i * 600)
+    store.record({"kaspa.price_gbp": 5.0, "zcash.price_gbp": 20.0}, ts=START)  # Same raw timestamp again
+
+    assert store.series_names() == ["kaspa.price_gbp", "zcash.price_gbp"]
+    assert store.stats()["rows_per_tier"] == counted_rows(store)
+
+    store._prune(START + 7 * DAY_S + 30 * 600)
+    assert store.stats()["rows_per_tier"] == counted_rows(store)
+    assert store.stats()["rows_per_tier"]["0"] == 70
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"✓ {name}")
+    print("\n✓ All tests passed!")
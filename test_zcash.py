@@ -1,14 +1,14 @@
 #!/usr/bin/env python3
 """Test Zcash calculator functions"""
 
-import requests
+import http_client
 
 # Test Zcash API calls
 print("Testing Zcash APIs...")
 
 # Test ZEC price from CoinGecko
 try:
-    response = requests.get(
+    response = http_client.get(
         "https://api.coingecko.com/api/v3/simple/price",
         params={"ids": "zcash", "vs_currencies": "gbp"},
         timeout=10
@@ -21,7 +21,7 @@ except Exception as e:
 
 # Test Zcash network stats from 2Miners
 try:
-    response = requests.get("https://zec.2miners.com/api/stats", timeout=10)
+    response = http_client.get("https://zec.2miners.com/api/stats", timeout=10)
     data = response.json()
     nodes = data.get("nodes", [])
     if nodes:
@@ -46,4 +46,7 @@ try:
 except Exception as e:
     print(f"✗ Failed to fetch ZEC network stats: {e}")
 
+stats = http_client.stats()
+print(f"\n✓ HTTP connection reuse: {stats['reuse_rate']:.0%} ({stats['requests']} requests, {stats['connections']} connections)")
+
 print("\n✓ All tests passed!")
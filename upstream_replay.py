@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Upstream Record / Replay Fixtures
+Captures real upstream API responses to fixture files and plays them back,
+so the calculator can be run and timed without network access.
+
+Modes (UPSTREAM_MODE, read by http_client.py):
+- live (default): normal upstream requests
+- record: live requests, each response also saved to UPSTREAM_FIXTURES
+- replay: responses served from UPSTREAM_FIXTURES, nothing leaves the host
+
+Setting UPSTREAM_URL (e.g. http://127.0.0.1:8099) sends every upstream
+request to the stand-in server (fixture_server.py) instead, so replays go
+through real sockets, connection pooling and retries with its configurable
+latency, errors and rate limits.
+
+Fixtures are one JSON file per request under <host>/, named by a hash of
+the URL and sorted query parameters:
+    {"url": ..., "params": {...}, "status": 200, "content_type": ..., "body": ...}
+
+Used by:
+- http_client.py: record/replay hooks in HttpClient.get
+- fixture_server.py: stand-in upstream HTTP server
+"""
+
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, Iterator, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import requests
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+DEFAULT_FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "upstream")
+
+MODES = ("live", "record", "replay")
+
+
+# ============================================================================
+# Request Keys
+# ============================================================================
+
+def normalise(url: str, params: Optional[Dict] = None):
+    """
+    Split a request into its base URL and sorted query parameters
+
+    Query strings in the URL and params are merged, so
+    get("https://h/p?a=1") and get("https://h/p", params={"a": 1}) match.
+
+    Returns: (base_url, ((name, value), ...))
+    """
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    query += [(str(name), str(value)) for name, value in (params or {}).items()]
+    return f"{parts.scheme}://{parts.netloc}{parts.path}", tuple(sorted(query))
+
+
+def fixture_name(url: str, params: Optional[Dict] = None) -> str:
+    """Relative fixture path for a request: <host>/<hash>.json"""
+    base, query = normalise(url, params)
+    digest = hashlib.sha1(f"{base}?{urlencode(query)}".encode()).hexdigest()[:16]
+    return os.path.join(urlsplit(base).netloc.replace(":", "_"), f"{digest}.json")
+
+
+# ============================================================================
+# Fixture Store
+# ============================================================================
+
+class FixtureStore:
+    """Directory of recorded upstream responses"""
+
+    def __init__(self, path: str = DEFAULT_FIXTURES_DIR):
+        self.path = path
+        self._lock = threading.Lock()
+        self.stats = {"recorded": 0, "replayed": 0, "missing": 0}
+
+    def save(self, url: str, params: Optional[Dict], response: requests.Response):
+        """Record one upstream response (overwrites the previous recording)"""
+        base, query = normalise(url, params)
+        fixture = {
+            "url": base,
+            "params": dict(query),
+            "status": response.status_code,
+            "content_type": response.headers.get("Content-Type", "application/json"),
+            "body": response.text
+        }
+        target = os.path.join(self.path, fixture_name(url, params))
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+
+        # Write then rename, so a concurrent replay never reads half a file
+        tmp = f"{target}.{threading.get_ident()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(fixture, f, indent=2)
+        os.replace(tmp, target)
+        with self._lock:
+            self.stats["recorded"] += 1
+
+    def load(self, url: str, params: Optional[Dict] = None) -> Optional[Dict]:
+        """Recorded fixture for a request, or None if never recorded"""
+        try:
+            with open(os.path.join(self.path, fixture_name(url, params))) as f:
+                fixture = json.load(f)
+        except (OSError, ValueError):
+            with self._lock:
+                self.stats["missing"] += 1
+            return None
+        with self._lock:
+            self.stats["replayed"] += 1
+        return fixture
+
+    def __iter__(self) -> Iterator[Dict]:
+        """Every recorded fixture"""
+        for root, _, files in os.walk(self.path):
+            for name in sorted(files):
+                if name.endswith(".json"):
+                    with open(os.path.join(root, name)) as f:
+                        yield json.load(f)
+
+    def replay(self, url: str, params: Optional[Dict] = None) -> requests.Response:
+        """
+        Build a requests.Response from the recorded fixture
+
+        Raises: requests.ConnectionError if the request was never recorded,
+        so fetchers fail exactly as they would offline
+        """
+        fixture = self.load(url, params)
+        if fixture is None:
+            raise requests.ConnectionError(f"No recorded fixture for {url} in {self.path}")
+        return to_response(fixture, url)
+
+
+def to_response(fixture: Dict, url: str) -> requests.Response:
+    """Turn a fixture dict into a requests.Response"""
+    response = requests.Response()
+    response.status_code = fixture["status"]
+    response.headers["Content-Type"] = fixture.get("content_type", "application/json")
+    response._content = fixture["body"].encode()
+    response.encoding = "utf-8"
+    response.url = url
+    return response
+
+
+# ============================================================================
+# Stand-in Server Routing
+# ============================================================================
+
+def to_standin_url(standin_url: str, url: str) -> str:
+    """
+    Rewrite an upstream URL onto the stand-in server, keeping the host in the path
+
+    https://api.coingecko.com/api/v3/ping -> http://127.0.0.1:8099/api.coingecko.com/api/v3/ping
+    """
+    parts = urlsplit(url)
+    rewritten = f"{standin_url.rstrip('/')}/{parts.netloc}{parts.path}"
+    return f"{rewritten}?{parts.query}" if parts.query else rewritten
+
+
+def from_standin_path(path: str, scheme: str = "https") -> str:
+    """Inverse of to_standin_url for the server side: "/host/path?q" -> "https://host/path?q" """
+    return f"{scheme}://{path.lstrip('/')}"
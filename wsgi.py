@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Production Serving Entry Point
+Runs the calculator web app under a multi-worker WSGI server (gunicorn)
+without multiplying upstream API calls.
+
+- One refresher process owns the refresh scheduler, upstream fetches and
+  the history store, and publishes each calculator run to the snapshot hub
+  (snapshot_hub.py, a local Unix socket)
+- Every WSGI worker follows the hub and serves its own in-memory copy of
+  the snapshots (and the refresher's hashrate growth fits), so
+  /api/calculator, /api/stream and friends scale with worker count while
+  upstream traffic stays that of one process. Until its first snapshot
+  arrives a worker answers data endpoints with 503 and Retry-After
+- /api/refresh in a worker asks the refresher to refetch and waits for the
+  new snapshot; client activity is forwarded so refreshing pauses when idle
+
+Usage:
+    gunicorn -c gunicorn.conf.py 'wsgi:create_app()'    # Starts the refresher too
+    python3 wsgi.py --refresher                          # Refresher on its own (e.g. systemd)
+
+`python3 app.py` still runs everything in one process for development.
+"""
+
+import argparse
+import signal
+import sys
+import threading
+from typing import Optional
+
+import app as calculator
+from snapshot_hub import DEFAULT_SOCKET_PATH, SnapshotHub, SnapshotSubscriber
+
+
+def create_app(socket_path: Optional[str] = None):
+    """
+    WSGI application factory for worker processes
+
+    Called in each worker after the fork (gunicorn.conf.py does not preload
+    the app), so the subscriber thread runs in the worker and the first
+    snapshot is usually in before the first request.
+
+    Returns: The Flask app, serving snapshots received from the refresher
+    """
+    calculator.serving_role = "worker"
+    calculator.snapshot_hub = SnapshotSubscriber(calculator.apply_published,
+                                                 socket_path or DEFAULT_SOCKET_PATH)
+    calculator.start_background_updates()
+    return calculator.app
+
+
+def run_refresher(socket_path: Optional[str] = None):
+    """Run the single refresher process until SIGTERM/SIGINT"""
+    scheduler = calculator.refresh_scheduler
+    hub = SnapshotHub(socket_path or DEFAULT_SOCKET_PATH,
+                      on_refresh=scheduler.refresh_now,
+                      on_poll=scheduler.record_client_poll)
+    calculator.serving_role = "refresher"
+    calculator.snapshot_hub = hub
+    hub.start()
+    calculator.start_background_updates()
+    print(f"Refresher publishing snapshots on {hub.path}")
+
+    stopped = threading.Event()
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(signum, lambda *_: stopped.set())
+    stopped.wait()
+    hub.stop()
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="KaspaMine calculator production serving")
+    parser.add_argument('--refresher', action='store_true',
+                        help='Run the single data refresher that feeds every WSGI worker')
+    parser.add_argument('--socket', default=DEFAULT_SOCKET_PATH,
+                        help=f'Snapshot hub socket (default: {DEFAULT_SOCKET_PATH}, env SNAPSHOT_SOCKET)')
+    args = parser.parse_args()
+
+    if not args.refresher:
+        parser.error("workers are started by the WSGI server: gunicorn -c gunicorn.conf.py 'wsgi:create_app()'")
+    run_refresher(args.socket)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())